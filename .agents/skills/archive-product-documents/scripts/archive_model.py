@@ -0,0 +1,180 @@
+"""Compact typed records for archive entries, built once from ``item.toml``.
+
+Scripts that walk the whole archive used to keep every entry as the raw
+``tomllib`` dict and re-check each field's presence and type wherever it was
+read. ``load_product()`` does that checking once: each entry becomes a
+``Product`` holding ``Document`` records, all slotted dataclasses with no
+per-instance ``__dict__``. Document and source types are ``StrEnum`` members,
+so every record shares one object per type and still compares equal to the
+plain string. Repeated strings (brands, language codes, publishing pages) are
+interned and equal dates share one ``date`` object.
+
+The model is deliberately lenient: a field with the wrong type reads as None
+(or an empty tuple) instead of raising. Reporting such fields is the
+validator's job, which still checks the raw tables against ``item_schema``.
+"""
+
+import sys
+import tomllib
+from dataclasses import dataclass
+from datetime import date
+from enum import StrEnum
+from functools import lru_cache
+from pathlib import Path
+
+from item_schema import DOCUMENT_TYPES_V1, SOURCE_TYPES_V1
+
+
+def _members(values: frozenset) -> dict[str, str]:
+    return {value.upper().replace("-", "_"): value for value in sorted(values)}
+
+
+DocumentType = StrEnum("DocumentType", _members(DOCUMENT_TYPES_V1))
+SourceType = StrEnum("SourceType", _members(SOURCE_TYPES_V1))
+
+
+def _string(record: dict, key: str) -> str | None:
+    value = record.get(key)
+    return value if isinstance(value, str) and value.strip() else None
+
+
+def _interned(record: dict, key: str) -> str | None:
+    value = _string(record, key)
+    return None if value is None else sys.intern(value)
+
+
+def _enum(record: dict, key: str, kind: type[StrEnum]) -> StrEnum | str | None:
+    """The member for a known value; unknown values stay (interned) strings."""
+    value = _interned(record, key)
+    if value is None:
+        return None
+    try:
+        return kind(value)
+    except ValueError:
+        return value
+
+
+def _strings(record: dict, key: str) -> tuple[str, ...]:
+    values = record.get(key)
+    if not isinstance(values, list):
+        return ()
+    return tuple(sys.intern(value) for value in values if isinstance(value, str))
+
+
+def _positive_int(record: dict, key: str) -> int | None:
+    value = record.get(key)
+    return value if type(value) is int and value > 0 else None
+
+
+@lru_cache(maxsize=4096)
+def _shared_date(value: date) -> date:
+    return value
+
+
+def _date(record: dict, key: str) -> date | None:
+    value = record.get(key)
+    if isinstance(value, str):
+        try:
+            value = date.fromisoformat(value)
+        except ValueError:
+            return None
+    # TOML datetimes are dates too, but ``retrieved`` records a day.
+    if type(value) is not date:
+        return None
+    return _shared_date(value)
+
+
+@dataclass(frozen=True, slots=True)
+class Document:
+    """One ``[[documents]]`` or ``[[source_documents]]`` table."""
+
+    title: str | None
+    type: DocumentType | str | None
+    file: str | None  # None for source documents not yet downloaded
+    languages: tuple[str, ...]
+    source_url: str | None
+    source_type: SourceType | str | None
+    retrieved: date | None
+    sha256: str | None
+    byte_count: int | None  # the ``bytes`` field
+    pages: int | None = None
+    revision: str | None = None
+    source_page_url: str | None = None
+    source_filename: str | None = None
+    resolved_url: str | None = None
+
+    @classmethod
+    def from_record(cls, record: dict) -> "Document":
+        return cls(
+            title=_string(record, "title"),
+            type=_enum(record, "type", DocumentType),
+            file=_string(record, "file"),
+            languages=_strings(record, "languages"),
+            source_url=_string(record, "source_url"),
+            source_type=_enum(record, "source_type", SourceType),
+            retrieved=_date(record, "retrieved"),
+            sha256=_string(record, "sha256"),
+            byte_count=_positive_int(record, "bytes"),
+            pages=_positive_int(record, "pages"),
+            revision=_interned(record, "revision"),
+            source_page_url=_interned(record, "source_page_url"),
+            source_filename=_string(record, "source_filename"),
+            resolved_url=_string(record, "resolved_url"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Product:
+    """One archive entry: its product fields and both document tables."""
+
+    slug: str
+    schema_version: int | None
+    name: str | None
+    brand: str | None
+    manufacturer: str | None
+    model: str | None
+    item_numbers: tuple[str, ...]
+    upcs: tuple[str, ...]
+    product_url: str | None
+    support_url: str | None
+    documents: tuple[Document, ...]
+    source_documents: tuple[Document, ...]
+
+    @classmethod
+    def from_metadata(cls, slug: str, metadata: dict) -> "Product":
+        version = metadata.get("schema_version")
+        return cls(
+            slug=slug,
+            schema_version=version if type(version) is int else None,
+            name=_string(metadata, "name"),
+            brand=_interned(metadata, "brand"),
+            manufacturer=_interned(metadata, "manufacturer"),
+            model=_string(metadata, "model"),
+            item_numbers=_strings(metadata, "item_numbers"),
+            upcs=_strings(metadata, "upcs"),
+            product_url=_string(metadata, "product_url"),
+            support_url=_interned(metadata, "support_url"),
+            documents=_documents(metadata, "documents"),
+            source_documents=_documents(metadata, "source_documents"),
+        )
+
+
+def _documents(metadata: dict, table: str) -> tuple[Document, ...]:
+    records = metadata.get(table)
+    if not isinstance(records, list):
+        return ()
+    return tuple(
+        Document.from_record(record) for record in records if isinstance(record, dict)
+    )
+
+
+def load_metadata(entry: Path) -> dict:
+    """The raw ``item.toml`` table, for callers that rewrite or diff it."""
+    metadata_path = entry / "item.toml"
+    if not metadata_path.is_file():
+        raise FileNotFoundError(f"item.toml is missing: {entry}")
+    return tomllib.loads(metadata_path.read_text(encoding="utf-8"))
+
+
+def load_product(entry: Path) -> Product:
+    return Product.from_metadata(entry.name, load_metadata(entry))
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+
+import argparse
+import hashlib
+import subprocess
+import sys
+import tempfile
+import time
+import tomllib
+import tracemalloc
+from pathlib import Path
+
+import validate_entry
+from archive_model import load_product
+from item_schema import compile_schema
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+# Run in a fresh interpreter, so the baseline's modules never mix with these.
+BASELINE_TIMER = """
+import sys, time
+from pathlib import Path
+sys.path.insert(0, sys.argv[1])
+import validate_entry
+entries = sorted(Path(sys.argv[2]).iterdir())
+timings = []
+for _ in range(int(sys.argv[3])):
+    started = time.perf_counter()
+    for entry in entries:
+        result = validate_entry.validate_entry(entry)
+        assert result.valid, (entry, result.errors[:5])
+    timings.append(time.perf_counter() - started)
+print(min(timings))
+"""
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Time validate_entry.py on a synthetic archive, both the full check and "
+            "the metadata schema checks alone, and compare the memory held by raw "
+            "item.toml tables with archive_model records."
+        )
+    )
+    parser.add_argument(
+        "--baseline",
+        metavar="REVISION",
+        help=(
+            "Also time validate_entry.py as of this git revision on the same archive, "
+            "e.g. the commit before a change to the validator."
+        ),
+    )
+    parser.add_argument("--entries", type=int, default=2000)
+    parser.add_argument("--documents-per-entry", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    return parser.parse_args()
+
+
+def write_synthetic_archive(root: Path, entries: int, documents_per_entry: int) -> list[Path]:
+    document_types = sorted(validate_entry.ALLOWED_DOCUMENT_TYPES)
+    paths: list[Path] = []
+    for number in range(entries):
+        entry = root / f"acme-{number:06d}"
+        (entry / "documents").mkdir(parents=True)
+        lines = [
+            "schema_version = 1",
+            f'name = "Synthetic product {number}"',
+            'brand = "ACME"',
+            f'model = "{number:06d}"',
+            'product_url = "https://example.com/product"',
+            'upcs = ["012345678905"]',
+            "",
+        ]
+        links = []
+        for index in range(documents_per_entry):
+            document_type = document_types[index % len(document_types)]
+            relative_file = f"documents/{entry.name}-{document_type}-en.pdf"
+            data = f"%PDF-1.7\n{entry.name} {document_type}\n".encode()
+            (entry / relative_file).write_bytes(data)
+            links.append(f"- [{document_type}]({relative_file})")
+            lines += [
+                "[[documents]]",
+                f'title = "{document_type}"',
+                f'type = "{document_type}"',
+                f'file = "{relative_file}"',
+                'languages = ["en"]',
+                'source_url = "https://example.com/manual.pdf"',
+                'source_page_url = "https://example.com/product"',
+                'source_type = "retailer"',
+                "retrieved = 2026-07-25",
+                f'sha256 = "{hashlib.sha256(data).hexdigest()}"',
+                f"bytes = {len(data)}",
+                "",
+            ]
+        (entry / "item.toml").write_text("\n".join(lines))
+        (entry / "README.md").write_text("# Synthetic\n\n" + "\n".join(links) + "\n")
+        paths.append(entry)
+    return paths
+
+
+def best_of(repeat: int, function) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def export_scripts(revision: str, destination: Path) -> None:
+    """Write this directory's scripts as of ``revision`` into ``destination``."""
+    names = subprocess.run(
+        ["git", "ls-tree", "--name-only", revision, "./"],
+        cwd=SCRIPTS_DIR,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.split()
+    for name in names:
+        if name.endswith(".py"):
+            content = subprocess.run(
+                ["git", "show", f"{revision}:./{name}"],
+                cwd=SCRIPTS_DIR,
+                check=True,
+                capture_output=True,
+            ).stdout
+            (destination / name).write_bytes(content)
+
+
+def time_baseline(revision: str, items_root: Path, repeat: int) -> float:
+    with tempfile.TemporaryDirectory() as scripts:
+        export_scripts(revision, Path(scripts))
+        output = subprocess.run(
+            [sys.executable, "-c", BASELINE_TIMER, scripts, str(items_root), str(repeat)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+    return float(output)
+
+
+def retained_bytes(load) -> int:
+    """Bytes still allocated once ``load()`` returns, while its result is alive."""
+    tracemalloc.start()
+    try:
+        loaded = load()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del loaded
+    return retained
+
+
+def main() -> int:
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        items_root = Path(temporary_directory) / "items"
+        entries = write_synthetic_archive(
+            items_root, args.entries, args.documents_per_entry
+        )
+        metadata = [tomllib.loads((entry / "item.toml").read_text()) for entry in entries]
+        schema = compile_schema()
+
+        def check_metadata() -> None:
+            errors: list[str] = []
+            for record in metadata:
+                schema.product.check_fields(record, "item.toml", errors)
+                schema.product.check_values(record, "", errors)
+                for index, document in enumerate(record["documents"]):
+                    label = f"documents[{index}]"
+                    schema.document.check_fields(document, label, errors)
+                    schema.document.check_values(document, f"{label}.", errors)
+            assert not errors, errors[:5]
+
+        def validate_all() -> None:
+            for entry in entries:
+                result = validate_entry.validate_entry(entry)
+                assert result.valid, result.errors[:5]
+
+        documents = args.entries * args.documents_per_entry
+        schema_seconds = best_of(args.repeat, check_metadata)
+        full_seconds = best_of(args.repeat, validate_all)
+        print(f"entries={args.entries} documents={documents}")
+        print(
+            f"schema_checks={schema_seconds * 1000:.1f}ms "
+            f"({documents / schema_seconds:,.0f} documents/s)"
+        )
+        print(
+            f"validate_entry={full_seconds * 1000:.1f}ms "
+            f"({args.entries / full_seconds:,.0f} entries/s)"
+        )
+        if args.baseline:
+            baseline_seconds = time_baseline(args.baseline, items_root, args.repeat)
+            print(
+                f"validate_entry@{args.baseline}={baseline_seconds * 1000:.1f}ms "
+                f"({args.entries / baseline_seconds:,.0f} entries/s, "
+                f"current takes {full_seconds / baseline_seconds:.0%} of its time)"
+            )
+        raw_bytes = retained_bytes(
+            lambda: [tomllib.loads((entry / "item.toml").read_text()) for entry in entries]
+        )
+        model_bytes = retained_bytes(lambda: [load_product(entry) for entry in entries])
+        print(
+            f"raw_tables={raw_bytes / 1024:,.0f}KiB products={model_bytes / 1024:,.0f}KiB "
+            f"({model_bytes / raw_bytes:.0%} of raw)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
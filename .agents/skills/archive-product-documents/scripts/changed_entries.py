@@ -0,0 +1,102 @@
+"""Map a git revision range onto the archive entries it touched.
+
+``validate_entry.py`` and ``complete_pending_entry.py`` use this for
+``--changed-since <rev>``: only entries with changed files are checked, plus
+entries that record the same document digests, since a shared PDF changed in
+one place is usually copied in another. A change to the validator or schema
+changes the rules for every entry, so it selects the whole archive.
+"""
+
+import subprocess
+import tomllib
+from pathlib import Path
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+RULE_FILES = frozenset(
+    SCRIPTS_DIR / name
+    for name in (
+        "validate_entry.py",
+        "item_schema.py",
+        "archive_model.py",
+        "pdf_metadata.py",
+    )
+)
+
+
+def _git(arguments: list[str], cwd: Path) -> list[str]:
+    try:
+        completed = subprocess.run(
+            ["git", *arguments],
+            cwd=cwd,
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+    except FileNotFoundError as error:
+        raise ValueError("git is unavailable") from error
+    except subprocess.CalledProcessError as error:
+        message = error.stderr.strip() or f"git {' '.join(arguments)} failed"
+        raise ValueError(message) from error
+    return [line for line in completed.stdout.splitlines() if line]
+
+
+def changed_paths(revision: str, cwd: Path) -> list[Path]:
+    """Absolute paths changed since ``revision``, including uncommitted and new files."""
+    top_level = Path(_git(["rev-parse", "--show-toplevel"], cwd)[0])
+    names = _git(["diff", "--name-only", "--no-renames", revision, "--"], top_level)
+    names += _git(["ls-files", "--others", "--exclude-standard"], top_level)
+    return [top_level / name for name in names]
+
+
+def archive_entries(items_root: Path) -> list[Path]:
+    # Hidden directories are create_pending_entry.py staging areas, not entries.
+    return sorted(
+        path.parent.resolve()
+        for path in items_root.glob("*/item.toml")
+        if not path.parent.name.startswith(".")
+    )
+
+
+def _document_digests(entry: Path) -> set[str]:
+    try:
+        metadata = tomllib.loads((entry / "item.toml").read_text(encoding="utf-8"))
+    except (OSError, tomllib.TOMLDecodeError):
+        return set()
+    digests = set()
+    for table in ("documents", "source_documents"):
+        records = metadata.get(table)
+        if isinstance(records, list):
+            digests.update(
+                record["sha256"]
+                for record in records
+                if isinstance(record, dict) and isinstance(record.get("sha256"), str)
+            )
+    return digests
+
+
+def changed_entries(revision: str, items_root: Path) -> list[Path]:
+    """Existing entries changed since ``revision`` plus entries sharing their digests."""
+    items_root = items_root.resolve()
+    paths = changed_paths(revision, items_root)
+    if RULE_FILES.intersection(paths):
+        return archive_entries(items_root)
+
+    changed = set()
+    for path in paths:
+        try:
+            relative = path.relative_to(items_root)
+        except ValueError:
+            continue
+        if len(relative.parts) < 2 or relative.parts[0].startswith("."):
+            continue
+        entry = items_root / relative.parts[0]
+        if (entry / "item.toml").is_file():
+            changed.add(entry)
+
+    digests = set().union(*map(_document_digests, changed)) if changed else set()
+    if digests:
+        for entry in archive_entries(items_root):
+            if entry not in changed and digests & _document_digests(entry):
+                changed.add(entry)
+    return sorted(changed)
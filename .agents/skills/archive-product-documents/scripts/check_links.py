@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import tomllib
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from archive_model import load_product
+from complete_pending_entry import candidate_entries
+from download_pdf import USER_AGENT, PublicOnlyRedirectHandler, validate_public_url
+from pdf_text import DEFAULT_CACHE_DIR
+
+
+DEFAULT_JOBS = 16
+DEFAULT_PER_HOST = 2
+DEFAULT_TIMEOUT_SECONDS = 20
+DEFAULT_TTL_HOURS = 7 * 24
+PRODUCT_URL_FIELDS = ("product_url", "support_url")
+DOCUMENT_URL_FIELDS = ("source_url", "source_page_url", "resolved_url")
+# Servers that refuse or mishandle HEAD usually answer with one of these; a
+# one-byte ranged GET then tells whether the resource itself exists.
+HEAD_FALLBACK_CODES = {400, 403, 405, 406, 500, 501, 503}
+
+
+@dataclass(frozen=True)
+class LinkStatus:
+    url: str
+    status: str  # "ok", "broken" (HTTP error), "error" (network), "rejected"
+    code: int | None
+    final_url: str | None
+    detail: str
+    checked: float  # Unix time of the probe
+
+    @property
+    def healthy(self) -> bool:
+        return self.status == "ok"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Check that every product, support and source URL recorded in the "
+            "archive still answers."
+        )
+    )
+    parser.add_argument(
+        "entries",
+        nargs="*",
+        type=Path,
+        help="Optional entry directories. Defaults to scanning docs/items.",
+    )
+    parser.add_argument(
+        "--items-root",
+        type=Path,
+        default=Path("docs/items"),
+        help="Archive items root (default: docs/items)",
+    )
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        default=DEFAULT_CACHE_DIR / "link-health.json",
+        help="Probe results reused until they are older than --ttl-hours.",
+    )
+    parser.add_argument(
+        "--ttl-hours",
+        type=float,
+        default=DEFAULT_TTL_HOURS,
+        help=(
+            f"Reuse healthy results younger than this (default: {DEFAULT_TTL_HOURS}). "
+            "Failures are always probed again."
+        ),
+    )
+    parser.add_argument("--refresh", action="store_true", help="Ignore the cache.")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS)
+    parser.add_argument(
+        "--per-host",
+        type=int,
+        default=DEFAULT_PER_HOST,
+        help=f"Concurrent requests allowed per host (default: {DEFAULT_PER_HOST}).",
+    )
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_SECONDS)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    return parser.parse_args()
+
+
+def archive_urls(entries: list[Path]) -> tuple[dict[str, list[str]], list[str]]:
+    """Map each distinct URL to the ``entry: field`` places that record it."""
+    places: dict[str, list[str]] = {}
+    errors = []
+
+    def add(url, label: str) -> None:
+        if isinstance(url, str) and url.strip():
+            places.setdefault(url.strip(), []).append(label)
+
+    for entry in entries:
+        try:
+            product = load_product(entry)
+        except (OSError, tomllib.TOMLDecodeError) as error:
+            errors.append(f"{entry}: {error}")
+            continue
+        for field_name in PRODUCT_URL_FIELDS:
+            add(getattr(product, field_name), f"{entry.name}: {field_name}")
+        for table in ("documents", "source_documents"):
+            for index, document in enumerate(getattr(product, table)):
+                for field_name in DOCUMENT_URL_FIELDS:
+                    label = f"{entry.name}: {table}[{index}].{field_name}"
+                    add(getattr(document, field_name), label)
+    return places, errors
+
+
+class HostLimiter:
+    """One semaphore per host, so a shared CDN never sees more than ``limit`` probes."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._semaphores: dict[str, threading.BoundedSemaphore] = {}
+
+    def __call__(self, url: str) -> threading.BoundedSemaphore:
+        host = (urllib.parse.urlparse(url).hostname or "").lower()
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = self._semaphores[host] = threading.BoundedSemaphore(self.limit)
+            return semaphore
+
+
+def probe(
+    url: str,
+    timeout: float,
+    opener: urllib.request.OpenerDirector | None = None,
+) -> LinkStatus:
+    """HEAD ``url``, retrying as a one-byte ranged GET when HEAD is refused."""
+    try:
+        validate_public_url(url)
+    except ValueError as error:
+        # An unresolvable host is a dead link; anything else breaks archive rules.
+        status = "error" if "could not be resolved" in str(error) else "rejected"
+        return LinkStatus(url, status, None, None, str(error), time.time())
+
+    url_opener = opener or urllib.request.build_opener(PublicOnlyRedirectHandler())
+    attempts = (("HEAD", {}), ("GET", {"Range": "bytes=0-0"}))
+    for method, extra_headers in attempts:
+        request = urllib.request.Request(
+            url, headers={"User-Agent": USER_AGENT, **extra_headers}, method=method
+        )
+        try:
+            with url_opener.open(request, timeout=timeout) as response:
+                final_url = response.geturl()
+                validate_public_url(final_url)
+                return LinkStatus(
+                    url, "ok", response.status, final_url, method, time.time()
+                )
+        except urllib.error.HTTPError as error:
+            error.close()
+            if method == "HEAD" and error.code in HEAD_FALLBACK_CODES:
+                continue
+            return LinkStatus(
+                url, "broken", error.code, None, f"{method}: {error.reason}", time.time()
+            )
+        except ValueError as error:
+            # Raised by the public-address checks on redirects and the final URL.
+            return LinkStatus(url, "rejected", None, None, str(error), time.time())
+        except (urllib.error.URLError, OSError) as error:
+            if method == "HEAD":
+                continue
+            reason = getattr(error, "reason", error)
+            return LinkStatus(url, "error", None, None, f"{method}: {reason}", time.time())
+    raise AssertionError("unreachable")
+
+
+def load_cache(path: Path) -> dict[str, LinkStatus]:
+    try:
+        records = json.loads(path.read_text(encoding="utf-8"))
+        return {record["url"]: LinkStatus(**record) for record in records}
+    except (OSError, ValueError, TypeError, KeyError):
+        return {}
+
+
+def save_cache(path: Path, results: dict[str, LinkStatus]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=path.parent, prefix=".", delete=False
+    ) as temporary_file:
+        json.dump(
+            [asdict(result) for _, result in sorted(results.items())],
+            temporary_file,
+            indent=1,
+        )
+    os.replace(temporary_file.name, path)
+
+
+def check_links(
+    urls: list[str],
+    cache: dict[str, LinkStatus],
+    ttl_seconds: float,
+    jobs: int = DEFAULT_JOBS,
+    per_host: int = DEFAULT_PER_HOST,
+    timeout: float = DEFAULT_TIMEOUT_SECONDS,
+    opener: urllib.request.OpenerDirector | None = None,
+) -> tuple[dict[str, LinkStatus], int]:
+    """Status of every URL plus how many were probed rather than read from ``cache``.
+
+    Healthy cached results younger than ``ttl_seconds`` are reused; everything
+    else is probed concurrently, at most ``per_host`` at a time for each host.
+    """
+    if jobs <= 0:
+        raise ValueError("--jobs must be positive")
+    if per_host <= 0:
+        raise ValueError("--per-host must be positive")
+
+    now = time.time()
+    results = {}
+    stale = []
+    for url in urls:
+        cached = cache.get(url)
+        if cached and cached.healthy and now - cached.checked < ttl_seconds:
+            results[url] = cached
+        else:
+            stale.append(url)
+
+    limiter = HostLimiter(per_host)
+
+    def limited_probe(url: str) -> LinkStatus:
+        with limiter(url):
+            return probe(url, timeout, opener)
+
+    # Interleave hosts so per-host limits do not leave workers waiting on one CDN.
+    by_host: dict[str, list[str]] = {}
+    for url in stale:
+        by_host.setdefault(urllib.parse.urlparse(url).hostname or "", []).append(url)
+    queues = list(by_host.values())
+    ordered = [
+        queue[depth]
+        for depth in range(max(map(len, queues), default=0))
+        for queue in queues
+        if depth < len(queue)
+    ]
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        for result in executor.map(limited_probe, ordered):
+            results[result.url] = result
+    return results, len(ordered)
+
+
+def main() -> int:
+    args = parse_args()
+    started = time.perf_counter()
+    places, errors = archive_urls(candidate_entries(args))
+    for error in errors:
+        print(f"error: {error}", file=sys.stderr)
+
+    cache = {} if args.refresh else load_cache(args.cache)
+    try:
+        results, probed = check_links(
+            sorted(places),
+            cache,
+            args.ttl_hours * 3600,
+            args.jobs,
+            args.per_host,
+            args.timeout,
+        )
+    except ValueError as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+    try:
+        save_cache(args.cache, {**cache, **results})
+    except OSError as error:
+        print(f"warning: could not write {args.cache}: {error}", file=sys.stderr)
+
+    unhealthy = [results[url] for url in sorted(places) if not results[url].healthy]
+    if args.json:
+        payload = [
+            {**asdict(results[url]), "places": places[url]} for url in sorted(places)
+        ]
+        json.dump(payload, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        for result in unhealthy:
+            code = f" {result.code}" if result.code else ""
+            print(f"{result.status}{code}: {result.url} ({result.detail})")
+            for place in places[result.url]:
+                print(f"  {place}")
+    print(
+        f"{len(places)} URLs, {probed} probed, {len(places) - probed} cached, "
+        f"{len(unhealthy)} unhealthy ({time.perf_counter() - started:.2f}s)",
+        file=sys.stderr,
+    )
+    return 1 if unhealthy or errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -6,6 +6,9 @@ import sys
 import tomllib
 from pathlib import Path
 
+from archive_model import load_metadata, load_product
+from changed_entries import archive_entries, changed_entries
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
@@ -31,20 +34,21 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Run validate_entry.py for entries that already contain documents.",
     )
+    parser.add_argument(
+        "--changed-since",
+        metavar="REV",
+        help=(
+            "Only check entries changed since this git revision, plus entries "
+            "recording the same document digests."
+        ),
+    )
     return parser.parse_args()
 
 
 def candidate_entries(args: argparse.Namespace) -> list[Path]:
     if args.entries:
         return sorted(path.resolve() for path in args.entries)
-    return sorted(path.parent.resolve() for path in args.items_root.glob("*/item.toml"))
-
-
-def load_metadata(entry: Path) -> dict:
-    metadata_path = entry / "item.toml"
-    if not metadata_path.is_file():
-        raise FileNotFoundError(f"item.toml is missing: {entry}")
-    return tomllib.loads(metadata_path.read_text(encoding="utf-8"))
+    return archive_entries(args.items_root)
 
 
 def validator_path() -> Path:
@@ -62,33 +66,53 @@ def validate(entry: Path) -> int:
 def main() -> int:
     args = parse_args()
     incomplete: list[Path] = []
+    hydratable: list[Path] = []
     failed = False
 
-    for entry in candidate_entries(args):
+    if args.changed_since:
+        # Like validate_entry.py, named entries are checked alongside the changed ones.
+        entries = sorted(path.resolve() for path in args.entries)
+        try:
+            changed = changed_entries(args.changed_since, args.items_root)
+        except ValueError as error:
+            print(f"error: {error}", file=sys.stderr)
+            return 1
+        entries += [entry for entry in changed if entry not in entries]
+    else:
+        entries = candidate_entries(args)
+    for entry in entries:
         try:
-            metadata = load_metadata(entry)
+            product = load_product(entry)
         except (OSError, tomllib.TOMLDecodeError) as error:
             print(f"error: {error}", file=sys.stderr)
             failed = True
             continue
 
-        documents = metadata.get("documents")
-        if isinstance(documents, list) and documents:
+        if product.documents:
             if args.validate_complete and validate(entry) != 0:
                 failed = True
             continue
         incomplete.append(entry)
+        if product.source_documents:
+            hydratable.append(entry)
 
     if incomplete:
         print("Incomplete product-document archives:")
         for entry in incomplete:
-            print(entry)
+            suffix = " (sources recorded)" if entry in hydratable else ""
+            print(f"{entry}{suffix}")
         print(
             "\nComplete these entries with the archive-product-documents skill: "
             "discover official PDFs, download them with download_pdf.py, add "
             "validator-compliant [[documents]] metadata, update README.md, and run "
             "validate_entry.py."
         )
+        if hydratable:
+            print(
+                "Entries marked (sources recorded) already list verified "
+                "[[source_documents]]; download and promote them in one run with "
+                "hydrate_source_documents.py."
+            )
     else:
         print("No incomplete product-document archives found.")
 
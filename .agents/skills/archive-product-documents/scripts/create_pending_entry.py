@@ -1,14 +1,29 @@
 #!/usr/bin/env python3
 
 import argparse
+import errno
 import json
+import os
 import re
+import secrets
+import shutil
 import sys
+from collections.abc import Sequence
 from pathlib import Path
 
+from archive_model import Document
 
 ENTRY_SLUG_PATTERN = re.compile(r"^[a-z0-9]+(?:-[a-z0-9]+)*$")
 
+# README lines between these markers are generated from item.toml by
+# render_readmes.py; everything else in a README is written by hand.
+DOCUMENTS_START = "<!-- documents:start -->"
+DOCUMENTS_END = "<!-- documents:end -->"
+NO_DOCUMENTS = (
+    "No documents have been archived yet. Complete this entry later with the "
+    "archive-product-documents skill and its existing download and validation tools."
+)
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
@@ -69,6 +84,35 @@ def render_item_toml(
     return "\n".join(lines)
 
 
+def render_document_list(documents: Sequence[Document]) -> str:
+    """Render the generated, marker-delimited document list for a README.
+
+    Archived documents link their local file. Source documents not downloaded
+    yet have no file, so they are listed by title with the URL to fetch.
+    """
+    lines = [DOCUMENTS_START]
+    if not documents:
+        lines.append(NO_DOCUMENTS)
+    for document in documents:
+        details = [document.type or ""]
+        if document.languages:
+            details.append("-".join(document.languages))
+        if document.pages:
+            details.append(f"{document.pages} page{'' if document.pages == 1 else 's'}")
+        if document.file:
+            heading = f"[{document.title or document.file}]({document.file})"
+            source = document.source_page_url or document.source_url
+        else:
+            heading = f"**{document.title or document.source_url}**"
+            details.append("not yet archived")
+            source = document.source_url
+        lines.append(f"- {heading} — {', '.join(filter(None, details))}  ")
+        if source:
+            lines.append(f"  Source: {source}")
+    lines.append(DOCUMENTS_END)
+    return "\n".join(lines) + "\n"
+
+
 def render_readme(
     *, brand: str, model: str, name: str, manufacturer: str, product_page: str
 ) -> str:
@@ -79,13 +123,32 @@ def render_readme(
         f"- **Manufacturer:** {manufacturer}\n"
         f"- **Model:** {model}\n"
         f"- **Product page:** {product_page}\n\n"
-        "## Documents\n\n"
-        "No documents have been archived yet. Complete this entry later with the "
-        "archive-product-documents skill and its existing download and validation tools.\n"
+        "## Documents\n\n" + render_document_list([])
     )
 
 
+def write_synced(path: Path, text: str) -> None:
+    with path.open("w", encoding="utf-8") as handle:
+        handle.write(text)
+        handle.flush()
+        os.fsync(handle.fileno())
+
+
+def fsync_directory(path: Path) -> None:
+    descriptor = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
 def create_entry(args: argparse.Namespace) -> Path:
+    """Create the entry in a hidden sibling directory, then rename it into place.
+
+    A crash at any point leaves either no entry or a complete one (plus, at
+    worst, a stale ``.<slug>.*`` staging directory that archive scans ignore),
+    so intake can simply be re-run.
+    """
     slug = args.slug or slugify(f"{args.brand}-{args.model}")
     validate_slug(slug)
 
@@ -96,27 +159,45 @@ def create_entry(args: argparse.Namespace) -> Path:
     if entry.exists():
         raise FileExistsError(f"entry already exists: {entry}")
 
-    entry.mkdir(parents=True)
-    (entry / "item.toml").write_text(
-        render_item_toml(
-            brand=args.brand,
-            manufacturer=args.manufacturer,
-            model=args.model,
-            name=args.name,
-            product_page=args.product_page,
-        ),
-        encoding="utf-8",
-    )
-    (entry / "README.md").write_text(
-        render_readme(
-            brand=args.brand,
-            manufacturer=args.manufacturer,
-            model=args.model,
-            name=args.name,
-            product_page=args.product_page,
-        ),
-        encoding="utf-8",
-    )
+    items_root.mkdir(parents=True, exist_ok=True)
+    # A plain mkdir (unlike mkdtemp) keeps the usual umask-derived permissions.
+    staging = items_root / f".{slug}.{secrets.token_hex(8)}"
+    staging.mkdir()
+    try:
+        write_synced(
+            staging / "item.toml",
+            render_item_toml(
+                brand=args.brand,
+                manufacturer=args.manufacturer,
+                model=args.model,
+                name=args.name,
+                product_page=args.product_page,
+            ),
+        )
+        write_synced(
+            staging / "README.md",
+            render_readme(
+                brand=args.brand,
+                manufacturer=args.manufacturer,
+                model=args.model,
+                name=args.name,
+                product_page=args.product_page,
+            ),
+        )
+        fsync_directory(staging)
+        if entry.exists():
+            raise FileExistsError(f"entry already exists: {entry}")
+        try:
+            os.rename(staging, entry)
+        except OSError as error:
+            # Another writer won the race for this slug.
+            if error.errno in {errno.EEXIST, errno.ENOTEMPTY}:
+                raise FileExistsError(f"entry already exists: {entry}") from error
+            raise
+        fsync_directory(items_root)
+    finally:
+        if staging.exists():
+            shutil.rmtree(staging, ignore_errors=True)
     return entry
 
 
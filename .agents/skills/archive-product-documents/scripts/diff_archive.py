@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import subprocess
+import sys
+import tomllib
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+
+from changed_entries import archive_entries
+from pack_archive import Pack
+
+
+# Tables compared document by document rather than as plain fields.
+DOCUMENT_TABLES = ("documents",)
+
+
+@dataclass
+class EntryDiff:
+    slug: str
+    status: str  # "added", "removed", or "changed"
+    fields: list[tuple[str, object, object]] = field(default_factory=list)
+    added: list[dict] = field(default_factory=list)
+    removed: list[dict] = field(default_factory=list)
+    replaced: list[tuple[dict, dict]] = field(default_factory=list)
+    # Same content, different metadata: (document, [(field, old, new), ...]).
+    edited: list[tuple[dict, list[tuple[str, object, object]]]] = field(
+        default_factory=list
+    )
+
+    @property
+    def empty(self) -> bool:
+        return not (
+            self.fields or self.added or self.removed or self.replaced or self.edited
+        )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Compare two archive snapshots by entry slug and document sha256. Each "
+            "snapshot is an items directory, a pack_archive.py pack, or a git "
+            "revision."
+        )
+    )
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument(
+        "--items-root",
+        type=Path,
+        default=Path("docs/items"),
+        help="Items root inside git revisions (default: docs/items)",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the diff as JSON.")
+    return parser.parse_args()
+
+
+def directory_snapshot(items_root: Path) -> dict[str, dict]:
+    return {
+        entry.name: tomllib.loads((entry / "item.toml").read_text(encoding="utf-8"))
+        for entry in archive_entries(items_root)
+    }
+
+
+def pack_snapshot(path: Path) -> dict[str, dict]:
+    snapshot = {}
+    with Pack(path) as pack:
+        for name in pack.members:
+            member = PurePosixPath(name)
+            if member.name == "item.toml" and len(member.parts) == 2:
+                snapshot[member.parts[0]] = tomllib.loads(pack.read(name).decode("utf-8"))
+    return snapshot
+
+
+def git_snapshot(
+    revision: str, items_root: Path, repository: Path = Path(".")
+) -> dict[str, dict]:
+    """Every ``item.toml`` at ``revision``, read through one ``git cat-file`` batch.
+
+    ``items_root`` is relative to ``repository``, the working directory git runs in.
+    """
+    prefix = PurePosixPath(items_root.as_posix())
+    try:
+        listing = subprocess.run(
+            ["git", "ls-tree", "-r", "-z", revision, "--", f"{prefix}/"],
+            cwd=repository,
+            check=True,
+            capture_output=True,
+        ).stdout
+    except FileNotFoundError as error:
+        raise ValueError("git is unavailable") from error
+    except subprocess.CalledProcessError as error:
+        raise ValueError(error.stderr.decode(errors="replace").strip()) from error
+
+    blobs = {}
+    for record in filter(None, listing.split(b"\0")):
+        info, name = record.split(b"\t", 1)
+        path = PurePosixPath(name.decode("utf-8"))
+        if path.name != "item.toml" or path.parent.parent != prefix:
+            continue
+        if path.parent.name.startswith("."):
+            continue
+        blobs[path.parent.name] = info.split()[2].decode("ascii")
+    if not blobs:
+        return {}
+
+    output = subprocess.run(
+        ["git", "cat-file", "--batch"],
+        cwd=repository,
+        input="".join(f"{blob}\n" for blob in blobs.values()).encode("ascii"),
+        check=True,
+        capture_output=True,
+    ).stdout
+    snapshot = {}
+    position = 0
+    for slug in blobs:
+        header_end = output.index(b"\n", position)
+        size = int(output[position:header_end].split()[2])
+        content = output[header_end + 1 : header_end + 1 + size]
+        snapshot[slug] = tomllib.loads(content.decode("utf-8"))
+        position = header_end + 1 + size + 1
+    return snapshot
+
+
+def load_snapshot(source: str, items_root: Path) -> dict[str, dict]:
+    path = Path(source)
+    if path.is_dir():
+        return directory_snapshot(path)
+    if path.is_file():
+        return pack_snapshot(path)
+    return git_snapshot(source, items_root)
+
+
+def _field_changes(old: dict, new: dict, skip=()) -> list[tuple[str, object, object]]:
+    return [
+        (name, old.get(name), new.get(name))
+        for name in sorted(old.keys() | new.keys())
+        if name not in skip and old.get(name) != new.get(name)
+    ]
+
+
+def _documents(metadata: dict) -> list[dict]:
+    return [
+        document
+        for table in DOCUMENT_TABLES
+        for document in metadata.get(table) or ()
+        if isinstance(document, dict)
+    ]
+
+
+def _document_key(document: dict) -> tuple:
+    digest = document.get("sha256")
+    if isinstance(digest, str) and digest:
+        return ("sha256", digest)
+    return ("file", document.get("file"))
+
+
+def _keyed_documents(metadata: dict) -> dict[tuple, dict]:
+    """Documents keyed by sha256, or by file name where no sha256 is recorded.
+
+    Documents sharing a key also carry their file name (and position, should
+    that repeat too) so that none of them is dropped.
+    """
+    documents = _documents(metadata)
+    counts = Counter(_document_key(document) for document in documents)
+    keyed = {}
+    for index, document in enumerate(documents):
+        key = _document_key(document)
+        if counts[key] > 1:
+            key = (*key, document.get("file"))
+            if key in keyed:
+                key = (*key, index)
+        keyed[key] = document
+    return keyed
+
+
+def diff_entry(slug: str, old: dict, new: dict) -> EntryDiff:
+    """Field changes plus documents matched by sha256, then by file name."""
+    result = EntryDiff(slug, "changed", _field_changes(old, new, DOCUMENT_TABLES))
+    old_by_key = _keyed_documents(old)
+    new_by_key = _keyed_documents(new)
+    for key in old_by_key.keys() & new_by_key.keys():
+        changes = _field_changes(old_by_key[key], new_by_key[key])
+        if changes:
+            result.edited.append((new_by_key[key], changes))
+
+    removed = [old_by_key[key] for key in old_by_key.keys() - new_by_key.keys()]
+    added = [new_by_key[key] for key in new_by_key.keys() - old_by_key.keys()]
+    added_by_file = {document.get("file"): document for document in added}
+    for document in removed:
+        replacement = added_by_file.pop(document.get("file"), None)
+        if replacement is None:
+            result.removed.append(document)
+        elif document.get("sha256") and replacement.get("sha256"):
+            result.replaced.append((document, replacement))
+        else:
+            # A sha256 was recorded or dropped: the same document, edited.
+            result.edited.append((replacement, _field_changes(document, replacement)))
+    result.added = list(added_by_file.values())
+    for documents in (result.added, result.removed, result.edited, result.replaced):
+        documents.sort(key=lambda item: str(_file_of(item)))
+    return result
+
+
+def _file_of(item) -> object:
+    document = item[0] if isinstance(item, tuple) else item
+    return document.get("file")
+
+
+def diff_snapshots(old: dict[str, dict], new: dict[str, dict]) -> list[EntryDiff]:
+    """Differences between two ``{slug: item.toml data}`` snapshots, by slug.
+
+    Documents are identified by their recorded sha256, so no PDF is read.
+    """
+    diffs = []
+    for slug in sorted(old.keys() | new.keys()):
+        if slug not in new:
+            diffs.append(EntryDiff(slug, "removed", removed=_documents(old[slug])))
+        elif slug not in old:
+            diffs.append(EntryDiff(slug, "added", added=_documents(new[slug])))
+        elif old[slug] != new[slug]:
+            entry_diff = diff_entry(slug, old[slug], new[slug])
+            if not entry_diff.empty:
+                diffs.append(entry_diff)
+    return diffs
+
+
+def _short(document: dict) -> str:
+    digest = document.get("sha256")
+    suffix = f" ({digest[:12]})" if isinstance(digest, str) else ""
+    return f"{document.get('file') or document.get('title') or '?'}{suffix}"
+
+
+def _value(value) -> str:
+    if value is None:
+        return "(unset)"
+    if isinstance(value, str):
+        return repr(value)
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=str, ensure_ascii=False)
+    return str(value)
+
+
+def print_diff(diffs: list[EntryDiff]) -> None:
+    markers = {"added": "+", "removed": "-", "changed": "~"}
+    for entry_diff in diffs:
+        print(f"{markers[entry_diff.status]} {entry_diff.slug}")
+        for name, old, new in entry_diff.fields:
+            print(f"    {name}: {_value(old)} -> {_value(new)}")
+        for document in entry_diff.added:
+            print(f"    + {_short(document)}")
+        for document in entry_diff.removed:
+            print(f"    - {_short(document)}")
+        for old, new in entry_diff.replaced:
+            print(f"    ~ {_short(old)} replaced by {str(new.get('sha256'))[:12]}")
+        for document, changes in entry_diff.edited:
+            for name, old, new in changes:
+                print(f"    ~ {_short(document)} {name}: {_value(old)} -> {_value(new)}")
+
+
+def diff_json(diffs: list[EntryDiff]) -> list[dict]:
+    def changes(items):
+        return [{"field": name, "old": old, "new": new} for name, old, new in items]
+
+    return [
+        {
+            "slug": entry_diff.slug,
+            "status": entry_diff.status,
+            "fields": changes(entry_diff.fields),
+            "added": entry_diff.added,
+            "removed": entry_diff.removed,
+            "replaced": [{"old": old, "new": new} for old, new in entry_diff.replaced],
+            "edited": [
+                {"document": document, "changes": changes(items)}
+                for document, items in entry_diff.edited
+            ],
+        }
+        for entry_diff in diffs
+    ]
+
+
+def main() -> int:
+    args = parse_args()
+    try:
+        old = load_snapshot(args.old, args.items_root)
+        new = load_snapshot(args.new, args.items_root)
+    except (OSError, ValueError, KeyError, tomllib.TOMLDecodeError) as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+
+    diffs = diff_snapshots(old, new)
+    if args.json:
+        json.dump(diff_json(diffs), sys.stdout, indent=2, default=str, ensure_ascii=False)
+        sys.stdout.write("\n")
+    else:
+        print_diff(diffs)
+    counts = {status: 0 for status in ("added", "removed", "changed")}
+    for entry_diff in diffs:
+        counts[entry_diff.status] += 1
+    print(
+        f"{len(old)} -> {len(new)} entries: "
+        + ", ".join(f"{count} {status}" for status, count in counts.items()),
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,21 +2,58 @@
 
 import argparse
 import hashlib
+import http.client
 import ipaddress
+import json
 import os
+import re
+import shutil
 import socket
 import sys
 import tempfile
+import time
 import urllib.error
 import urllib.parse
 import urllib.request
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
 from pathlib import Path
 
+from pdf_metadata import PdfMetadata, PdfScanner, pdf_fields, scan_pdf
+
 
 DEFAULT_MAX_BYTES = 100 * 1024 * 1024
 DEFAULT_TIMEOUT_SECONDS = 60
 USER_AGENT = "BlueprintGardenArchive/1.0"
+SHA256_PATTERN = re.compile(r"^[a-f0-9]{64}$")
+MIRROR_ENVIRONMENT_VARIABLE = "ARCHIVE_PDF_MIRROR"
+FICLONE = 0x40049409  # Linux ioctl: share extents with another file (reflink)
+
+
+PHASES = ("dns", "connect", "tls", "wait", "transfer")
+
+
+@dataclass(frozen=True)
+class DownloadTimings:
+    """Seconds spent in each phase of one download, summed over redirect hops.
+
+    ``dns`` is the public-address check's getaddrinfo; ``connect`` is the TCP
+    handshake; ``tls`` the TLS handshake; ``wait`` the rest of the request up to
+    the response headers (server time to first byte); ``transfer`` reading and
+    writing the body.
+    """
+
+    dns: float = 0.0
+    connect: float = 0.0
+    tls: float = 0.0
+    wait: float = 0.0
+    transfer: float = 0.0
+    total: float = 0.0
+    redirects: int = 0
+
+    def throughput(self, byte_count: int) -> float | None:
+        """Body bytes per second, or None when nothing was transferred."""
+        return byte_count / self.transfer if self.transfer > 0 else None
 
 
 @dataclass(frozen=True)
@@ -24,6 +61,30 @@ class DownloadResult:
     sha256: str
     byte_count: int
     resolved_url: str
+    reused: bool = False
+    from_mirror: bool = False
+    timings: DownloadTimings = DownloadTimings()
+    # Scanned in the same pass that hashed the file, whichever way it arrived.
+    pdf: PdfMetadata | None = None
+
+
+class PhaseClock:
+    """Mutable per-download accumulator behind ``DownloadTimings``."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.seconds = dict.fromkeys(PHASES, 0.0)
+        self.redirects = 0
+
+    def add(self, phase: str, started: float) -> None:
+        self.seconds[phase] += time.perf_counter() - started
+
+    def timings(self) -> DownloadTimings:
+        return DownloadTimings(
+            **self.seconds,
+            total=time.perf_counter() - self.started,
+            redirects=self.redirects,
+        )
 
 
 def parse_args() -> argparse.Namespace:
@@ -36,10 +97,49 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--max-bytes", type=int, default=DEFAULT_MAX_BYTES)
     parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_SECONDS)
     parser.add_argument("--replace", action="store_true")
+    parser.add_argument(
+        "--expect-bytes",
+        type=int,
+        help="Abort as soon as the response is known to differ from this size.",
+    )
+    parser.add_argument(
+        "--expect-sha256",
+        help=(
+            "Reject a download with a different digest; skip the network when "
+            "--output already has this digest."
+        ),
+    )
+    parser.add_argument(
+        "--mirror",
+        type=Path,
+        default=os.environ.get(MIRROR_ENVIRONMENT_VARIABLE),
+        help=(
+            "Content-addressed local mirror consulted before the network and "
+            f"filled by successful downloads (default: ${MIRROR_ENVIRONMENT_VARIABLE})."
+        ),
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Fail instead of using the network when the mirror lacks the document.",
+    )
+    parser.add_argument(
+        "--timing-log",
+        type=Path,
+        help="Append this download's phase timings to an NDJSON file.",
+    )
     return parser.parse_args()
 
 
-def validate_public_url(url: str) -> None:
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while chunk := handle.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def validate_public_url(url: str, clock: PhaseClock | None = None) -> None:
     parsed = urllib.parse.urlparse(url)
     if parsed.scheme not in {"http", "https"} or not parsed.netloc:
         raise ValueError("URL must be a public HTTP or HTTPS URL")
@@ -63,6 +163,7 @@ def validate_public_url(url: str) -> None:
     except ValueError as error:
         raise ValueError("URL contains an invalid port") from error
 
+    started = time.perf_counter()
     try:
         addresses = {
             result[4][0]
@@ -72,6 +173,9 @@ def validate_public_url(url: str) -> None:
         }
     except socket.gaierror as error:
         raise ValueError(f"URL hostname could not be resolved: {hostname}") from error
+    finally:
+        if clock:
+            clock.add("dns", started)
 
     if not addresses:
         raise ValueError(f"URL hostname did not resolve: {hostname}")
@@ -84,11 +188,207 @@ def validate_public_url(url: str) -> None:
 
 
 class PublicOnlyRedirectHandler(urllib.request.HTTPRedirectHandler):
+    def __init__(self, clock: PhaseClock | None = None) -> None:
+        super().__init__()
+        self.clock = clock
+
     def redirect_request(self, request, file_pointer, code, message, headers, new_url):
-        validate_public_url(new_url)
-        return super().redirect_request(
+        validate_public_url(new_url, self.clock)
+        redirected = super().redirect_request(
             request, file_pointer, code, message, headers, new_url
         )
+        if self.clock and redirected is not None:
+            self.clock.redirects += 1
+        return redirected
+
+
+class _TimedConnectionMixin:
+    """Split connection setup into TCP and TLS time on a ``PhaseClock``."""
+
+    def __init__(self, *args, clock: PhaseClock, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._clock = clock
+        create_connection = self._create_connection
+
+        def timed_create_connection(*create_args, **create_kwargs):
+            started = time.perf_counter()
+            try:
+                return create_connection(*create_args, **create_kwargs)
+            finally:
+                clock.add("connect", started)
+
+        self._create_connection = timed_create_connection
+
+    def connect(self) -> None:
+        started = time.perf_counter()
+        tcp_before = self._clock.seconds["connect"]
+        super().connect()
+        if isinstance(self, http.client.HTTPSConnection):
+            tcp = self._clock.seconds["connect"] - tcp_before
+            self._clock.seconds["tls"] += time.perf_counter() - started - tcp
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, http.client.HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, http.client.HTTPSConnection):
+    pass
+
+
+class _TimedHTTPHandler(urllib.request.HTTPHandler):
+    def __init__(self, clock: PhaseClock) -> None:
+        super().__init__()
+        self.clock = clock
+
+    def http_open(self, request):
+        return self.do_open(_TimedHTTPConnection, request, clock=self.clock)
+
+
+class _TimedHTTPSHandler(urllib.request.HTTPSHandler):
+    def __init__(self, clock: PhaseClock) -> None:
+        super().__init__()
+        self.clock = clock
+
+    def https_open(self, request):
+        return self.do_open(
+            _TimedHTTPSConnection, request, context=self._context, clock=self.clock
+        )
+
+
+def build_timed_opener(clock: PhaseClock) -> urllib.request.OpenerDirector:
+    return urllib.request.build_opener(
+        PublicOnlyRedirectHandler(clock),
+        _TimedHTTPHandler(clock),
+        _TimedHTTPSHandler(clock),
+    )
+
+
+def clone_file(source: Path, destination: Path) -> None:
+    """Copy ``source`` to ``destination``, sharing extents when the filesystem can."""
+    with source.open("rb") as source_file, destination.open("wb") as destination_file:
+        try:
+            import fcntl
+
+            fcntl.ioctl(destination_file.fileno(), FICLONE, source_file.fileno())
+            return
+        except (ImportError, OSError):
+            pass
+        shutil.copyfileobj(source_file, destination_file, 1024 * 1024)
+
+
+def place_file(source: Path, output: Path) -> None:
+    """Atomically place a copy of ``source`` at ``output``."""
+    output.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporary_name = tempfile.mkstemp(
+        dir=output.parent, prefix=f".{output.name}."
+    )
+    os.close(descriptor)
+    temporary_path = Path(temporary_name)
+    try:
+        clone_file(source, temporary_path)
+        os.replace(temporary_path, output)
+    finally:
+        if temporary_path.exists():
+            temporary_path.unlink()
+
+
+class LocalMirror:
+    """Content-addressed PDF store shared by archive rebuilds.
+
+    Layout under ``root``::
+
+        sha256/<first two hex digits>/<digest>.pdf   document bytes
+        urls/<sha256 of the source URL>.json         {"url", "sha256", "resolved_url"}
+
+    Documents are found by digest when it is known and by source URL otherwise.
+    Every file is written to a temporary name and renamed into place, so
+    concurrent writers never expose a partial file.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+
+    def document_path(self, sha256: str) -> Path:
+        return self.root / "sha256" / sha256[:2] / f"{sha256}.pdf"
+
+    def _url_path(self, url: str) -> Path:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.root / "urls" / f"{key}.json"
+
+    def lookup(self, url: str, sha256: str | None = None) -> tuple[Path, str, str] | None:
+        """Return ``(path, sha256, resolved_url)`` of a mirrored copy, if any."""
+        resolved_url = url
+        try:
+            record = json.loads(self._url_path(url).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            record = None
+        if record and record.get("url") == url:
+            if sha256 is None:
+                sha256 = record.get("sha256")
+            if record.get("sha256") == sha256:
+                resolved_url = record.get("resolved_url") or url
+        if not sha256:
+            return None
+        path = self.document_path(sha256)
+        if not path.is_file():
+            return None
+        return path, sha256, resolved_url
+
+    def store(self, url: str, source: Path, sha256: str, resolved_url: str) -> None:
+        path = self.document_path(sha256)
+        if not path.is_file():
+            place_file(source, path)
+        index_path = self._url_path(url)
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", dir=index_path.parent, prefix=".", suffix=".json", delete=False
+        ) as index_file:
+            json.dump(
+                {"url": url, "sha256": sha256, "resolved_url": resolved_url}, index_file
+            )
+        os.replace(index_file.name, index_path)
+
+
+def store_in_mirror(
+    mirror: LocalMirror, url: str, source: Path, sha256: str, resolved_url: str
+) -> None:
+    """Copy an archived file into the mirror, warning instead of failing.
+
+    The verified file is already in place when this runs, so a full or
+    read-only mirror must not turn the download into a reported failure.
+    """
+    try:
+        mirror.store(url, source, sha256, resolved_url)
+    except OSError as error:
+        print(
+            f"warning: could not store {url} in the local mirror: {error}", file=sys.stderr
+        )
+
+
+def fetch_from_mirror(
+    mirror: LocalMirror,
+    url: str,
+    output: Path,
+    max_bytes: int,
+    expected_bytes: int | None,
+    expected_sha256: str | None,
+) -> DownloadResult | None:
+    found = mirror.lookup(url, expected_sha256)
+    if not found:
+        return None
+    path, sha256, resolved_url = found
+    byte_count = path.stat().st_size
+    if byte_count > max_bytes or (
+        expected_bytes is not None and byte_count != expected_bytes
+    ):
+        return None
+    # A corrupted mirror file must never be archived, so check its content.
+    pdf = scan_pdf(path)
+    if not pdf.has_signature or pdf.sha256 != sha256:
+        return None
+    place_file(path, output)
+    return DownloadResult(sha256, byte_count, resolved_url, from_mirror=True, pdf=pdf)
 
 
 def download_pdf(
@@ -99,34 +399,89 @@ def download_pdf(
     replace: bool,
     referer: str | None = None,
     opener: urllib.request.OpenerDirector | None = None,
+    expected_bytes: int | None = None,
+    expected_sha256: str | None = None,
+    mirror: LocalMirror | None = None,
+    offline: bool = False,
 ) -> DownloadResult:
+    """Download ``url`` to ``output`` and time each phase into ``result.timings``.
+
+    Connection phases are only measured by the default opener; an injected
+    ``opener`` reports its whole ``open`` call as ``wait``.
+    """
+    clock = PhaseClock()
     if max_bytes <= 0:
         raise ValueError("--max-bytes must be positive")
+    if expected_bytes is not None and expected_bytes <= 0:
+        raise ValueError("--expect-bytes must be positive")
+    if expected_bytes is not None and expected_bytes > max_bytes:
+        raise ValueError(f"--expect-bytes exceeds --max-bytes ({max_bytes})")
+    if expected_sha256 is not None and not SHA256_PATTERN.fullmatch(expected_sha256):
+        raise ValueError("--expect-sha256 must be a lowercase SHA-256 digest")
     if timeout <= 0:
         raise ValueError("--timeout must be positive")
     if output.suffix.lower() != ".pdf":
         raise ValueError("output filename must end in .pdf")
+    if expected_sha256 and output.is_file():
+        # Already archived: the digest proves it, so no request is needed.
+        byte_count = output.stat().st_size
+        if expected_bytes is None or byte_count == expected_bytes:
+            pdf = scan_pdf(output)
+            if pdf.sha256 == expected_sha256:
+                return DownloadResult(
+                    expected_sha256,
+                    byte_count,
+                    url,
+                    reused=True,
+                    timings=clock.timings(),
+                    pdf=pdf,
+                )
     if output.exists() and not replace:
         raise FileExistsError(f"refusing to overwrite existing file: {output}")
 
-    validate_public_url(url)
+    if mirror:
+        mirrored = fetch_from_mirror(
+            mirror, url, output, max_bytes, expected_bytes, expected_sha256
+        )
+        if mirrored:
+            return DownloadResult(
+                mirrored.sha256,
+                mirrored.byte_count,
+                mirrored.resolved_url,
+                from_mirror=True,
+                timings=clock.timings(),
+                pdf=mirrored.pdf,
+            )
+    if offline:
+        raise ValueError(f"offline and the local mirror has no copy of {url}")
+
+    validate_public_url(url, clock)
     headers = {
         "Accept": "application/pdf,application/octet-stream;q=0.9,*/*;q=0.8",
         "User-Agent": USER_AGENT,
     }
     if referer:
-        validate_public_url(referer)
+        validate_public_url(referer, clock)
         headers["Referer"] = referer
 
     output.parent.mkdir(parents=True, exist_ok=True)
     request = urllib.request.Request(url, headers=headers)
-    url_opener = opener or urllib.request.build_opener(PublicOnlyRedirectHandler())
+    url_opener = opener or build_timed_opener(clock)
     temporary_path: Path | None = None
 
     try:
-        with url_opener.open(request, timeout=timeout) as response:
+        setup_before = sum(clock.seconds[phase] for phase in ("dns", "connect", "tls"))
+        opened = time.perf_counter()
+        response = url_opener.open(request, timeout=timeout)
+        # Whatever open() spent beyond lookups and handshakes was the request
+        # and the server's time to first byte, across every redirect hop.
+        setup = sum(clock.seconds[phase] for phase in ("dns", "connect", "tls"))
+        clock.seconds["wait"] += max(
+            time.perf_counter() - opened - (setup - setup_before), 0.0
+        )
+        with response:
             resolved_url = response.geturl()
-            validate_public_url(resolved_url)
+            validate_public_url(resolved_url, clock)
 
             content_length = response.headers.get("Content-Length")
             if content_length:
@@ -136,14 +491,20 @@ def download_pdf(
                     raise ValueError("response has an invalid Content-Length") from error
                 if declared_bytes > max_bytes:
                     raise ValueError(f"response exceeds {max_bytes} bytes")
+                if expected_bytes is not None and declared_bytes != expected_bytes:
+                    raise ValueError(
+                        f"response declares {declared_bytes} bytes, "
+                        f"expected {expected_bytes}"
+                    )
 
             with tempfile.NamedTemporaryFile(
                 dir=output.parent, prefix=f".{output.name}.", delete=False
             ) as temporary_file:
                 temporary_path = Path(temporary_file.name)
-                digest = hashlib.sha256()
+                scanner = PdfScanner()
                 byte_count = 0
                 first_chunk = True
+                transfer_started = time.perf_counter()
 
                 while chunk := response.read(64 * 1024):
                     if first_chunk:
@@ -153,22 +514,91 @@ def download_pdf(
                     byte_count += len(chunk)
                     if byte_count > max_bytes:
                         raise ValueError(f"response exceeds {max_bytes} bytes")
-                    digest.update(chunk)
+                    if expected_bytes is not None and byte_count > expected_bytes:
+                        raise ValueError(
+                            f"response exceeds the expected {expected_bytes} bytes"
+                        )
+                    scanner.update(chunk)
                     temporary_file.write(chunk)
+                clock.add("transfer", transfer_started)
 
                 if first_chunk:
                     raise ValueError("response was empty")
+                if expected_bytes is not None and byte_count != expected_bytes:
+                    raise ValueError(
+                        f"response has {byte_count} bytes, expected {expected_bytes}"
+                    )
+                pdf = scanner.finish()
+                if expected_sha256 is not None and pdf.sha256 != expected_sha256:
+                    raise ValueError("response does not match the expected SHA-256 digest")
 
         os.replace(temporary_path, output)
         temporary_path = None
-        return DownloadResult(digest.hexdigest(), byte_count, resolved_url)
+        if mirror:
+            store_in_mirror(mirror, url, output, pdf.sha256, resolved_url)
+        return DownloadResult(
+            pdf.sha256, byte_count, resolved_url, timings=clock.timings(), pdf=pdf
+        )
     finally:
         if temporary_path and temporary_path.exists():
             temporary_path.unlink()
 
 
+def print_metadata(output: Path, url: str, result: DownloadResult) -> None:
+    """Print the fields an archived document records in item.toml."""
+    print(f"file={output}")
+    print(f"bytes={result.byte_count}")
+    print(f"sha256={result.sha256}")
+    print(f"source_url={url}")
+    print(f"resolved_url={result.resolved_url}")
+    if result.pdf:
+        for line in pdf_fields(result.pdf):
+            print(line)
+
+
+def format_timings(result: DownloadResult) -> str:
+    timings = result.timings
+    phases = " ".join(
+        f"{phase}={getattr(timings, phase) * 1000:.0f}ms" for phase in PHASES
+    )
+    summary = f"{phases} total={timings.total * 1000:.0f}ms redirects={timings.redirects}"
+    throughput = timings.throughput(result.byte_count)
+    if throughput is not None:
+        summary += f" throughput={throughput / (1024 * 1024):.2f}MiB/s"
+    return summary
+
+
+def append_timing_log(path: Path, url: str, result: DownloadResult) -> None:
+    """Append one NDJSON record; a single O_APPEND write keeps parallel writers whole."""
+    source = "existing" if result.reused else "mirror" if result.from_mirror else "network"
+    record = {
+        "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "url": url,
+        "resolved_url": result.resolved_url,
+        "source": source,
+        "bytes": result.byte_count,
+        "sha256": result.sha256,
+        **{
+            name: round(value, 6) if isinstance(value, float) else value
+            for name, value in asdict(result.timings).items()
+        },
+        "throughput": result.timings.throughput(result.byte_count),
+    }
+    line = (json.dumps(record) + "\n").encode("utf-8")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    descriptor = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(descriptor, line)
+    finally:
+        os.close(descriptor)
+
+
 def main() -> int:
     args = parse_args()
+    mirror = LocalMirror(args.mirror) if args.mirror else None
+    if args.offline and not mirror:
+        print("error: --offline requires --mirror", file=sys.stderr)
+        return 1
     try:
         result = download_pdf(
             args.url,
@@ -177,16 +607,27 @@ def main() -> int:
             args.timeout,
             args.replace,
             args.referer,
+            expected_bytes=args.expect_bytes,
+            expected_sha256=args.expect_sha256,
+            mirror=mirror,
+            offline=args.offline,
         )
     except (ValueError, OSError, urllib.error.URLError) as error:
         print(f"error: {error}", file=sys.stderr)
         return 1
 
-    print(f"file={args.output}")
-    print(f"bytes={result.byte_count}")
-    print(f"sha256={result.sha256}")
-    print(f"source_url={args.url}")
-    print(f"resolved_url={result.resolved_url}")
+    if result.reused:
+        print("output already matches --expect-sha256; download skipped", file=sys.stderr)
+    elif result.from_mirror:
+        print(f"copied from local mirror {args.mirror}", file=sys.stderr)
+    else:
+        print(f"timing: {format_timings(result)}", file=sys.stderr)
+    if args.timing_log:
+        try:
+            append_timing_log(args.timing_log, args.url, result)
+        except OSError as error:
+            print(f"warning: could not write timing log: {error}", file=sys.stderr)
+    print_metadata(args.output, args.url, result)
     return 0
 
 
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+import tomllib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import combinations
+from pathlib import Path, PurePosixPath
+
+from archive_model import load_product
+from pdf_text import DEFAULT_CACHE_DIR, cached_text
+from validate_entry import SHA256_PATTERN
+
+
+DEFAULT_JOBS = 4
+DEFAULT_THRESHOLD = 0.8
+SHINGLE_WORDS = 5
+# 16 bands of 8 rows put the LSH candidate threshold near 0.7 Jaccard, so pairs
+# above the default reporting threshold are found with high probability.
+BANDS = 16
+ROWS = 8
+PERMUTATIONS = BANDS * ROWS
+# Documents with fewer words than this (usually scans without a text layer)
+# cannot be fingerprinted meaningfully.
+MIN_WORDS = 20
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+MASKS = tuple(
+    int.from_bytes(hashlib.blake2b(b"minhash-%d" % index, digest_size=8).digest(), "big")
+    for index in range(PERMUTATIONS)
+)
+SIGNATURE_VERSION = f"minhash-v1-{SHINGLE_WORDS}w-{PERMUTATIONS}"
+
+
+@dataclass(frozen=True)
+class ArchivedPdf:
+    entry: str
+    file: str
+    path: Path
+    sha256: str
+    title: str
+
+
+@dataclass(frozen=True)
+class Match:
+    left: ArchivedPdf
+    right: ArchivedPdf
+    similarity: float
+    kind: str  # "identical" (same sha256) or "near-duplicate"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Find archived PDFs whose text is identical or nearly identical, even when "
+            "their bytes differ."
+        )
+    )
+    parser.add_argument(
+        "--items-root",
+        type=Path,
+        default=Path("docs/items"),
+        help="Archive items root (default: docs/items)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help=f"Extracted-text and signature cache (default: {DEFAULT_CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Minimum text similarity to report, 0-1 (default: {DEFAULT_THRESHOLD})",
+    )
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS)
+    parser.add_argument("--json", action="store_true", help="Print matches as JSON.")
+    return parser.parse_args()
+
+
+def archived_documents(items_root: Path) -> list[ArchivedPdf]:
+    documents = []
+    for metadata_path in sorted(items_root.glob("*/item.toml")):
+        entry = metadata_path.parent
+        if entry.name.startswith("."):
+            continue
+        try:
+            product = load_product(entry)
+        except (OSError, tomllib.TOMLDecodeError) as error:
+            print(f"error: {entry}: {error}", file=sys.stderr)
+            continue
+        for document in product.documents:
+            relative_file = document.file
+            if relative_file is None:
+                continue
+            pure_path = PurePosixPath(relative_file)
+            if pure_path.is_absolute() or ".." in pure_path.parts:
+                continue
+            path = entry / pure_path
+            if not path.is_file():
+                continue
+            digest = document.sha256
+            if digest is None or not SHA256_PATTERN.fullmatch(digest):
+                digest = hashlib.sha256(path.read_bytes()).hexdigest()
+            documents.append(
+                ArchivedPdf(
+                    entry.name, relative_file, path, digest, document.title or relative_file
+                )
+            )
+    return documents
+
+
+def shingles(text: str) -> set[int]:
+    """64-bit hashes of every run of SHINGLE_WORDS normalized words."""
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) < MIN_WORDS:
+        return set()
+    return {
+        int.from_bytes(
+            hashlib.blake2b(
+                " ".join(words[index : index + SHINGLE_WORDS]).encode(), digest_size=8
+            ).digest(),
+            "big",
+        )
+        for index in range(len(words) - SHINGLE_WORDS + 1)
+    }
+
+
+def minhash(hashes: set[int]) -> tuple[int, ...]:
+    """One minimum per permutation, each permutation an XOR with a fixed mask."""
+    return tuple(min(value ^ mask for value in hashes) for mask in MASKS)
+
+
+def jaccard(left: set[int], right: set[int]) -> float:
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+def document_shingles(document: ArchivedPdf, cache_dir: Path) -> set[int]:
+    return shingles(cached_text(document.path, document.sha256, cache_dir))
+
+
+def cached_signature(document: ArchivedPdf, cache_dir: Path) -> tuple[int, ...] | None:
+    """MinHash signature of ``document``; None when it has no text.
+
+    Signatures, including "no text", are cached beside the extracted text and
+    keyed by content sha256. A cached document is not read or shingled again,
+    however often it is renamed.
+    """
+    cache_path = cache_dir / "minhash" / SIGNATURE_VERSION / f"{document.sha256}.json"
+    try:
+        cached = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        pass
+    else:
+        return None if cached is None else tuple(cached)
+    hashes = document_shingles(document, cache_dir)
+    signature = minhash(hashes) if hashes else None
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=cache_path.parent, prefix=".", delete=False
+    ) as temporary_file:
+        json.dump(signature, temporary_file)
+    os.replace(temporary_file.name, cache_path)
+    return signature
+
+
+def candidate_pairs(signatures: dict[int, tuple[int, ...]]) -> set[tuple[int, int]]:
+    """Pairs that agree on every row of at least one LSH band."""
+    pairs: set[tuple[int, int]] = set()
+    for band in range(BANDS):
+        buckets: dict[tuple[int, ...], list[int]] = {}
+        start = band * ROWS
+        for number, signature in signatures.items():
+            buckets.setdefault(signature[start : start + ROWS], []).append(number)
+        for members in buckets.values():
+            if len(members) > 1:
+                pairs.update(combinations(members, 2))
+    return pairs
+
+
+def find_duplicates(
+    documents: list[ArchivedPdf],
+    cache_dir: Path = DEFAULT_CACHE_DIR,
+    threshold: float = DEFAULT_THRESHOLD,
+    jobs: int = DEFAULT_JOBS,
+) -> tuple[list[Match], list[ArchivedPdf]]:
+    """Matches at or above ``threshold`` plus the documents that had no text.
+
+    Documents sharing a sha256 are reported as identical without reading them
+    twice. Every other document is fingerprinted once; LSH banding proposes
+    candidate pairs without comparing every pair, and each candidate is
+    confirmed with the exact Jaccard similarity of its word shingles. Only
+    candidates are shingled again, from the cached text.
+    """
+    if not 0 < threshold <= 1:
+        raise ValueError("--threshold must be in (0, 1]")
+    if jobs <= 0:
+        raise ValueError("--jobs must be positive")
+
+    by_digest: dict[str, list[ArchivedPdf]] = {}
+    for document in documents:
+        by_digest.setdefault(document.sha256, []).append(document)
+    matches = [
+        Match(left, right, 1.0, "identical")
+        for group in by_digest.values()
+        for left, right in combinations(group, 2)
+    ]
+
+    unique = [group[0] for group in by_digest.values()]
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        fingerprints = list(
+            executor.map(lambda document: cached_signature(document, cache_dir), unique)
+        )
+        signatures = {
+            number: signature
+            for number, signature in enumerate(fingerprints)
+            if signature is not None
+        }
+        pairs = sorted(candidate_pairs(signatures))
+        candidates = sorted({number for pair in pairs for number in pair})
+        shingle_sets = dict(
+            zip(
+                candidates,
+                executor.map(
+                    lambda number: document_shingles(unique[number], cache_dir),
+                    candidates,
+                ),
+            )
+        )
+    without_text = [
+        document
+        for document, signature in zip(unique, fingerprints)
+        if signature is None
+    ]
+
+    for left, right in pairs:
+        similarity = jaccard(shingle_sets[left], shingle_sets[right])
+        if similarity < threshold:
+            continue
+        for left_document in by_digest[unique[left].sha256]:
+            for right_document in by_digest[unique[right].sha256]:
+                matches.append(
+                    Match(left_document, right_document, similarity, "near-duplicate")
+                )
+    matches.sort(
+        key=lambda match: (-match.similarity, match.left.entry, match.left.file)
+    )
+    return matches, without_text
+
+
+def main() -> int:
+    args = parse_args()
+    started = time.perf_counter()
+    try:
+        documents = archived_documents(args.items_root)
+        matches, without_text = find_duplicates(
+            documents, args.cache_dir, args.threshold, args.jobs
+        )
+    except (OSError, ValueError) as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        payload = [
+            {
+                "similarity": round(match.similarity, 4),
+                "kind": match.kind,
+                "left": f"{match.left.entry}/{match.left.file}",
+                "right": f"{match.right.entry}/{match.right.file}",
+            }
+            for match in matches
+        ]
+        json.dump(payload, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        for match in matches:
+            left = f"{match.left.entry}/{match.left.file}"
+            right = f"{match.right.entry}/{match.right.file}"
+            print(f"{match.similarity:.3f}  {match.kind:<14}  {left}  {right}")
+    for document in without_text:
+        print(f"no text: {document.entry}/{document.file}", file=sys.stderr)
+    print(
+        f"{len(documents)} documents, {len(matches)} matches ({elapsed:.2f}s)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import re
+import sys
+import tomllib
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from archive_model import Product
+from complete_pending_entry import candidate_entries, load_metadata
+from create_pending_entry import toml_string
+from download_pdf import (
+    DEFAULT_MAX_BYTES,
+    DEFAULT_TIMEOUT_SECONDS,
+    MIRROR_ENVIRONMENT_VARIABLE,
+    DownloadResult,
+    LocalMirror,
+    append_timing_log,
+    download_pdf,
+)
+from item_schema import SHA256_PATTERN, is_non_empty_string
+from render_readmes import (
+    ADOPT_SECTIONS,
+    readme_documents,
+    remove_sections,
+    update_readme,
+    write_if_changed,
+)
+from validate_entry import expected_document_path
+
+
+DEFAULT_JOBS = 4
+# README sections written for source-only entries, removed on promotion once
+# the document list (see ADOPT_SECTIONS) has been regenerated.
+SOURCE_ONLY_SECTIONS = ("## Verified public document sources", "## Archive status")
+
+
+@dataclass(frozen=True)
+class PendingDocument:
+    entry: Path
+    index: int
+    record: dict
+    file: str
+
+
+@dataclass(frozen=True)
+class HydrationOutcome:
+    document: PendingDocument
+    result: DownloadResult | None = None
+    error: str | None = None
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Download every recorded [[source_documents]] PDF, verify it against the "
+            "recorded sha256 and bytes, and promote the entry to [[documents]]."
+        )
+    )
+    parser.add_argument(
+        "entries",
+        nargs="*",
+        type=Path,
+        help="Optional entry directories. Defaults to scanning docs/items.",
+    )
+    parser.add_argument(
+        "--items-root",
+        type=Path,
+        default=Path("docs/items"),
+        help="Archive items root (default: docs/items)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f"Concurrent downloads (default: {DEFAULT_JOBS})",
+    )
+    parser.add_argument("--max-bytes", type=int, default=DEFAULT_MAX_BYTES)
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_SECONDS)
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="List the documents that would be downloaded without fetching them.",
+    )
+    parser.add_argument(
+        "--mirror",
+        type=Path,
+        default=os.environ.get(MIRROR_ENVIRONMENT_VARIABLE),
+        help=f"Local content-addressed PDF mirror (default: ${MIRROR_ENVIRONMENT_VARIABLE}).",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Hydrate only from --mirror; never use the network.",
+    )
+    parser.add_argument(
+        "--timing-log",
+        type=Path,
+        help="Append each download's phase timings to an NDJSON file.",
+    )
+    return parser.parse_args()
+
+
+def pending_documents(entry: Path, metadata: dict) -> list[PendingDocument]:
+    records = metadata.get("source_documents")
+    if not isinstance(records, list):
+        return []
+
+    pending: list[PendingDocument] = []
+    for index, record in enumerate(records):
+        label = f"{entry}: source_documents[{index}]"
+        if not isinstance(record, dict):
+            raise ValueError(f"{label} must be a TOML table")
+        missing = {"type", "languages", "source_url"} - record.keys()
+        if missing:
+            raise ValueError(f"{label} is missing fields: {', '.join(sorted(missing))}")
+        if "file" in record:
+            raise ValueError(f"{label} already names a file")
+        # These values go straight to the downloader, so reject hand-edited
+        # types here rather than failing inside a worker thread.
+        for field_name in ("source_url", "source_page_url"):
+            if field_name in record and not is_non_empty_string(record[field_name]):
+                raise ValueError(f"{label}.{field_name} must be a non-empty string")
+        byte_count = record.get("bytes")
+        if "bytes" in record and not (type(byte_count) is int and byte_count > 0):
+            raise ValueError(f"{label}.bytes must be a positive integer")
+        digest = record.get("sha256")
+        if "sha256" in record and not (
+            isinstance(digest, str) and SHA256_PATTERN.fullmatch(digest)
+        ):
+            raise ValueError(f"{label}.sha256 must be a lowercase SHA-256 digest")
+        relative_file = expected_document_path(entry.name, record)
+        if relative_file is None:
+            raise ValueError(f"{label} cannot be named from its type and languages")
+        pending.append(PendingDocument(entry, index, record, relative_file))
+    return pending
+
+
+def hydrate_document(
+    document: PendingDocument,
+    max_bytes: int,
+    timeout: float,
+    opener: urllib.request.OpenerDirector | None = None,
+    mirror: LocalMirror | None = None,
+    offline: bool = False,
+) -> HydrationOutcome:
+    record = document.record
+    try:
+        result = download_pdf(
+            record["source_url"],
+            document.entry / document.file,
+            max_bytes,
+            timeout,
+            replace=False,
+            referer=record.get("source_page_url"),
+            opener=opener,
+            expected_bytes=record.get("bytes"),
+            expected_sha256=record.get("sha256"),
+            mirror=mirror,
+            offline=offline,
+        )
+    except (ValueError, OSError, urllib.error.URLError) as error:
+        return HydrationOutcome(document, error=str(error))
+    return HydrationOutcome(document, result)
+
+
+def discard_downloads(outcomes: list[HydrationOutcome]) -> None:
+    """Remove the files this run placed for an entry that was not promoted.
+
+    Its item.toml still lists them as source documents, so a re-run must be
+    able to download them again. A record without a sha256 gives no way to
+    recognize a leftover file, which would otherwise block that download.
+    """
+    for outcome in outcomes:
+        if outcome.result and not outcome.result.reused:
+            (outcome.document.entry / outcome.document.file).unlink(missing_ok=True)
+
+
+def promote_item_toml(text: str, outcomes: list[HydrationOutcome]) -> str:
+    """Rename [[source_documents]] to [[documents]] and add the hydrated fields.
+
+    The file is edited line by line so comments, key order and quoting written by
+    hand survive the promotion. A digest or size that was never recorded is
+    appended from the download. The archive-status comment block is dropped
+    because it only describes the missing binaries.
+    """
+    by_index = {outcome.document.index: outcome for outcome in outcomes}
+    lines: list[str] = []
+    index = -1
+    in_source_table = False
+    in_status_comment = False
+
+    def close_table() -> None:
+        if not in_source_table:
+            return
+        outcome = by_index[index]
+        record = outcome.document.record
+        missing = []
+        if "sha256" not in record:
+            missing.append(f"sha256 = {toml_string(outcome.result.sha256)}")
+        if "bytes" not in record:
+            missing.append(f"bytes = {outcome.result.byte_count}")
+        end = len(lines)
+        while end and not lines[end - 1].strip():
+            end -= 1
+        lines[end:end] = missing
+
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("# Archive status"):
+            in_status_comment = True
+            continue
+        if in_status_comment:
+            if stripped.startswith("#"):
+                continue
+            in_status_comment = False
+
+        if stripped.startswith("["):
+            close_table()
+            in_source_table = stripped == "[[source_documents]]"
+            if in_source_table:
+                index += 1
+                lines.append(line.replace("[[source_documents]]", "[[documents]]"))
+                continue
+        lines.append(line)
+        if not in_source_table:
+            continue
+
+        outcome = by_index[index]
+        key = stripped.split("=", 1)[0].strip()
+        if key == "type":
+            lines.append(f"file = {toml_string(outcome.document.file)}")
+        elif key == "source_url":
+            resolved_url = outcome.result.resolved_url
+            if resolved_url != outcome.document.record["source_url"]:
+                lines.append(f"resolved_url = {toml_string(resolved_url)}")
+
+    close_table()
+    promoted = re.sub(r"\n{3,}", "\n\n", "\n".join(lines)) + "\n"
+    metadata = tomllib.loads(promoted)
+    if "source_documents" in metadata or len(metadata.get("documents", [])) < len(outcomes):
+        raise ValueError("item.toml could not be promoted line by line")
+    return promoted
+
+
+def promote_entry(entry: Path, outcomes: list[HydrationOutcome]) -> None:
+    metadata_path = entry / "item.toml"
+    readme_path = entry / "README.md"
+    promoted_toml = promote_item_toml(metadata_path.read_text(encoding="utf-8"), outcomes)
+    readme = readme_path.read_text(encoding="utf-8") if readme_path.is_file() else ""
+    product = Product.from_metadata(entry.name, tomllib.loads(promoted_toml))
+    try:
+        promoted_readme = update_readme(readme, readme_documents(product), ADOPT_SECTIONS)
+        promoted_readme = remove_sections(promoted_readme, SOURCE_ONLY_SECTIONS)
+    except ValueError as error:
+        # Hand-written notes are never dropped; the entry is promoted regardless.
+        print(f"warning: {entry}: README left for hand editing: {error}", file=sys.stderr)
+        promoted_readme = readme
+    # Each write is atomic. item.toml is the record of promotion, so it goes
+    # last and the README is put back if it cannot be written.
+    readme_existed = readme_path.is_file()
+    write_if_changed(readme_path, promoted_readme)
+    try:
+        write_if_changed(metadata_path, promoted_toml)
+    except OSError:
+        if readme_existed:
+            write_if_changed(readme_path, readme)
+        else:
+            readme_path.unlink(missing_ok=True)
+        raise
+
+
+def hydrate_entries(
+    entries: list[Path],
+    jobs: int,
+    max_bytes: int,
+    timeout: float,
+    dry_run: bool = False,
+    opener: urllib.request.OpenerDirector | None = None,
+    mirror: LocalMirror | None = None,
+    offline: bool = False,
+    timing_log: Path | None = None,
+) -> bool:
+    """Hydrate ``entries`` concurrently; return True when every entry succeeded."""
+    if jobs <= 0:
+        raise ValueError("--jobs must be positive")
+
+    failed = False
+    documents: list[PendingDocument] = []
+    for entry in entries:
+        try:
+            documents.extend(pending_documents(entry, load_metadata(entry)))
+        except (OSError, ValueError, tomllib.TOMLDecodeError) as error:
+            print(f"error: {error}", file=sys.stderr)
+            failed = True
+
+    if dry_run:
+        for document in documents:
+            print(f"{document.entry / document.file} <- {document.record['source_url']}")
+        return not failed
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        outcomes = list(
+            executor.map(
+                lambda document: hydrate_document(
+                    document, max_bytes, timeout, opener, mirror, offline
+                ),
+                documents,
+            )
+        )
+
+    by_entry: dict[Path, list[HydrationOutcome]] = {}
+    for outcome in outcomes:
+        if timing_log and outcome.result:
+            try:
+                append_timing_log(
+                    timing_log, outcome.document.record["source_url"], outcome.result
+                )
+            except OSError as error:
+                print(f"warning: could not write timing log: {error}", file=sys.stderr)
+        by_entry.setdefault(outcome.document.entry, []).append(outcome)
+
+    for entry, entry_outcomes in by_entry.items():
+        errors = [outcome for outcome in entry_outcomes if outcome.error]
+        for outcome in errors:
+            print(
+                f"error: {entry}: {outcome.document.file}: {outcome.error}",
+                file=sys.stderr,
+            )
+        if errors:
+            print(f"incomplete: {entry} ({len(errors)} of {len(entry_outcomes)} failed)")
+            discard_downloads(entry_outcomes)
+            failed = True
+            continue
+        try:
+            promote_entry(entry, entry_outcomes)
+        except (OSError, ValueError, tomllib.TOMLDecodeError) as error:
+            print(f"error: {entry}: {error}", file=sys.stderr)
+            discard_downloads(entry_outcomes)
+            failed = True
+            continue
+        print(f"hydrated: {entry} ({len(entry_outcomes)} documents)")
+
+    return not failed
+
+
+def main() -> int:
+    args = parse_args()
+    if args.offline and not args.mirror:
+        print("error: --offline requires --mirror", file=sys.stderr)
+        return 1
+    try:
+        succeeded = hydrate_entries(
+            candidate_entries(args),
+            args.jobs,
+            args.max_bytes,
+            args.timeout,
+            args.dry_run,
+            mirror=LocalMirror(args.mirror) if args.mirror else None,
+            offline=args.offline,
+            timing_log=args.timing_log,
+        )
+    except ValueError as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+    return 0 if succeeded else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
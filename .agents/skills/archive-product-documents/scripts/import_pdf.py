@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+
+import argparse
+import errno
+import os
+import sys
+import tempfile
+import urllib.parse
+from pathlib import Path
+
+from download_pdf import (
+    DEFAULT_MAX_BYTES,
+    FICLONE,
+    MIRROR_ENVIRONMENT_VARIABLE,
+    SHA256_PATTERN,
+    DownloadResult,
+    LocalMirror,
+    file_sha256,
+    print_metadata,
+    store_in_mirror,
+)
+from pdf_metadata import PdfMetadata, PdfScanner, scan_pdf
+
+
+CHUNK_BYTES = 1024 * 1024
+# copy_file_range cannot cross these filesystem boundaries or file types.
+COPY_FALLBACK_ERRNOS = {errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP}
+LINK_FALLBACK_ERRNOS = {errno.EXDEV, errno.EPERM, errno.EMLINK, errno.EOPNOTSUPP}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Verify a manually downloaded PDF and place it in the archive, reporting "
+            "the same metadata as download_pdf.py."
+        )
+    )
+    parser.add_argument("file", type=Path, help="The locally downloaded PDF.")
+    parser.add_argument(
+        "--url",
+        required=True,
+        help="Public URL the file was downloaded from (recorded as source_url).",
+    )
+    parser.add_argument("--output", required=True, type=Path)
+    parser.add_argument("--max-bytes", type=int, default=DEFAULT_MAX_BYTES)
+    parser.add_argument("--replace", action="store_true")
+    parser.add_argument("--expect-bytes", type=int)
+    parser.add_argument("--expect-sha256")
+    parser.add_argument(
+        "--hardlink",
+        action="store_true",
+        help=(
+            "Hard-link instead of copying when reflinks are unavailable. The archive "
+            "and the original then share one inode; only use this for a file you "
+            "will not edit."
+        ),
+    )
+    parser.add_argument(
+        "--mirror",
+        type=Path,
+        default=os.environ.get(MIRROR_ENVIRONMENT_VARIABLE),
+        help=(
+            "Also store the document in this content-addressed mirror so offline "
+            f"rebuilds can find it (default: ${MIRROR_ENVIRONMENT_VARIABLE})."
+        ),
+    )
+    return parser.parse_args()
+
+
+def _reflink(source_fd: int, destination_fd: int) -> bool:
+    try:
+        import fcntl
+
+        fcntl.ioctl(destination_fd, FICLONE, source_fd)
+        return True
+    except (ImportError, OSError):
+        return False
+
+
+def _copy_file_range(source_fd: int, destination_fd: int, byte_count: int) -> bool:
+    """Copy inside the kernel; filesystems that support it share extents instead."""
+    copy_file_range = getattr(os, "copy_file_range", None)
+    if copy_file_range is None:
+        return False
+    copied = 0
+    try:
+        while copied < byte_count:
+            sent = copy_file_range(source_fd, destination_fd, byte_count - copied)
+            if sent == 0:
+                break
+            copied += sent
+    except OSError as error:
+        if error.errno in COPY_FALLBACK_ERRNOS and copied == 0:
+            return False
+        raise
+    return copied == byte_count
+
+
+def _hash_fd(descriptor: int) -> tuple[bytes, PdfMetadata]:
+    """First bytes and scanned metadata of an open file, read once from the start."""
+    os.lseek(descriptor, 0, os.SEEK_SET)
+    scanner = PdfScanner()
+    head = b""
+    with os.fdopen(os.dup(descriptor), "rb") as handle:
+        while chunk := handle.read(CHUNK_BYTES):
+            if not head:
+                head = chunk[:5]
+            scanner.update(chunk)
+    return head, scanner.finish()
+
+
+def _copy_and_hash(source_fd: int, destination_fd: int) -> tuple[bytes, PdfMetadata]:
+    """Plain copy that scans each chunk on the way through, one pass total."""
+    scanner = PdfScanner()
+    head = b""
+    with os.fdopen(os.dup(source_fd), "rb") as source, os.fdopen(
+        os.dup(destination_fd), "wb"
+    ) as destination:
+        while chunk := source.read(CHUNK_BYTES):
+            if not head:
+                head = chunk[:5]
+            scanner.update(chunk)
+            destination.write(chunk)
+    return head, scanner.finish()
+
+
+def _hardlink(source: Path, temporary_path: Path) -> bool:
+    temporary_path.unlink()
+    try:
+        os.link(source, temporary_path)
+        return True
+    except OSError as error:
+        temporary_path.touch()
+        if error.errno in LINK_FALLBACK_ERRNOS:
+            return False
+        raise
+
+
+def stage_copy(source: Path, temporary_path: Path, hardlink: bool) -> tuple[str, tuple]:
+    """Materialize ``source`` at ``temporary_path``; return the method and its scan.
+
+    The preferred methods share data with the source (reflink, hard link) or
+    keep it in the kernel (copy_file_range); the placed bytes are then read once
+    to scan them. The final fallback copies through user space and scans the
+    same chunks as it writes them, so every path reads the data exactly once.
+    """
+    with source.open("rb") as source_file, temporary_path.open("r+b") as temporary_file:
+        if _reflink(source_file.fileno(), temporary_file.fileno()):
+            return "reflink", _hash_fd(temporary_file.fileno())
+    if hardlink and _hardlink(source, temporary_path):
+        with temporary_path.open("rb") as linked_file:
+            return "hardlink", _hash_fd(linked_file.fileno())
+    with source.open("rb") as source_file, temporary_path.open("r+b") as temporary_file:
+        source_fd, destination_fd = source_file.fileno(), temporary_file.fileno()
+        if _copy_file_range(source_fd, destination_fd, os.fstat(source_fd).st_size):
+            return "copy_file_range", _hash_fd(destination_fd)
+        os.ftruncate(destination_fd, 0)
+        os.lseek(source_fd, 0, os.SEEK_SET)
+        os.lseek(destination_fd, 0, os.SEEK_SET)
+        return "copy", _copy_and_hash(source_fd, destination_fd)
+
+
+def import_pdf(
+    source: Path,
+    url: str,
+    output: Path,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    replace: bool = False,
+    expected_bytes: int | None = None,
+    expected_sha256: str | None = None,
+    hardlink: bool = False,
+    mirror: LocalMirror | None = None,
+) -> tuple[DownloadResult, str]:
+    """Verify and atomically place ``source`` at ``output``; return metadata and method."""
+    parsed_url = urllib.parse.urlparse(url)
+    if parsed_url.scheme not in {"http", "https"} or not parsed_url.netloc:
+        raise ValueError("--url must be the public HTTP or HTTPS URL of the document")
+    if max_bytes <= 0:
+        raise ValueError("--max-bytes must be positive")
+    if expected_sha256 is not None and not SHA256_PATTERN.fullmatch(expected_sha256):
+        raise ValueError("--expect-sha256 must be a lowercase SHA-256 digest")
+    if output.suffix.lower() != ".pdf":
+        raise ValueError("output filename must end in .pdf")
+    if not source.is_file():
+        raise FileNotFoundError(f"no such file: {source}")
+
+    byte_count = source.stat().st_size
+    if byte_count == 0:
+        raise ValueError(f"{source} is empty")
+    if byte_count > max_bytes:
+        raise ValueError(f"{source} exceeds {max_bytes} bytes")
+    if expected_bytes is not None and byte_count != expected_bytes:
+        raise ValueError(f"{source} has {byte_count} bytes, expected {expected_bytes}")
+    with source.open("rb") as handle:
+        if not handle.read(5).startswith(b"%PDF-"):
+            raise ValueError(f"{source} does not have a PDF signature")
+
+    if output.exists():
+        existing = None
+        if output.samefile(source):
+            existing = scan_pdf(output)
+        elif output.stat().st_size == byte_count:
+            existing = scan_pdf(output)
+            if existing.sha256 != file_sha256(source):
+                existing = None
+        if existing is not None:
+            sha256 = existing.sha256
+            if expected_sha256 is not None and sha256 != expected_sha256:
+                raise ValueError(f"{source} does not match the expected SHA-256 digest")
+            if mirror:
+                store_in_mirror(mirror, url, output, sha256, url)
+            result = DownloadResult(sha256, byte_count, url, reused=True, pdf=existing)
+            return result, "existing"
+        if not replace:
+            raise FileExistsError(f"refusing to overwrite existing file: {output}")
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporary_name = tempfile.mkstemp(
+        dir=output.parent, prefix=f".{output.name}."
+    )
+    os.close(descriptor)
+    temporary_path = Path(temporary_name)
+    try:
+        method, (head, pdf) = stage_copy(source, temporary_path, hardlink)
+        sha256 = pdf.sha256
+        if not head.startswith(b"%PDF-"):
+            raise ValueError(f"{source} changed while importing: no PDF signature")
+        if pdf.byte_count != byte_count:
+            raise ValueError(f"{source} changed size while importing")
+        if expected_sha256 is not None and sha256 != expected_sha256:
+            raise ValueError(f"{source} does not match the expected SHA-256 digest")
+        if method != "hardlink":
+            os.chmod(temporary_path, 0o644)
+        os.replace(temporary_path, output)
+    finally:
+        if temporary_path.exists():
+            temporary_path.unlink()
+    if mirror:
+        store_in_mirror(mirror, url, output, sha256, url)
+    return DownloadResult(sha256, byte_count, url, pdf=pdf), method
+
+
+def main() -> int:
+    args = parse_args()
+    try:
+        result, method = import_pdf(
+            args.file,
+            args.url,
+            args.output,
+            args.max_bytes,
+            args.replace,
+            args.expect_bytes,
+            args.expect_sha256,
+            args.hardlink,
+            LocalMirror(args.mirror) if args.mirror else None,
+        )
+    except (ValueError, OSError) as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+
+    if result.reused:
+        print("output already holds this file; nothing copied", file=sys.stderr)
+    else:
+        print(f"imported {args.file} via {method}", file=sys.stderr)
+    print_metadata(args.output, args.url, result)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
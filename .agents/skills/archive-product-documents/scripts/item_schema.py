@@ -0,0 +1,288 @@
+"""Declarative item.toml schema compiled into per-field validator closures.
+
+Each schema version is plain data: field kinds, required/optional sets and the
+allowed values. ``compile_schema()`` turns one version into a list of closures
+exactly once per process, so validating thousands of records only runs the
+checks that apply to each field instead of re-walking the rules every time.
+Adding a schema version means adding a table here, not another branch of ``if``
+statements in the validator.
+"""
+
+import re
+import urllib.parse
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from typing import Callable
+
+
+DOCUMENT_TYPES_V1 = frozenset(
+    {
+        "user-manual",
+        "use-and-care-instructions",
+        "installation-instructions",
+        "assembly-instructions",
+        "service-manual",
+        "quick-start-guide",
+        "parts-diagram",
+        "specification-sheet",
+        "warranty",
+        "safety-data-sheet",
+    }
+)
+SOURCE_TYPES_V1 = frozenset({"manufacturer", "retailer", "third-party-mirror"})
+
+SCHEMAS = {
+    1: {
+        "product": {
+            "required": {
+                "schema_version": {"kind": "schema_version"},
+                "name": {"kind": "string"},
+                "brand": {"kind": "string"},
+                "model": {"kind": "string"},
+                # Validated table by table by the caller.
+                "documents": {"kind": "any"},
+            },
+            "optional": {
+                "manufacturer": {"kind": "string"},
+                "item_numbers": {"kind": "string_list"},
+                "upcs": {"kind": "upcs"},
+                "product_url": {"kind": "url"},
+                "support_url": {"kind": "url"},
+            },
+        },
+        "document": {
+            "required": {
+                "title": {"kind": "string"},
+                "type": {"kind": "enum", "values": DOCUMENT_TYPES_V1},
+                # Path rules depend on the entry directory; see validate_entry.py.
+                "file": {"kind": "string"},
+                "languages": {"kind": "languages"},
+                "source_url": {"kind": "url"},
+                "source_type": {"kind": "enum", "values": SOURCE_TYPES_V1},
+                "retrieved": {"kind": "date"},
+                "sha256": {"kind": "sha256"},
+                "bytes": {"kind": "positive_int"},
+            },
+            "optional": {
+                "source_page_url": {"kind": "url"},
+                "source_filename": {"kind": "string"},
+                "resolved_url": {"kind": "url"},
+                "revision": {"kind": "kebab"},
+                "pages": {"kind": "positive_int"},
+            },
+            "required_when": [
+                ("source_page_url", "source_type", {"retailer", "third-party-mirror"}),
+            ],
+        },
+    },
+}
+LATEST_SCHEMA_VERSION = max(SCHEMAS)
+
+KEBAB_PATTERN = re.compile(r"^[a-z0-9]+(?:-[a-z0-9]+)*$")
+LANGUAGE_PATTERN = re.compile(r"^[a-z]{2}$")
+SHA256_PATTERN = re.compile(r"^[a-f0-9]{64}$")
+
+# A check returns message suffixes for a bad value and () for a good one, so the
+# "documents[3].field" label is only built when there is something to report.
+FieldCheck = Callable[[object], tuple]
+OK = ()
+NOT_A_STRING = ("must be a non-empty string",)
+
+
+def is_non_empty_string(value) -> bool:
+    return isinstance(value, str) and bool(value.strip())
+
+
+def _check_string(value) -> tuple:
+    return OK if is_non_empty_string(value) else NOT_A_STRING
+
+
+@lru_cache(maxsize=4096)
+def _url_problems(value: str) -> tuple:
+    # Archives repeat the same product and publishing pages many times.
+    problems = []
+    parsed = urllib.parse.urlparse(value)
+    if parsed.scheme not in {"http", "https"} or not parsed.netloc:
+        problems.append("must be an HTTP or HTTPS URL")
+    if parsed.username or parsed.password:
+        problems.append("must not contain credentials")
+    return tuple(problems)
+
+
+def _check_url(value) -> tuple:
+    if not is_non_empty_string(value):
+        return NOT_A_STRING
+    return _url_problems(value)
+
+
+def _check_languages(value) -> tuple:
+    if not isinstance(value, list):
+        return ("must be an array",)
+    problems = []
+    if len(value) != len(set(map(repr, value))):
+        problems.append("contains duplicates")
+    if not all(isinstance(item, str) and LANGUAGE_PATTERN.fullmatch(item) for item in value):
+        problems.append("values must be lowercase ISO 639-1 codes")
+    return tuple(problems)
+
+
+def _check_date(value) -> tuple:
+    return OK if isinstance(value, date) else ("must be an unquoted TOML date",)
+
+
+def _check_sha256(value) -> tuple:
+    if isinstance(value, str) and SHA256_PATTERN.fullmatch(value):
+        return OK
+    return ("must be a lowercase SHA-256 digest",)
+
+
+def _check_positive_int(value) -> tuple:
+    return OK if type(value) is int and value > 0 else ("must be a positive integer",)
+
+
+def _check_kebab(value) -> tuple:
+    if is_non_empty_string(value) and KEBAB_PATTERN.fullmatch(value):
+        return OK
+    return ("must be lowercase kebab-case",)
+
+
+def _check_string_list(value) -> tuple:
+    if isinstance(value, list) and value and all(map(is_non_empty_string, value)):
+        return OK
+    return ("must be a non-empty array of strings",)
+
+
+def _check_upcs(value) -> tuple:
+    if (
+        isinstance(value, list)
+        and value
+        and all(
+            isinstance(item, str) and item.isdigit() and len(item) in {12, 13, 14}
+            for item in value
+        )
+    ):
+        return OK
+    return ("must contain 12-, 13-, or 14-digit strings",)
+
+
+def _check_any(value) -> tuple:
+    return OK
+
+
+def _enum_check(values: frozenset) -> FieldCheck:
+    def check(value) -> tuple:
+        if isinstance(value, str) and value in values:
+            return OK
+        unsupported = f"is unsupported: {value}"
+        if not is_non_empty_string(value):
+            return NOT_A_STRING + (unsupported,)
+        return (unsupported,)
+
+    return check
+
+
+def _schema_version_check(versions: tuple[int, ...]) -> FieldCheck:
+    problem = ("must be " + " or ".join(str(version) for version in versions),)
+
+    def check(value) -> tuple:
+        return OK if type(value) is int and value in versions else problem
+
+    return check
+
+
+SIMPLE_CHECKS: dict[str, FieldCheck] = {
+    "any": _check_any,
+    "string": _check_string,
+    "url": _check_url,
+    "languages": _check_languages,
+    "date": _check_date,
+    "sha256": _check_sha256,
+    "positive_int": _check_positive_int,
+    "kebab": _check_kebab,
+    "string_list": _check_string_list,
+    "upcs": _check_upcs,
+}
+
+
+def _field_check(spec: dict) -> FieldCheck:
+    kind = spec["kind"]
+    if kind == "enum":
+        return _enum_check(frozenset(spec["values"]))
+    if kind == "schema_version":
+        return _schema_version_check(tuple(sorted(SCHEMAS)))
+    return SIMPLE_CHECKS[kind]
+
+
+@dataclass(frozen=True)
+class CompiledRecord:
+    """Validator for one record kind (product or document) of one schema version."""
+
+    required: frozenset
+    optional: frozenset
+    checks: tuple[tuple[str, FieldCheck], ...]
+    required_when: tuple[tuple[str, str, frozenset], ...]
+
+    def check_fields(self, record: dict, label: str, errors: list) -> bool:
+        """Report missing/unknown fields under ``label``; False when any are missing."""
+        keys = record.keys()
+        missing = self.required - keys
+        unknown = keys - self.required - self.optional
+        if missing:
+            errors.append(f"{label} is missing fields: {', '.join(sorted(missing))}")
+        if unknown:
+            errors.append(f"{label} has unknown fields: {', '.join(sorted(unknown))}")
+        return not missing
+
+    def check_values(self, record: dict, prefix: str, errors: list) -> None:
+        """Run every field check that applies to ``record``, in schema order."""
+        for field_name, check in self.checks:
+            if field_name in record:
+                problems = check(record[field_name])
+                if problems:
+                    errors.extend(f"{prefix}{field_name} {problem}" for problem in problems)
+        for field_name, condition_field, values in self.required_when:
+            condition = record.get(condition_field)
+            if condition in values and not record.get(field_name):
+                errors.append(
+                    f"{prefix}{field_name} is required for {condition} sources"
+                )
+
+
+@dataclass(frozen=True)
+class CompiledSchema:
+    version: int
+    product: CompiledRecord
+    document: CompiledRecord
+
+
+def _compile_record(definition: dict) -> CompiledRecord:
+    fields = {**definition["required"], **definition["optional"]}
+    return CompiledRecord(
+        required=frozenset(definition["required"]),
+        optional=frozenset(definition["optional"]),
+        checks=tuple((name, _field_check(spec)) for name, spec in fields.items()),
+        required_when=tuple(
+            (field_name, condition_field, frozenset(values))
+            for field_name, condition_field, values in definition.get("required_when", ())
+        ),
+    )
+
+
+@lru_cache(maxsize=None)
+def compile_schema(version: int = LATEST_SCHEMA_VERSION) -> CompiledSchema:
+    """Compile schema ``version`` once; later calls return the cached closures."""
+    definition = SCHEMAS[version]
+    return CompiledSchema(
+        version,
+        _compile_record(definition["product"]),
+        _compile_record(definition["document"]),
+    )
+
+
+def schema_for(metadata: dict) -> CompiledSchema:
+    """The compiled schema named by ``metadata``, or the latest for unknown versions."""
+    version = metadata.get("schema_version")
+    if type(version) is int and version in SCHEMAS:
+        return compile_schema(version)
+    return compile_schema()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from dataclasses import asdict, dataclass
+from pathlib import Path, PurePosixPath
+
+from changed_entries import archive_entries
+
+
+# Layout: header, member data back to back, deflated JSON index, trailer.
+# PDFs are stored as-is (they are already compressed and can then be hashed
+# and copied straight out of the mapping); text metadata is deflated.
+HEADER = struct.Struct("<8sH6x")
+TRAILER = struct.Struct("<QQ32s8s")  # index offset, index size, index sha256, magic
+MAGIC = b"ARCHPACK"
+TRAILER_MAGIC = b"PACKINDX"
+FORMAT_VERSION = 1
+CHUNK_BYTES = 1024 * 1024
+STORED_SUFFIXES = {".pdf"}
+
+
+@dataclass(frozen=True)
+class Member:
+    path: str  # relative to the items root, POSIX separators
+    offset: int
+    size: int  # bytes in the pack
+    length: int  # bytes once extracted
+    sha256: str  # of the extracted bytes
+    method: str  # "stored" or "deflate"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Pack the archive into one file with a random-access index, or list, "
+            "verify and extract single members of a pack."
+        )
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    create = commands.add_parser("create", help="Write every entry into a new pack.")
+    create.add_argument("pack", type=Path)
+    create.add_argument(
+        "--items-root",
+        type=Path,
+        default=Path("docs/items"),
+        help="Archive items root (default: docs/items)",
+    )
+    create.add_argument("--replace", action="store_true")
+
+    listing = commands.add_parser("list", help="Print the index of a pack.")
+    listing.add_argument("pack", type=Path)
+    listing.add_argument("--json", action="store_true")
+
+    verify = commands.add_parser("verify", help="Check members against their sha256.")
+    verify.add_argument("pack", type=Path)
+    verify.add_argument("members", nargs="*", help="Default: every member.")
+
+    extract = commands.add_parser("extract", help="Extract members without the rest.")
+    extract.add_argument("pack", type=Path)
+    extract.add_argument("members", nargs="+")
+    extract.add_argument("--to", type=Path, default=Path("."), dest="destination")
+    extract.add_argument("--replace", action="store_true")
+    return parser.parse_args()
+
+
+def safe_member_path(name: str) -> PurePosixPath:
+    path = PurePosixPath(name)
+    if not name or path.is_absolute() or ".." in path.parts:
+        raise ValueError(f"unsafe member path: {name!r}")
+    return path
+
+
+def archive_files(items_root: Path) -> list[tuple[str, Path]]:
+    """``(member path, file)`` for every non-hidden file of every entry."""
+    items_root = items_root.resolve()
+    files = []
+    for entry in archive_entries(items_root):
+        for path in sorted(entry.rglob("*")):
+            relative = path.relative_to(items_root)
+            if path.is_file() and not any(part.startswith(".") for part in relative.parts):
+                files.append((relative.as_posix(), path))
+    return files
+
+
+def _write_member(source: Path, name: str, output, offset: int) -> Member:
+    digest = hashlib.sha256()
+    length = 0
+    if source.suffix.lower() in STORED_SUFFIXES:
+        with source.open("rb") as handle:
+            while chunk := handle.read(CHUNK_BYTES):
+                digest.update(chunk)
+                length += len(chunk)
+                output.write(chunk)
+        return Member(name, offset, length, length, digest.hexdigest(), "stored")
+
+    data = source.read_bytes()
+    digest.update(data)
+    compressed = zlib.compress(data, 9)
+    output.write(compressed)
+    return Member(name, offset, len(compressed), len(data), digest.hexdigest(), "deflate")
+
+
+def create_pack(items_root: Path, pack: Path, replace: bool = False) -> list[Member]:
+    """Write every archive file into ``pack`` atomically; return the index."""
+    if pack.exists() and not replace:
+        raise FileExistsError(f"refusing to overwrite existing file: {pack}")
+    pack.parent.mkdir(parents=True, exist_ok=True)
+    members = []
+    with tempfile.NamedTemporaryFile(
+        "wb", dir=pack.parent, prefix=f".{pack.name}.", delete=False
+    ) as output:
+        try:
+            output.write(HEADER.pack(MAGIC, FORMAT_VERSION))
+            offset = HEADER.size
+            for name, source in archive_files(items_root):
+                member = _write_member(source, name, output, offset)
+                members.append(member)
+                offset += member.size
+            index = zlib.compress(
+                json.dumps([asdict(member) for member in members]).encode("utf-8"), 9
+            )
+            output.write(index)
+            output.write(
+                TRAILER.pack(
+                    offset, len(index), hashlib.sha256(index).digest(), TRAILER_MAGIC
+                )
+            )
+        except BaseException:
+            output.close()
+            os.unlink(output.name)
+            raise
+    os.replace(output.name, pack)
+    return members
+
+
+class Pack:
+    """Read-only view of a pack file through one shared memory mapping.
+
+    Only the trailer and index are read on open; member data is touched when a
+    member is extracted or verified, so one document in a large pack costs one
+    document's worth of I/O.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.members = self._read_index()
+        except BaseException:
+            self._map.close()
+            raise
+
+    def _read_index(self) -> dict[str, Member]:
+        size = len(self._map)
+        if size < HEADER.size + TRAILER.size:
+            raise ValueError(f"{self.path} is too small to be a pack")
+        magic, version = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a pack file")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"{self.path} has unsupported pack version {version}")
+        offset, index_size, index_sha256, trailer_magic = TRAILER.unpack_from(
+            self._map, size - TRAILER.size
+        )
+        if trailer_magic != TRAILER_MAGIC or offset + index_size != size - TRAILER.size:
+            raise ValueError(f"{self.path} has a damaged trailer")
+        index = self._map[offset : offset + index_size]
+        if hashlib.sha256(index).digest() != index_sha256:
+            raise ValueError(f"{self.path} has a damaged index")
+        members = {}
+        for record in json.loads(zlib.decompress(index)):
+            member = Member(**record)
+            safe_member_path(member.path)
+            if member.offset < HEADER.size or member.offset + member.size > offset:
+                raise ValueError(f"{self.path}: {member.path} lies outside the data area")
+            members[member.path] = member
+        return members
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> "Pack":
+        return self
+
+    def __exit__(self, exception_type, exception, traceback) -> None:
+        self.close()
+
+    def member(self, name: str) -> Member:
+        try:
+            return self.members[name]
+        except KeyError:
+            raise KeyError(f"{self.path} has no member {name}") from None
+
+    def _raw(self, member: Member) -> memoryview:
+        return memoryview(self._map)[member.offset : member.offset + member.size]
+
+    def read(self, name: str) -> bytes:
+        member = self.member(name)
+        with self._raw(member) as raw:
+            if member.method == "deflate":
+                return zlib.decompress(raw)
+            return bytes(raw)
+
+    def verify(self, name: str) -> bool:
+        member = self.member(name)
+        if member.method == "deflate":
+            data = self.read(name)
+            return len(data) == member.length and (
+                hashlib.sha256(data).hexdigest() == member.sha256
+            )
+        digest = hashlib.sha256()
+        with self._raw(member) as raw:
+            for start in range(0, member.size, CHUNK_BYTES):
+                digest.update(raw[start : start + CHUNK_BYTES])
+        return digest.hexdigest() == member.sha256
+
+    def extract(self, name: str, destination: Path, replace: bool = False) -> Path:
+        """Write one verified member below ``destination`` atomically."""
+        member = self.member(name)
+        target = destination / safe_member_path(name)
+        if target.exists() and not replace:
+            raise FileExistsError(f"refusing to overwrite existing file: {target}")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        with tempfile.NamedTemporaryFile(
+            "wb", dir=target.parent, prefix=f".{target.name}.", delete=False
+        ) as output:
+            try:
+                if member.method == "deflate":
+                    data = self.read(name)
+                    digest.update(data)
+                    output.write(data)
+                else:
+                    with self._raw(member) as raw:
+                        for start in range(0, member.size, CHUNK_BYTES):
+                            chunk = raw[start : start + CHUNK_BYTES]
+                            digest.update(chunk)
+                            output.write(chunk)
+                if digest.hexdigest() != member.sha256:
+                    raise ValueError(f"{name} does not match its recorded sha256")
+            except BaseException:
+                output.close()
+                os.unlink(output.name)
+                raise
+        os.chmod(output.name, 0o644)
+        os.replace(output.name, target)
+        return target
+
+
+def main() -> int:
+    args = parse_args()
+    try:
+        if args.command == "create":
+            members = create_pack(args.items_root, args.pack, args.replace)
+            stored = sum(member.length for member in members)
+            print(
+                f"packed {len(members)} files ({stored} bytes) into {args.pack} "
+                f"({args.pack.stat().st_size} bytes)"
+            )
+            return 0
+
+        with Pack(args.pack) as pack:
+            if args.command == "list":
+                members = list(pack.members.values())
+                if args.json:
+                    json.dump([asdict(member) for member in members], sys.stdout, indent=2)
+                    sys.stdout.write("\n")
+                else:
+                    for member in members:
+                        print(
+                            f"{member.sha256}  {member.length:>10}  "
+                            f"{member.method:<7}  {member.path}"
+                        )
+                return 0
+
+            if args.command == "verify":
+                failed = False
+                for name in args.members or list(pack.members):
+                    if pack.verify(name):
+                        print(f"ok: {name}")
+                    else:
+                        print(f"corrupt: {name}")
+                        failed = True
+                return 1 if failed else 0
+
+            for name in args.members:
+                print(pack.extract(name, args.destination, args.replace))
+            return 0
+    except (OSError, ValueError, KeyError, zlib.error) as error:
+        message = error.args[0] if isinstance(error, KeyError) else error
+        print(f"error: {message}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+
+import argparse
+import hashlib
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+
+CHUNK_BYTES = 1024 * 1024
+# Bytes carried over between chunks. Every pattern below matches within this
+# span, so a match split across two chunks is still seen exactly once.
+OVERLAP_BYTES = 16 * 1024
+# The linearization dictionary must be the first object in the file.
+LINEARIZATION_WINDOW = 1024
+
+VERSION_PATTERN = re.compile(rb"%PDF-(\d\.\d)")
+LINEARIZATION_PATTERN = re.compile(rb"<<[^>]*?/Linearized\b[^>]*>>", re.S)
+STRING = rb"\((?:\\.|[^\\()]|\((?:\\.|[^\\()])*\))*\)|<[0-9A-Fa-f\s]*>"
+# Lazily scan one object's dictionary, never past its end or into its stream.
+OBJECT_PREFIX = rb"(\d+)\s+\d+\s+obj\b(?:(?!endobj|stream).){0,4096}?"
+PAGE_OBJECT_PATTERN = re.compile(OBJECT_PREFIX + rb"/Type\s*/Page(?![A-Za-z])", re.S)
+TITLE_OBJECT_PATTERN = re.compile(OBJECT_PREFIX + rb"/Title\s*(" + STRING + rb")", re.S)
+INFO_REFERENCE_PATTERN = re.compile(rb"/Info\s+(\d+)\s+\d+\s+R")
+OBJECT_STREAM_PATTERN = re.compile(rb"/Type\s*/ObjStm(?![A-Za-z])")
+ESCAPE_PATTERN = re.compile(rb"\\(\r\n|[\r\n]|[0-7]{1,3}|.)", re.S)
+ESCAPES = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f"}
+
+
+@dataclass(frozen=True)
+class PdfMetadata:
+    sha256: str
+    byte_count: int
+    version: str | None  # None when the %PDF- header is missing
+    pages: int | None  # None when not determinable without a full parser
+    title: str | None  # Info dictionary /Title
+    linearized: bool
+    # True when ``pages`` is a valid linearization dictionary's /N, which a
+    # writer states outright, rather than a count of matched page objects.
+    pages_declared: bool = False
+
+    @property
+    def has_signature(self) -> bool:
+        return self.version is not None
+
+
+def decode_pdf_string(token: bytes) -> str:
+    """Decode a literal ``(...)`` or hex ``<...>`` PDF text string."""
+    if token.startswith(b"<"):
+        digits = re.sub(rb"\s", b"", token[1:-1])
+        raw = bytes.fromhex((digits + b"0" * (len(digits) % 2)).decode("ascii"))
+    else:
+
+        def unescape(match: re.Match) -> bytes:
+            escaped = match.group(1)
+            if escaped[:1] in b"\r\n":
+                return b""
+            if escaped.isdigit():
+                return bytes([int(escaped, 8) & 0xFF])
+            return ESCAPES.get(escaped, escaped)
+
+        raw = ESCAPE_PATTERN.sub(unescape, token[1:-1])
+    if raw.startswith(b"\xfe\xff"):
+        return raw[2:].decode("utf-16-be", "replace")
+    if raw.startswith(b"\xef\xbb\xbf"):
+        return raw[3:].decode("utf-8", "replace")
+    return raw.decode("latin-1")
+
+
+class PdfScanner:
+    """Collect hash, size and basic PDF facts from chunks fed in file order.
+
+    Callers that already stream a file (to hash, copy or download it) feed the
+    same chunks here, so the metadata costs no extra read. Page objects and
+    Info titles are found by pattern, without a full parser: objects inside
+    compressed object streams are not seen, so once a file is found to have
+    any, counted page objects may be short and the page count is reported as
+    None rather than guessed. A valid linearization dictionary's page count is
+    preferred either way, since it states the count directly.
+    """
+
+    def __init__(self) -> None:
+        self._digest = hashlib.sha256()
+        self.byte_count = 0
+        self._head = b""
+        self._pending = b""
+        self._page_objects: set[int] = set()
+        self._titles: dict[int, bytes] = {}
+        self._info_object: int | None = None
+        self._object_streams = False
+
+    def update(self, chunk: bytes) -> None:
+        self._digest.update(chunk)
+        self.byte_count += len(chunk)
+        if len(self._head) < LINEARIZATION_WINDOW:
+            self._head += chunk[: LINEARIZATION_WINDOW - len(self._head)]
+        buffer = self._pending + chunk
+        limit = len(buffer) - OVERLAP_BYTES
+        if limit > 0:
+            self._scan(buffer, limit)
+            self._pending = buffer[limit:]
+        else:
+            self._pending = buffer
+
+    def _scan(self, buffer: bytes, limit: int) -> None:
+        """Record matches starting before ``limit``; later ones are rescanned next time."""
+        for match in PAGE_OBJECT_PATTERN.finditer(buffer):
+            if match.start() >= limit:
+                break
+            self._page_objects.add(int(match.group(1)))
+        for match in TITLE_OBJECT_PATTERN.finditer(buffer):
+            if match.start() >= limit:
+                break
+            self._titles[int(match.group(1))] = match.group(2)
+        for match in INFO_REFERENCE_PATTERN.finditer(buffer):
+            if match.start() >= limit:
+                break
+            # Incremental updates append trailers, so the last reference wins.
+            self._info_object = int(match.group(1))
+        if not self._object_streams:
+            match = OBJECT_STREAM_PATTERN.search(buffer)
+            self._object_streams = bool(match) and match.start() < limit
+
+    def finish(self) -> PdfMetadata:
+        self._scan(self._pending, len(self._pending))
+        self._pending = b""
+
+        version_match = VERSION_PATTERN.match(self._head)
+        version = version_match.group(1).decode("ascii") if version_match else None
+        linearized = False
+        pages = None
+        pages_declared = False
+        dictionary = LINEARIZATION_PATTERN.search(self._head)
+        if dictionary:
+            length = re.search(rb"/L\s+(\d+)", dictionary.group())
+            count = re.search(rb"/N\s+(\d+)", dictionary.group())
+            # An incremental update after linearization invalidates the hints.
+            linearized = bool(length) and int(length.group(1)) == self.byte_count
+            if linearized and count:
+                pages = int(count.group(1))
+                pages_declared = True
+        if pages is None and self._page_objects and not self._object_streams:
+            pages = len(self._page_objects)
+
+        title = None
+        if self._info_object in self._titles:
+            title = decode_pdf_string(self._titles[self._info_object]).strip() or None
+        return PdfMetadata(
+            self._digest.hexdigest(),
+            self.byte_count,
+            version,
+            pages,
+            title,
+            linearized,
+            pages_declared,
+        )
+
+
+def pdf_fields(metadata: PdfMetadata) -> list[str]:
+    """``key=value`` lines for the facts beyond bytes and sha256.
+
+    ``pages`` is an item.toml field; the rest are hints for filling ``title``.
+    """
+    lines = [] if metadata.pages is None else [f"pages={metadata.pages}"]
+    return lines + [
+        f"pdf_version={metadata.version or ''}",
+        f"pdf_title={metadata.title or ''}",
+        f"linearized={'true' if metadata.linearized else 'false'}",
+    ]
+
+
+def scan_pdf(path: Path) -> PdfMetadata:
+    scanner = PdfScanner()
+    with path.open("rb") as handle:
+        while chunk := handle.read(CHUNK_BYTES):
+            scanner.update(chunk)
+    return scanner.finish()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Print the sha256, size, page count, PDF version, title and "
+            "linearization of PDFs in one read each, for pre-filling item.toml."
+        )
+    )
+    parser.add_argument("pdfs", nargs="+", type=Path)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    failed = False
+    for number, path in enumerate(args.pdfs):
+        try:
+            metadata = scan_pdf(path)
+        except OSError as error:
+            print(f"error: {error}", file=sys.stderr)
+            failed = True
+            continue
+        if not metadata.has_signature:
+            print(f"warning: {path} does not have a PDF signature", file=sys.stderr)
+        if number:
+            print()
+        print(f"file={path}")
+        print(f"bytes={metadata.byte_count}")
+        print(f"sha256={metadata.sha256}")
+        for line in pdf_fields(metadata):
+            print(line)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+
+import argparse
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import zlib
+from pathlib import Path
+
+
+DEFAULT_CACHE_DIR = Path(".cache/archive-product-documents")
+
+STREAM_PATTERN = re.compile(rb"<<(.*?)>>\s*stream\r?\n", re.S)
+TEXT_OPERATOR_PATTERN = re.compile(
+    rb"\[((?:[^\]\\]|\\.)*)\]\s*TJ"
+    rb"|\(((?:\\.|[^\\)])*)\)\s*(?:Tj|'|\")"
+    rb"|(ET|T\*|Td|TD)\b"
+)
+TJ_PART_PATTERN = re.compile(rb"\(((?:\\.|[^\\)])*)\)|(-?\d+(?:\.\d*)?)")
+# Images, embedded fonts, metadata, and object/xref streams never hold page text.
+NON_TEXT_STREAM_PATTERN = re.compile(
+    rb"/Subtype\s*/(?:Image|Type1C|CIDFontType0C|OpenType|XML)"
+    rb"|/Type\s*/(?:ObjStm|XRef|Metadata|EmbeddedFile)"
+    rb"|/Length[123]\b"
+)
+ESCAPE_PATTERN = re.compile(rb"\\(\r?\n|[0-7]{1,3}|.)", re.S)
+ESCAPES = {b"n": b"\n", b"r": b"\n", b"t": b" ", b"b": b"", b"f": b""}
+# A TJ kerning adjustment this negative is a word gap, not letter spacing.
+WORD_GAP = -200
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Print the text of an archived PDF, using the sha256-keyed cache."
+    )
+    parser.add_argument("pdf", type=Path)
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR)
+    return parser.parse_args()
+
+
+def _unescape(value: bytes) -> bytes:
+    def replace(match: re.Match) -> bytes:
+        escaped = match.group(1)
+        if escaped[:1] in b"\r\n":
+            return b""
+        if escaped.isdigit():
+            return bytes([int(escaped, 8) & 0xFF])
+        return ESCAPES.get(escaped, escaped)
+
+    return ESCAPE_PATTERN.sub(replace, value)
+
+
+def _content_streams(data: bytes):
+    for match in STREAM_PATTERN.finditer(data):
+        dictionary = match.group(1)
+        if NON_TEXT_STREAM_PATTERN.search(dictionary):
+            continue
+        start = match.end()
+        end = data.find(b"endstream", start)
+        if end < 0:
+            continue
+        raw = data[start:end]
+        if b"/FlateDecode" in dictionary:
+            try:
+                raw = zlib.decompressobj().decompress(raw)
+            except zlib.error:
+                continue
+        elif b"/Filter" in dictionary:
+            continue
+        if b"BT" in raw:
+            yield raw
+
+
+def _printable(value: bytes) -> bool:
+    text = value.decode("latin-1")
+    readable = sum(character.isprintable() or character.isspace() for character in text)
+    return readable >= 0.9 * len(text)
+
+
+def extract_text_builtin(data: bytes) -> str:
+    """Best-effort text from literal strings in Flate-compressed content streams.
+
+    This handles the common simple-font PDFs published by manufacturers. Text
+    drawn with CID fonts (hex strings mapped through ToUnicode) is skipped;
+    install poppler's pdftotext for complete extraction.
+    """
+    pieces: list[bytes] = []
+    for stream in _content_streams(data):
+        for match in TEXT_OPERATOR_PATTERN.finditer(stream):
+            array, string, operator = match.groups()
+            if array is not None:
+                for literal, number in TJ_PART_PATTERN.findall(array):
+                    if literal:
+                        pieces.append(_unescape(literal))
+                    elif number and float(number) < WORD_GAP:
+                        pieces.append(b" ")
+            elif string is not None:
+                pieces.append(_unescape(string))
+            elif operator:
+                pieces.append(b"\n")
+    text = b"".join(piece for piece in pieces if _printable(piece))
+    return text.decode("latin-1")
+
+
+def extract_text_pdftotext(path: Path) -> str | None:
+    pdftotext = shutil.which("pdftotext")
+    if not pdftotext:
+        return None
+    completed = subprocess.run(
+        [pdftotext, "-q", "-enc", "UTF-8", str(path), "-"],
+        check=False,
+        capture_output=True,
+    )
+    if completed.returncode != 0:
+        return None
+    return completed.stdout.decode("utf-8", errors="replace")
+
+
+def cached_text(
+    path: Path, sha256: str | None = None, cache_dir: Path = DEFAULT_CACHE_DIR
+) -> str:
+    """Text of ``path``, extracted at most once per content digest.
+
+    The cache lives at ``<cache_dir>/text/<sha256>.txt``, so a renamed or moved
+    document is never extracted again and a changed one always is.
+    """
+    if sha256 is None:
+        sha256 = hashlib.sha256(path.read_bytes()).hexdigest()
+    cache_path = cache_dir / "text" / f"{sha256}.txt"
+    try:
+        return cache_path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        pass
+
+    text = extract_text_pdftotext(path)
+    if text is None:
+        text = extract_text_builtin(path.read_bytes())
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=cache_path.parent, prefix=".", delete=False
+    ) as temporary_file:
+        temporary_file.write(text)
+    os.replace(temporary_file.name, cache_path)
+    return text
+
+
+def main() -> int:
+    args = parse_args()
+    try:
+        text = cached_text(args.pdf, cache_dir=args.cache_dir)
+    except OSError as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+    sys.stdout.write(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
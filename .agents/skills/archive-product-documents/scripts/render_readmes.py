@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+import tomllib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from archive_model import Document, Product, load_product
+from complete_pending_entry import candidate_entries
+from create_pending_entry import (
+    DOCUMENTS_END,
+    DOCUMENTS_START,
+    NO_DOCUMENTS,
+    render_document_list,
+)
+
+
+DEFAULT_JOBS = 8
+# Hand-written document lists that --adopt may replace with the generated one.
+ADOPT_SECTIONS = (
+    "## Documents",
+    "## Archived documents",
+    "## Verified public document sources",
+)
+# A list item's detail line, such as "  - SHA-256: `...`" or "  Bytes: 730111".
+DETAIL_LINE_PATTERN = re.compile(r"^\s+(?:[-*] )?[A-Za-z][\w -]*: \S")
+
+
+@dataclass(frozen=True)
+class RenderOutcome:
+    entry: Path
+    status: str  # "updated", "unchanged", "unmanaged", "refused", or "error"
+    message: str = ""
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Regenerate the Documents list of every archive README from item.toml, "
+            "writing only READMEs whose content changes."
+        )
+    )
+    parser.add_argument(
+        "entries",
+        nargs="*",
+        type=Path,
+        help="Optional entry directories. Defaults to scanning docs/items.",
+    )
+    parser.add_argument(
+        "--items-root",
+        type=Path,
+        default=Path("docs/items"),
+        help="Archive items root (default: docs/items)",
+    )
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS)
+    parser.add_argument(
+        "--adopt",
+        action="store_true",
+        help=(
+            "Also take over READMEs without generated markers by replacing their "
+            "hand-written document list (or appending one). A list with text "
+            "item.toml does not cover is refused and left alone."
+        ),
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Write nothing; exit 1 if any README is out of date.",
+    )
+    return parser.parse_args()
+
+
+def _section_bounds(lines: list[str], heading: str) -> tuple[int, int] | None:
+    for start, line in enumerate(lines):
+        if line.strip() == heading:
+            end = next(
+                (i for i in range(start + 1, len(lines)) if lines[i].startswith("## ")),
+                len(lines),
+            )
+            return start, end
+    return None
+
+
+def remove_sections(text: str, headings: tuple[str, ...]) -> str:
+    """Drop every ``## `` section titled by one of ``headings``, heading included."""
+    lines = text.splitlines(keepends=True)
+    for heading in headings:
+        while bounds := _section_bounds(lines, heading):
+            start, end = bounds
+            del lines[start:end]
+    return re.sub(r"\n{3,}", "\n\n", "".join(lines)).rstrip("\n") + "\n"
+
+
+def readme_documents(product: Product) -> list[Document]:
+    """What a README lists: archived documents, then sources still to download."""
+    return [document for document in product.documents if document.file] + list(
+        product.source_documents
+    )
+
+
+def _unmapped_line(lines: list[str], documents: list[Document]) -> str | None:
+    """The first line of a hand-written document list that ``documents`` cannot replace.
+
+    Every list item must name one of the documents by its local file link or
+    source URL, and its indented continuation lines may only hold ``Field:
+    value`` details or further references. Anything else, such as notes,
+    sub-headings or unmatched items, is text the generated list would lose.
+    """
+    references = [f"]({document.file})" for document in documents if document.file]
+    references += [document.source_url for document in documents if document.source_url]
+
+    def mapped(line: str) -> bool:
+        return any(reference in line for reference in references)
+
+    item: list[str] = []
+    for line in [*lines, "- "]:
+        text = line.rstrip("\n")
+        if not text.strip() or text.strip() == NO_DOCUMENTS:
+            continue
+        if text.startswith(("- ", "* ")):
+            if item and not any(mapped(item_line) for item_line in item):
+                return item[0]
+            item = [text]
+        elif item and text[0] in " \t":
+            if not (mapped(text) or DETAIL_LINE_PATTERN.match(text)):
+                return text
+            item.append(text)
+        else:
+            return text
+    return None
+
+
+def update_readme(
+    text: str, documents: list[Document], adopt_sections: tuple[str, ...] = ()
+) -> str | None:
+    """Return ``text`` with a freshly rendered document list, or None if unmanaged.
+
+    The generated block between the markers is replaced in place. A README
+    without markers is only changed when one of ``adopt_sections`` names a
+    section to replace with ``## Documents`` plus the block; if none of those
+    sections exists the new section is appended. Raises ValueError instead of
+    adopting a section whose hand-written content does not map onto
+    ``documents``.
+    """
+    block = render_document_list(documents)
+    start = text.find(DOCUMENTS_START)
+    end = text.find(DOCUMENTS_END, start)
+    if start >= 0 and end >= 0:
+        end += len(DOCUMENTS_END)
+        if text[end : end + 1] == "\n":
+            end += 1
+        return text[:start] + block + text[end:]
+    if not adopt_sections:
+        return None
+
+    section = "## Documents\n\n" + block
+    lines = text.splitlines(keepends=True)
+    for heading in adopt_sections:
+        bounds = _section_bounds(lines, heading)
+        if bounds:
+            start_line, end_line = bounds
+            unmapped = _unmapped_line(lines[start_line + 1 : end_line], documents)
+            if unmapped is not None:
+                raise ValueError(
+                    f"{heading} has text item.toml does not cover: {unmapped.strip()!r}"
+                )
+            tail = "".join(lines[end_line:])
+            return "".join(lines[:start_line]) + section + ("\n" + tail if tail else "")
+    return text.rstrip("\n") + "\n\n" + section
+
+
+def write_if_changed(path: Path, text: str) -> bool:
+    """Atomically replace ``path`` with ``text``; False when it already matches."""
+    try:
+        if path.read_text(encoding="utf-8") == text:
+            return False
+    except FileNotFoundError:
+        pass
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=path.parent, prefix=f".{path.name}.", delete=False
+    ) as temporary_file:
+        temporary_file.write(text)
+    os.replace(temporary_file.name, path)
+    return True
+
+
+def render_entry(entry: Path, adopt: bool, check: bool) -> RenderOutcome:
+    try:
+        product = load_product(entry)
+        readme_path = entry / "README.md"
+        readme = readme_path.read_text(encoding="utf-8")
+        try:
+            rendered = update_readme(
+                readme, readme_documents(product), ADOPT_SECTIONS if adopt else ()
+            )
+        except ValueError as error:
+            return RenderOutcome(entry, "refused", str(error))
+        if rendered is None:
+            return RenderOutcome(entry, "unmanaged")
+        if rendered == readme:
+            return RenderOutcome(entry, "unchanged")
+        if not check:
+            write_if_changed(readme_path, rendered)
+        return RenderOutcome(entry, "updated")
+    except (OSError, tomllib.TOMLDecodeError) as error:
+        return RenderOutcome(entry, "error", str(error))
+
+
+def render_entries(
+    entries: list[Path], jobs: int = DEFAULT_JOBS, adopt: bool = False, check: bool = False
+) -> list[RenderOutcome]:
+    if jobs <= 0:
+        raise ValueError("--jobs must be positive")
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(lambda entry: render_entry(entry, adopt, check), entries))
+
+
+def main() -> int:
+    args = parse_args()
+    try:
+        outcomes = render_entries(candidate_entries(args), args.jobs, args.adopt, args.check)
+    except ValueError as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+
+    counts: dict[str, int] = {}
+    for outcome in outcomes:
+        counts[outcome.status] = counts.get(outcome.status, 0) + 1
+        if outcome.status == "error":
+            print(f"error: {outcome.entry}: {outcome.message}", file=sys.stderr)
+        elif outcome.status == "refused":
+            print(f"not adopted: {outcome.entry}: {outcome.message}", file=sys.stderr)
+        elif outcome.status == "updated":
+            verb = "out of date" if args.check else "updated"
+            print(f"{verb}: {outcome.entry / 'README.md'}")
+    print(
+        ", ".join(f"{status}={count}" for status, count in sorted(counts.items())),
+        file=sys.stderr,
+    )
+    if counts.get("error") or (args.check and counts.get("updated")):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
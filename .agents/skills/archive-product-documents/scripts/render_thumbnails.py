@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Callable
+
+from download_pdf import place_file
+from find_duplicates import ArchivedPdf, archived_documents
+from pdf_text import DEFAULT_CACHE_DIR
+from render_readmes import write_if_changed
+
+
+DEFAULT_JOBS = os.cpu_count() or 4
+DEFAULT_WIDTH = 240
+THUMBNAILS_DIR = "thumbnails"
+THUMBNAILS_START = "<!-- thumbnails:start -->"
+THUMBNAILS_END = "<!-- thumbnails:end -->"
+
+# Renders page 1 of a PDF to a PNG at the given width.
+Renderer = Callable[[Path, Path, int], None]
+
+
+@dataclass(frozen=True)
+class ThumbnailOutcome:
+    document: ArchivedPdf
+    status: str  # "rendered", "cached", or "error"
+    message: str = ""
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Render a first-page thumbnail of every archived PDF and link the "
+            "thumbnails from each entry README."
+        )
+    )
+    parser.add_argument(
+        "entries",
+        nargs="*",
+        type=Path,
+        help="Optional entry directories. Defaults to every entry under --items-root.",
+    )
+    parser.add_argument(
+        "--items-root",
+        type=Path,
+        default=Path("docs/items"),
+        help="Archive items root (default: docs/items)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help=f"Rendered-thumbnail cache (default: {DEFAULT_CACHE_DIR})",
+    )
+    parser.add_argument("--width", type=int, default=DEFAULT_WIDTH)
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS)
+    return parser.parse_args()
+
+
+def find_renderer() -> Renderer | None:
+    """``pdftoppm`` (Poppler) when installed, else MuPDF's ``mutool``."""
+    pdftoppm = shutil.which("pdftoppm")
+    if pdftoppm:
+
+        def render(pdf: Path, png: Path, width: int) -> None:
+            # pdftoppm appends ".png" to the output root it is given.
+            command = [pdftoppm, "-f", "1", "-l", "1", "-singlefile", "-png"]
+            command += ["-scale-to-x", str(width), "-scale-to-y", "-1"]
+            command += [str(pdf), str(png.with_suffix(""))]
+            subprocess.run(command, check=True, capture_output=True)
+
+        return render
+    mutool = shutil.which("mutool")
+    if mutool:
+
+        def render(pdf: Path, png: Path, width: int) -> None:
+            subprocess.run(
+                [mutool, "draw", "-q", "-w", str(width), "-o", str(png), str(pdf), "1"],
+                check=True,
+                capture_output=True,
+            )
+
+        return render
+    return None
+
+
+def thumbnail_name(document: ArchivedPdf) -> str:
+    return PurePosixPath(document.file).with_suffix(".png").name
+
+
+def entry_directory(document: ArchivedPdf) -> Path:
+    return document.path.parents[len(PurePosixPath(document.file).parts) - 1]
+
+
+def cached_thumbnail(
+    document: ArchivedPdf, cache_dir: Path, width: int, renderer: Renderer
+) -> tuple[Path, bool]:
+    """The cached PNG for ``document`` and whether it had to be rendered now.
+
+    Thumbnails are keyed by content sha256 and width, so a document is
+    rasterized once however many entries hold it or however often this runs.
+    """
+    cache_path = cache_dir / "thumbnails" / f"{document.sha256}-w{width}.png"
+    if cache_path.is_file():
+        return cache_path, False
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=cache_path.parent, prefix=".") as temporary:
+        rendered = Path(temporary) / "page.png"
+        renderer(document.path, rendered, width)
+        if not rendered.is_file():
+            raise OSError(f"renderer produced no image for {document.path}")
+        os.replace(rendered, cache_path)
+    return cache_path, True
+
+
+def render_thumbnails(
+    documents: list[ArchivedPdf],
+    cache_dir: Path = DEFAULT_CACHE_DIR,
+    width: int = DEFAULT_WIDTH,
+    jobs: int = DEFAULT_JOBS,
+    renderer: Renderer | None = None,
+) -> list[ThumbnailOutcome]:
+    """Place a thumbnail beside every document, rendering only unseen digests.
+
+    Each distinct digest is rendered by its own renderer process, ``jobs`` at a
+    time; copies into the entries are atomic and skipped when unchanged.
+    """
+    if jobs <= 0:
+        raise ValueError("--jobs must be positive")
+    if width <= 0:
+        raise ValueError("--width must be positive")
+    renderer = renderer or find_renderer()
+    if renderer is None:
+        raise ValueError("pdftoppm (poppler-utils) or mutool (MuPDF) is required")
+
+    by_digest: dict[str, list[ArchivedPdf]] = {}
+    for document in documents:
+        by_digest.setdefault(document.sha256, []).append(document)
+
+    def render(group: list[ArchivedPdf]) -> list[ThumbnailOutcome]:
+        try:
+            cache_path, rendered = cached_thumbnail(group[0], cache_dir, width, renderer)
+        except (OSError, subprocess.CalledProcessError) as error:
+            message = str(error)
+            if isinstance(error, subprocess.CalledProcessError) and error.stderr:
+                message = error.stderr.decode(errors="replace").strip()
+            return [ThumbnailOutcome(document, "error", message) for document in group]
+        outcomes = []
+        for document in group:
+            target = entry_directory(document) / THUMBNAILS_DIR / thumbnail_name(document)
+            try:
+                if not target.is_file() or target.read_bytes() != cache_path.read_bytes():
+                    place_file(cache_path, target)
+            except OSError as error:
+                outcomes.append(ThumbnailOutcome(document, "error", str(error)))
+                continue
+            status = "rendered" if rendered else "cached"
+            outcomes.append(ThumbnailOutcome(document, status))
+        return outcomes
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        return [
+            outcome
+            for outcomes in executor.map(render, by_digest.values())
+            for outcome in outcomes
+        ]
+
+
+def render_thumbnail_block(documents: list[ArchivedPdf]) -> str:
+    lines = [THUMBNAILS_START]
+    for document in documents:
+        image = f"{THUMBNAILS_DIR}/{thumbnail_name(document)}"
+        lines.append(f"[![{document.title} (first page)]({image})]({document.file})")
+    lines.append(THUMBNAILS_END)
+    return "\n".join(lines) + "\n"
+
+
+def update_readme_thumbnails(text: str, documents: list[ArchivedPdf]) -> str:
+    """Replace the generated previews block, appending a Previews section if absent."""
+    block = render_thumbnail_block(documents)
+    start = text.find(THUMBNAILS_START)
+    end = text.find(THUMBNAILS_END, start)
+    if start >= 0 and end >= 0:
+        end += len(THUMBNAILS_END)
+        if text[end : end + 1] == "\n":
+            end += 1
+        return text[:start] + block + text[end:]
+    return text.rstrip("\n") + "\n\n## Previews\n\n" + block
+
+
+def link_entry(entry: Path, documents: list[ArchivedPdf]) -> bool:
+    """Link ``documents``' thumbnails from the README and drop stale thumbnails."""
+    keep = {thumbnail_name(document) for document in documents}
+    thumbnails = entry / THUMBNAILS_DIR
+    if thumbnails.is_dir():
+        for path in thumbnails.glob("*.png"):
+            if path.name not in keep:
+                path.unlink()
+    readme_path = entry / "README.md"
+    readme = readme_path.read_text(encoding="utf-8")
+    return write_if_changed(readme_path, update_readme_thumbnails(readme, documents))
+
+
+def main() -> int:
+    args = parse_args()
+    documents = archived_documents(args.items_root)
+    if args.entries:
+        selected = {path.resolve() for path in args.entries}
+        documents = [
+            document
+            for document in documents
+            if (args.items_root / document.entry).resolve() in selected
+        ]
+    try:
+        outcomes = render_thumbnails(documents, args.cache_dir, args.width, args.jobs)
+    except ValueError as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+
+    counts: dict[str, int] = {}
+    failed_entries = set()
+    for outcome in outcomes:
+        counts[outcome.status] = counts.get(outcome.status, 0) + 1
+        document = outcome.document
+        if outcome.status == "error":
+            label = f"{document.entry}/{document.file}"
+            print(f"error: {label}: {outcome.message}", file=sys.stderr)
+            failed_entries.add(document.entry)
+
+    # Previews follow the item.toml document order.
+    by_entry: dict[Path, list[ArchivedPdf]] = {}
+    for document in documents:
+        if document.entry not in failed_entries:
+            by_entry.setdefault(entry_directory(document), []).append(document)
+    for entry, entry_documents in by_entry.items():
+        try:
+            if link_entry(entry, entry_documents):
+                print(f"updated: {entry / 'README.md'}")
+        except OSError as error:
+            print(f"error: {entry}: {error}", file=sys.stderr)
+            failed_entries.add(entry.name)
+    print(
+        ", ".join(f"{status}={count}" for status, count in sorted(counts.items())),
+        file=sys.stderr,
+    )
+    return 1 if failed_entries else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
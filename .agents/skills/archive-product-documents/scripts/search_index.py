@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+
+import argparse
+import hashlib
+import sqlite3
+import sys
+import time
+import tomllib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+
+from pdf_text import DEFAULT_CACHE_DIR, cached_text
+from validate_entry import SHA256_PATTERN
+
+
+DEFAULT_DATABASE = DEFAULT_CACHE_DIR / "search.sqlite3"
+DEFAULT_LIMIT = 10
+DEFAULT_JOBS = 4
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    key TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    row INTEGER NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS search USING fts5(
+    entry UNINDEXED,
+    file UNINDEXED,
+    kind UNINDEXED,
+    title,
+    body,
+    tokenize = 'porter unicode61 remove_diacritics 2'
+);
+"""
+
+
+@dataclass(frozen=True)
+class Source:
+    """One indexed unit: an entry's metadata, its README, or one archived PDF."""
+
+    key: str
+    entry: str
+    file: str
+    kind: str
+    title: str
+    digest: str
+    path: Path | None = None
+    body: str | None = None
+
+    @property
+    def state(self) -> str:
+        """What a stored row reflects: the content and the title shown with it.
+
+        A renamed entry or retitled document changes no content digest, but
+        its rows still need the new title.
+        """
+        return text_digest(f"{self.digest}\n{self.title}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Build or query an offline full-text index of the product archive."
+    )
+    parser.add_argument(
+        "--database",
+        type=Path,
+        default=DEFAULT_DATABASE,
+        help=f"SQLite index path (default: {DEFAULT_DATABASE})",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Create or incrementally update the index.")
+    build.add_argument(
+        "--items-root",
+        type=Path,
+        default=Path("docs/items"),
+        help="Archive items root (default: docs/items)",
+    )
+    build.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help=f"Extracted-text cache directory (default: {DEFAULT_CACHE_DIR})",
+    )
+    build.add_argument("--jobs", type=int, default=DEFAULT_JOBS)
+
+    query = commands.add_parser("query", help="Search the index.")
+    query.add_argument("terms", nargs="+")
+    query.add_argument("--limit", type=int, default=DEFAULT_LIMIT)
+    query.add_argument(
+        "--raw",
+        action="store_true",
+        help="Pass the terms through as an FTS5 query (OR, NEAR, prefix*, ...).",
+    )
+    return parser.parse_args()
+
+
+def text_digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def metadata_text(metadata: dict) -> str:
+    lines = []
+    for field_name in ("name", "brand", "manufacturer", "model"):
+        if isinstance(metadata.get(field_name), str):
+            lines.append(metadata[field_name])
+    for field_name in ("item_numbers", "upcs"):
+        values = metadata.get(field_name)
+        if isinstance(values, list):
+            lines.extend(str(value) for value in values)
+    for table in ("documents", "source_documents"):
+        for document in metadata.get(table) or ():
+            if isinstance(document, dict):
+                lines.extend(
+                    str(document[key]) for key in ("title", "type") if key in document
+                )
+    return "\n".join(lines)
+
+
+def entry_sources(entry: Path) -> list[Source]:
+    slug = entry.name
+    raw_metadata = (entry / "item.toml").read_text(encoding="utf-8")
+    metadata = tomllib.loads(raw_metadata)
+    title = metadata.get("name") if isinstance(metadata.get("name"), str) else slug
+    sources = [
+        Source(
+            f"{slug}/item.toml",
+            slug,
+            "item.toml",
+            "metadata",
+            title,
+            text_digest(raw_metadata),
+            body=metadata_text(metadata),
+        )
+    ]
+
+    readme_path = entry / "README.md"
+    if readme_path.is_file():
+        readme = readme_path.read_text(encoding="utf-8")
+        sources.append(
+            Source(
+                f"{slug}/README.md",
+                slug,
+                "README.md",
+                "readme",
+                title,
+                text_digest(readme),
+                body=readme,
+            )
+        )
+
+    for document in metadata.get("documents") or ():
+        if not isinstance(document, dict) or not isinstance(document.get("file"), str):
+            continue
+        relative_file = document["file"]
+        pure_path = PurePosixPath(relative_file)
+        if pure_path.is_absolute() or ".." in pure_path.parts:
+            continue
+        path = entry / pure_path
+        if not path.is_file():
+            continue
+        digest = document.get("sha256")
+        if not isinstance(digest, str) or not SHA256_PATTERN.fullmatch(digest):
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        sources.append(
+            Source(
+                f"{slug}/{relative_file}",
+                slug,
+                relative_file,
+                "document",
+                str(document.get("title") or relative_file),
+                digest,
+                path=path,
+            )
+        )
+    return sources
+
+
+def connect(database: Path) -> sqlite3.Connection:
+    database.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(database)
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def build_index(
+    connection: sqlite3.Connection,
+    items_root: Path,
+    cache_dir: Path = DEFAULT_CACHE_DIR,
+    jobs: int = DEFAULT_JOBS,
+) -> dict[str, int]:
+    """Bring the index in line with ``items_root``; return per-action counts.
+
+    A source whose content and title are unchanged keeps its row untouched, so
+    PDFs are only ever read for new or changed content (and even then the text
+    cache skips extraction for any digest seen before).
+    """
+    indexed = {
+        key: (digest, row)
+        for key, digest, row in connection.execute("SELECT key, digest, row FROM sources")
+    }
+    sources: list[Source] = []
+    failed: set[str] = set()
+    for metadata_path in sorted(items_root.glob("*/item.toml")):
+        if metadata_path.parent.name.startswith("."):
+            continue
+        try:
+            sources.extend(entry_sources(metadata_path.parent))
+        except (OSError, tomllib.TOMLDecodeError) as error:
+            print(f"error: {metadata_path.parent}: {error}", file=sys.stderr)
+            failed.add(metadata_path.parent.name)
+
+    changed = [
+        source for source in sources if indexed.get(source.key, ("",))[0] != source.state
+    ]
+
+    def body_of(source: Source) -> str:
+        if source.body is not None:
+            return source.body
+        return cached_text(source.path, source.digest, cache_dir)
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        bodies = list(executor.map(body_of, changed))
+
+    # Keep the last good rows of an entry that failed to load this time.
+    seen = {source.key for source in sources}
+    removed = [
+        key for key in indexed if key not in seen and key.split("/", 1)[0] not in failed
+    ]
+    with connection:
+        for key in removed:
+            connection.execute("DELETE FROM search WHERE rowid = ?", (indexed[key][1],))
+            connection.execute("DELETE FROM sources WHERE key = ?", (key,))
+        for source, body in zip(changed, bodies):
+            if source.key in indexed:
+                connection.execute(
+                    "DELETE FROM search WHERE rowid = ?", (indexed[source.key][1],)
+                )
+            cursor = connection.execute(
+                "INSERT INTO search (entry, file, kind, title, body) VALUES (?, ?, ?, ?, ?)",
+                (source.entry, source.file, source.kind, source.title, body),
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO sources (key, digest, row) VALUES (?, ?, ?)",
+                (source.key, source.state, cursor.lastrowid),
+            )
+    return {
+        "indexed": len(changed),
+        "unchanged": len(sources) - len(changed),
+        "removed": len(removed),
+        "failed": len(failed),
+    }
+
+
+def fts_query(terms: list[str]) -> str:
+    """Quote every term so model numbers like MLZ-KY06NA are matched literally."""
+    words = " ".join(terms).split()
+    return " ".join('"' + word.replace('"', '""') + '"' for word in words)
+
+
+def search(
+    connection: sqlite3.Connection, query: str, limit: int = DEFAULT_LIMIT
+) -> list[tuple[str, str, str, str]]:
+    """Return ``(entry, file, title, snippet)`` rows, best match first."""
+    return connection.execute(
+        """
+        SELECT entry, file, title, snippet(search, 4, '[', ']', '...', 12)
+        FROM search
+        WHERE search MATCH ?
+        ORDER BY bm25(search, 0, 0, 0, 4.0, 1.0)
+        LIMIT ?
+        """,
+        (query, limit),
+    ).fetchall()
+
+
+def main() -> int:
+    args = parse_args()
+    started = time.perf_counter()
+    try:
+        connection = connect(args.database)
+        if args.command == "build":
+            if args.jobs <= 0:
+                raise ValueError("--jobs must be positive")
+            counts = build_index(connection, args.items_root, args.cache_dir, args.jobs)
+            elapsed = time.perf_counter() - started
+            print(
+                f"indexed={counts['indexed']} unchanged={counts['unchanged']} "
+                f"removed={counts['removed']} ({elapsed:.2f}s)"
+            )
+            return 1 if counts["failed"] else 0
+
+        query = " ".join(args.terms) if args.raw else fts_query(args.terms)
+        rows = search(connection, query, args.limit)
+    except (OSError, ValueError, sqlite3.Error) as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+
+    elapsed = time.perf_counter() - started
+    for entry, file, title, snippet in rows:
+        print(f"{entry}/{file}  {title}")
+        print(f"    {' '.join(snippet.split())}")
+    print(f"{len(rows)} results in {elapsed * 1000:.1f} ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,68 +1,41 @@
 #!/usr/bin/env python3
 
 import argparse
-import hashlib
 import re
 import shutil
 import subprocess
 import sys
 import tomllib
-import urllib.parse
 from dataclasses import dataclass, field
-from datetime import date
 from pathlib import Path, PurePosixPath
 
-
-ENTRY_SLUG_PATTERN = re.compile(r"^[a-z0-9]+(?:-[a-z0-9]+)*$")
-DOCUMENT_TYPE_PATTERN = re.compile(r"^[a-z0-9]+(?:-[a-z0-9]+)*$")
-LANGUAGE_PATTERN = re.compile(r"^[a-z]{2}$")
-SHA256_PATTERN = re.compile(r"^[a-f0-9]{64}$")
-
-REQUIRED_PRODUCT_FIELDS = {
-    "schema_version",
-    "name",
-    "brand",
-    "model",
-    "documents",
-}
-OPTIONAL_PRODUCT_FIELDS = {
-    "manufacturer",
-    "item_numbers",
-    "upcs",
-    "product_url",
-    "support_url",
-}
-REQUIRED_DOCUMENT_FIELDS = {
-    "title",
-    "type",
-    "file",
-    "languages",
-    "source_url",
-    "source_type",
-    "retrieved",
-    "sha256",
-    "bytes",
-}
-OPTIONAL_DOCUMENT_FIELDS = {
-    "source_page_url",
-    "source_filename",
-    "resolved_url",
-    "revision",
-    "pages",
-}
-ALLOWED_DOCUMENT_TYPES = {
-    "user-manual",
-    "use-and-care-instructions",
-    "installation-instructions",
-    "assembly-instructions",
-    "service-manual",
-    "quick-start-guide",
-    "parts-diagram",
-    "specification-sheet",
-    "warranty",
-    "safety-data-sheet",
-}
-ALLOWED_SOURCE_TYPES = {"manufacturer", "retailer", "third-party-mirror"}
+from archive_model import Document
+from changed_entries import changed_entries
+from item_schema import (
+    DOCUMENT_TYPES_V1,
+    KEBAB_PATTERN,
+    LANGUAGE_PATTERN,
+    SCHEMAS,
+    SHA256_PATTERN,
+    SOURCE_TYPES_V1,
+    compile_schema,
+    is_non_empty_string,
+    schema_for,
+)
+from pdf_metadata import scan_pdf
+
+
+ENTRY_SLUG_PATTERN = KEBAB_PATTERN
+DOCUMENT_TYPE_PATTERN = KEBAB_PATTERN
+README_LINK_PATTERN = re.compile(r"\]\(\s*<?([^)\s>]+)>?(?:\s+\"[^\"]*\")?\s*\)")
+
+# Schema version 1 field sets, kept for callers that inspect them.
+REQUIRED_PRODUCT_FIELDS = set(SCHEMAS[1]["product"]["required"])
+OPTIONAL_PRODUCT_FIELDS = set(SCHEMAS[1]["product"]["optional"])
+REQUIRED_DOCUMENT_FIELDS = set(SCHEMAS[1]["document"]["required"])
+OPTIONAL_DOCUMENT_FIELDS = set(SCHEMAS[1]["document"]["optional"])
+ALLOWED_DOCUMENT_TYPES = set(DOCUMENT_TYPES_V1)
+ALLOWED_SOURCE_TYPES = set(SOURCE_TYPES_V1)
 
 
 @dataclass
@@ -79,38 +52,25 @@ def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Validate one or more archived product-document entries."
     )
-    parser.add_argument("entries", nargs="+", type=Path)
-    return parser.parse_args()
-
-
-def is_non_empty_string(value) -> bool:
-    return isinstance(value, str) and bool(value.strip())
-
-
-def validate_http_url(value, field_name: str, result: ValidationResult) -> None:
-    if not is_non_empty_string(value):
-        result.errors.append(f"{field_name} must be a non-empty string")
-        return
-    parsed = urllib.parse.urlparse(value)
-    if parsed.scheme not in {"http", "https"} or not parsed.netloc:
-        result.errors.append(f"{field_name} must be an HTTP or HTTPS URL")
-    if parsed.username or parsed.password:
-        result.errors.append(f"{field_name} must not contain credentials")
-
-
-def validate_known_fields(
-    record: dict,
-    required: set[str],
-    optional: set[str],
-    label: str,
-    result: ValidationResult,
-) -> None:
-    missing = required - record.keys()
-    unknown = record.keys() - required - optional
-    if missing:
-        result.errors.append(f"{label} is missing fields: {', '.join(sorted(missing))}")
-    if unknown:
-        result.errors.append(f"{label} has unknown fields: {', '.join(sorted(unknown))}")
+    parser.add_argument("entries", nargs="*", type=Path)
+    parser.add_argument(
+        "--changed-since",
+        metavar="REV",
+        help=(
+            "Validate only entries changed since this git revision, plus entries "
+            "recording the same document digests."
+        ),
+    )
+    parser.add_argument(
+        "--items-root",
+        type=Path,
+        default=Path("docs/items"),
+        help="Archive items root for --changed-since (default: docs/items)",
+    )
+    args = parser.parse_args()
+    if not args.entries and not args.changed_since:
+        parser.error("give entry directories or --changed-since")
+    return args
 
 
 def expected_document_path(entry_slug: str, document: dict) -> str | None:
@@ -148,61 +108,38 @@ def read_pdf_page_count(path: Path) -> tuple[int | None, str | None]:
     return int(match.group(1)), None
 
 
+def readme_link_targets(readme: str) -> set[str]:
+    """Every Markdown link target in ``readme``, parsed once per entry."""
+    return set(README_LINK_PATTERN.findall(readme))
+
+
 def validate_document(
     entry: Path,
     entry_slug: str,
     document: dict,
     index: int,
-    readme: str,
+    readme_links: set[str],
     seen_files: set[str],
     seen_hashes: dict[str, str],
     result: ValidationResult,
+    schema=None,
 ) -> None:
     label = f"documents[{index}]"
+    schema = schema or compile_schema()
     if not isinstance(document, dict):
         result.errors.append(f"{label} must be a TOML table")
         return
 
-    validate_known_fields(
-        document,
-        REQUIRED_DOCUMENT_FIELDS,
-        OPTIONAL_DOCUMENT_FIELDS,
-        label,
-        result,
-    )
-    if REQUIRED_DOCUMENT_FIELDS - document.keys():
+    if not schema.document.check_fields(document, label, result.errors):
         return
-
-    for field_name in ("title", "type", "file", "source_url", "source_type"):
-        if not is_non_empty_string(document[field_name]):
-            result.errors.append(f"{label}.{field_name} must be a non-empty string")
-
-    document_type = document["type"]
-    if document_type not in ALLOWED_DOCUMENT_TYPES:
-        result.errors.append(f"{label}.type is unsupported: {document_type}")
-
-    revision = document.get("revision")
-    if revision is not None and (
-        not is_non_empty_string(revision) or not DOCUMENT_TYPE_PATTERN.fullmatch(revision)
-    ):
-        result.errors.append(f"{label}.revision must be lowercase kebab-case")
-
-    languages = document["languages"]
-    if not isinstance(languages, list):
-        result.errors.append(f"{label}.languages must be an array")
-        languages = []
-    else:
-        if len(languages) != len(set(languages)):
-            result.errors.append(f"{label}.languages contains duplicates")
-        for language in languages:
-            if not isinstance(language, str) or not LANGUAGE_PATTERN.fullmatch(language):
-                result.errors.append(
-                    f"{label}.languages values must be lowercase ISO 639-1 codes"
-                )
-                break
+    schema.document.check_values(document, f"{label}.", result.errors)
+    # Typed view of the checked table; ill-typed fields read as None.
+    record = Document.from_record(document)
 
     expected_path = expected_document_path(entry_slug, document)
-    relative_file = document["file"]
+    relative_file = record.file
+    if relative_file is None:
+        return
     pure_path = PurePosixPath(relative_file)
     if (
         pure_path.is_absolute()
@@ -219,56 +156,23 @@ def validate_document(
         result.errors.append(f"{label}.file is duplicated: {relative_file}")
     seen_files.add(relative_file)
 
-    validate_http_url(document["source_url"], f"{label}.source_url", result)
-    for optional_url in ("source_page_url", "resolved_url"):
-        if optional_url in document:
-            validate_http_url(document[optional_url], f"{label}.{optional_url}", result)
-
-    source_type = document["source_type"]
-    if source_type not in ALLOWED_SOURCE_TYPES:
-        result.errors.append(f"{label}.source_type is unsupported: {source_type}")
-    if source_type in {"retailer", "third-party-mirror"} and not document.get(
-        "source_page_url"
-    ):
-        result.errors.append(
-            f"{label}.source_page_url is required for {source_type} sources"
-        )
-
-    source_filename = document.get("source_filename")
-    if source_filename is not None and not is_non_empty_string(source_filename):
-        result.errors.append(f"{label}.source_filename must be a non-empty string")
-
-    retrieved = document["retrieved"]
-    if not isinstance(retrieved, date):
-        result.errors.append(f"{label}.retrieved must be an unquoted TOML date")
-
-    sha256 = document["sha256"]
-    if not isinstance(sha256, str) or not SHA256_PATTERN.fullmatch(sha256):
-        result.errors.append(f"{label}.sha256 must be a lowercase SHA-256 digest")
-
-    byte_count = document["bytes"]
-    if type(byte_count) is not int or byte_count <= 0:
-        result.errors.append(f"{label}.bytes must be a positive integer")
-
-    pages = document.get("pages")
-    if pages is not None and (type(pages) is not int or pages <= 0):
-        result.errors.append(f"{label}.pages must be a positive integer")
-
     file_path = entry / pure_path
     if not file_path.is_file():
         result.errors.append(f"{label}.file does not exist: {relative_file}")
         return
 
-    data = file_path.read_bytes()
-    if not data.startswith(b"%PDF-"):
+    # One streaming read yields the signature, size, digest and page count.
+    metadata = scan_pdf(file_path)
+    if not metadata.has_signature:
         result.errors.append(f"{label}.file does not have a PDF signature")
-    if type(byte_count) is int and len(data) != byte_count:
+    if record.byte_count is not None and metadata.byte_count != record.byte_count:
         result.errors.append(
-            f"{label}.bytes is {byte_count}, but the file contains {len(data)} bytes"
+            f"{label}.bytes is {record.byte_count}, but the file contains "
+            f"{metadata.byte_count} bytes"
         )
 
-    actual_hash = hashlib.sha256(data).hexdigest()
-    if isinstance(sha256, str) and actual_hash != sha256:
+    actual_hash = metadata.sha256
+    if record.sha256 is not None and actual_hash != record.sha256:
         result.errors.append(f"{label}.sha256 does not match the file")
     if actual_hash in seen_hashes:
         result.errors.append(
@@ -277,17 +181,29 @@ def validate_document(
     else:
         seen_hashes[actual_hash] = relative_file
 
-    if f"({relative_file})" not in readme:
+    if relative_file not in readme_links:
         result.errors.append(f"README.md does not link {relative_file}")
 
-    if pages is not None:
+    pages = record.pages
+    if pages is not None and metadata.pages != pages:
+        # The scan cannot see every page layout; pdfinfo settles disagreements.
         actual_pages, page_warning = read_pdf_page_count(file_path)
-        if page_warning:
-            result.warnings.append(page_warning)
-        elif actual_pages != pages:
+        if not page_warning:
+            if actual_pages != pages:
+                result.errors.append(
+                    f"{label}.pages is {pages}, but pdfinfo reports {actual_pages}"
+                )
+        elif metadata.pages_declared:
             result.errors.append(
-                f"{label}.pages is {pages}, but pdfinfo reports {actual_pages}"
+                f"{label}.pages is {pages}, but the linearization dictionary "
+                f"declares {metadata.pages}"
             )
+        else:
+            # Page objects in object streams or incremental updates skew the
+            # scanned count, so without pdfinfo a mismatch is only a warning.
+            if metadata.pages is not None:
+                page_warning += f" (the scan counted {metadata.pages} pages)"
+            result.warnings.append(page_warning)
 
 
 def validate_entry(entry: Path) -> ValidationResult:
@@ -319,49 +235,10 @@ def validate_entry(entry: Path) -> ValidationResult:
         result.errors.append("item.toml must contain a TOML table")
         return result
 
-    validate_known_fields(
-        metadata,
-        REQUIRED_PRODUCT_FIELDS,
-        OPTIONAL_PRODUCT_FIELDS,
-        "item.toml",
-        result,
-    )
-    if REQUIRED_PRODUCT_FIELDS - metadata.keys():
+    schema = schema_for(metadata)
+    if not schema.product.check_fields(metadata, "item.toml", result.errors):
         return result
-
-    if metadata["schema_version"] != 1:
-        result.errors.append("schema_version must be 1")
-    for field_name in ("name", "brand", "model"):
-        if not is_non_empty_string(metadata[field_name]):
-            result.errors.append(f"{field_name} must be a non-empty string")
-
-    if "product_url" in metadata:
-        validate_http_url(metadata["product_url"], "product_url", result)
-    if "support_url" in metadata:
-        validate_http_url(metadata["support_url"], "support_url", result)
-    if "manufacturer" in metadata and not is_non_empty_string(metadata["manufacturer"]):
-        result.errors.append("manufacturer must be a non-empty string")
-
-    item_numbers = metadata.get("item_numbers")
-    if item_numbers is not None and (
-        not isinstance(item_numbers, list)
-        or not item_numbers
-        or not all(is_non_empty_string(value) for value in item_numbers)
-    ):
-        result.errors.append("item_numbers must be a non-empty array of strings")
-
-    upcs = metadata.get("upcs")
-    if upcs is not None and (
-        not isinstance(upcs, list)
-        or not upcs
-        or not all(
-            isinstance(value, str)
-            and value.isdigit()
-            and len(value) in {12, 13, 14}
-            for value in upcs
-        )
-    ):
-        result.errors.append("upcs must contain 12-, 13-, or 14-digit strings")
+    schema.product.check_values(metadata, "", result.errors)
 
     documents = metadata["documents"]
     if not isinstance(documents, list) or not documents:
@@ -370,16 +247,18 @@ def validate_entry(entry: Path) -> ValidationResult:
 
     seen_files: set[str] = set()
     seen_hashes: dict[str, str] = {}
+    readme_links = readme_link_targets(readme)
     for index, document in enumerate(documents):
         validate_document(
             entry,
             entry.name,
             document,
             index,
-            readme,
+            readme_links,
             seen_files,
             seen_hashes,
             result,
+            schema,
         )
 
     documents_dir = entry / "documents"
@@ -403,8 +282,21 @@ def validate_entry(entry: Path) -> ValidationResult:
 
 def main() -> int:
     args = parse_args()
+    entries = list(args.entries)
+    if args.changed_since:
+        try:
+            changed = changed_entries(args.changed_since, args.items_root)
+        except ValueError as error:
+            print(f"error: {error}", file=sys.stderr)
+            return 1
+        named = {entry.resolve() for entry in entries}
+        entries += [entry for entry in changed if entry not in named]
+        print(
+            f"{len(changed)} entries changed since {args.changed_since}",
+            file=sys.stderr,
+        )
     failed = False
-    for entry in args.entries:
+    for entry in entries:
         result = validate_entry(entry)
         for warning in result.warnings:
             print(f"warning: {entry}: {warning}", file=sys.stderr)
@@ -0,0 +1,91 @@
+import sys
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+
+
+SKILL_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SKILL_DIR / "scripts"))
+
+import archive_model
+
+
+DOCUMENT = {
+    "title": "Use and Care Guide",
+    "type": "use-and-care-instructions",
+    "file": "documents/acme-washer-use-and-care-instructions-en.pdf",
+    "languages": ["en"],
+    "source_url": "https://example.com/guide.pdf",
+    "source_page_url": "https://example.com/washer",
+    "source_type": "retailer",
+    "retrieved": date(2026, 7, 25),
+    "sha256": "a" * 64,
+    "bytes": 1024,
+    "pages": 12,
+}
+
+
+class ArchiveModelTests(unittest.TestCase):
+    def test_documents_share_types_strings_and_dates(self):
+        first, second = (
+            archive_model.Document.from_record(dict(DOCUMENT, sha256=digest))
+            for digest in ("a" * 64, "b" * 64)
+        )
+        self.assertIs(first.type, archive_model.DocumentType.USE_AND_CARE_INSTRUCTIONS)
+        self.assertEqual(first.type, "use-and-care-instructions")
+        self.assertIs(first.source_type, second.source_type)
+        self.assertIs(first.retrieved, second.retrieved)
+        self.assertIs(first.source_page_url, second.source_page_url)
+        self.assertEqual(first.byte_count, 1024)
+        self.assertFalse(hasattr(first, "__dict__"))
+
+    def test_ill_typed_fields_read_as_empty(self):
+        document = archive_model.Document.from_record(
+            {"type": "dimension-guide", "languages": "en", "bytes": 0, "title": " "}
+        )
+        self.assertEqual(document.type, "dimension-guide")
+        self.assertNotIsInstance(document.type, archive_model.DocumentType)
+        self.assertEqual(document.languages, ())
+        self.assertIsNone(document.byte_count)
+        self.assertIsNone(document.title)
+        self.assertIsNone(document.file)
+
+        quoted = archive_model.Document.from_record({"retrieved": "2026-07-25"})
+        self.assertEqual(quoted.retrieved, date(2026, 7, 25))
+
+    def test_loads_entry_tables(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            entry = Path(temporary_directory) / "acme-washer"
+            entry.mkdir()
+            (entry / "item.toml").write_text(
+                "\n".join(
+                    [
+                        "schema_version = 1",
+                        'name = "Washer"',
+                        'brand = "Acme"',
+                        'upcs = ["012345678905"]',
+                        "documents = [1]",
+                        "",
+                        "[[source_documents]]",
+                        'type = "user-manual"',
+                        'languages = ["en", "fr"]',
+                        'source_url = "https://example.com/manual.pdf"',
+                    ]
+                ),
+                encoding="utf-8",
+            )
+            product = archive_model.load_product(entry)
+            self.assertEqual(product.slug, "acme-washer")
+            self.assertEqual(product.schema_version, 1)
+            self.assertEqual(product.upcs, ("012345678905",))
+            self.assertEqual(product.documents, ())
+            (source,) = product.source_documents
+            self.assertEqual(source.languages, ("en", "fr"))
+            self.assertIsNone(source.file)
+            with self.assertRaises(FileNotFoundError):
+                archive_model.load_product(entry.parent / "missing")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,15 +1,22 @@
+import contextlib
 import hashlib
+import http.server
 import io
+import json
 import sys
 import tempfile
+import threading
 import unittest
 from pathlib import Path
+from unittest import mock
 
 
 SKILL_DIR = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(SKILL_DIR / "scripts"))
 
 import download_pdf
+import item_schema
+import pdf_metadata
 import validate_entry
 
 
@@ -59,6 +66,66 @@ class DownloadPdfTests(unittest.TestCase):
             self.assertEqual(result.sha256, hashlib.sha256(data).hexdigest())
             self.assertEqual(result.resolved_url, PUBLIC_PDF_URL)
 
+    def test_records_phase_timings_and_appends_timing_log(self):
+        data = b"%PDF-1.7\npublic manual"
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            root = Path(temporary_directory)
+            result = download_pdf.download_pdf(
+                PUBLIC_PDF_URL,
+                root / "manual.pdf",
+                max_bytes=1024,
+                timeout=1,
+                replace=False,
+                opener=FakeOpener(FakeResponse(data)),
+            )
+            timings = result.timings
+            self.assertGreater(timings.total, 0)
+            self.assertGreaterEqual(timings.total, timings.dns + timings.transfer)
+            self.assertEqual(timings.redirects, 0)
+
+            log = root / "logs" / "timings.ndjson"
+            download_pdf.append_timing_log(log, PUBLIC_PDF_URL, result)
+            download_pdf.append_timing_log(log, PUBLIC_PDF_URL, result)
+            records = [json.loads(line) for line in log.read_text().splitlines()]
+            self.assertEqual(len(records), 2)
+            self.assertEqual(records[0]["source"], "network")
+            self.assertEqual(records[0]["bytes"], len(data))
+            fields = set(download_pdf.PHASES) | {"total", "redirects", "throughput"}
+            self.assertLessEqual(fields, records[0].keys())
+
+    def test_timed_opener_measures_connection_phases(self):
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/old.pdf":
+                    self.send_response(302)
+                    self.send_header("Location", "/manual.pdf")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Length", "9")
+                self.end_headers()
+                self.wfile.write(b"%PDF-1.7\n")
+
+            def log_message(self, *args):
+                pass
+
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            clock = download_pdf.PhaseClock()
+            opener = download_pdf.build_timed_opener(clock)
+            url = f"http://127.0.0.1:{server.server_address[1]}/old.pdf"
+            # The loopback address is not public, so only the opener is exercised.
+            with self.assertRaisesRegex(Exception, "public"):
+                opener.open(url, timeout=5)
+            self.assertGreater(clock.seconds["connect"], 0)
+            self.assertEqual(clock.seconds["tls"], 0)
+        finally:
+            server.shutdown()
+            server.server_close()
+
     def test_rejects_non_pdf_response_without_leaving_output(self):
         with tempfile.TemporaryDirectory() as temporary_directory:
             output = Path(temporary_directory) / "manual.pdf"
@@ -104,6 +171,139 @@ class DownloadPdfTests(unittest.TestCase):
                 )
             self.assertEqual(output.read_bytes(), b"existing")
 
+    def test_rejects_mismatching_declared_length_before_reading(self):
+        response = FakeResponse(b"%PDF-1.7\n", headers={"Content-Length": "9"})
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            output = Path(temporary_directory) / "manual.pdf"
+            with self.assertRaisesRegex(ValueError, "declares 9 bytes"):
+                download_pdf.download_pdf(
+                    PUBLIC_PDF_URL,
+                    output,
+                    max_bytes=1024,
+                    timeout=1,
+                    replace=False,
+                    opener=FakeOpener(response),
+                    expected_bytes=512,
+                )
+            self.assertFalse(output.exists())
+
+    def test_rejects_unexpected_digest_without_leaving_output(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            output = Path(temporary_directory) / "manual.pdf"
+            with self.assertRaisesRegex(ValueError, "SHA-256"):
+                download_pdf.download_pdf(
+                    PUBLIC_PDF_URL,
+                    output,
+                    max_bytes=1024,
+                    timeout=1,
+                    replace=False,
+                    opener=FakeOpener(FakeResponse(b"%PDF-1.7\nchanged")),
+                    expected_sha256="0" * 64,
+                )
+            self.assertFalse(output.exists())
+
+    def test_skips_network_when_output_matches_digest(self):
+        data = b"%PDF-1.7\npublic manual"
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            output = Path(temporary_directory) / "manual.pdf"
+            output.write_bytes(data)
+            result = download_pdf.download_pdf(
+                "https://unresolvable.invalid/manual.pdf",
+                output,
+                max_bytes=1024,
+                timeout=1,
+                replace=False,
+                opener=None,
+                expected_bytes=len(data),
+                expected_sha256=hashlib.sha256(data).hexdigest(),
+            )
+            self.assertTrue(result.reused)
+            self.assertEqual(result.byte_count, len(data))
+            self.assertEqual(result.pdf.version, "1.7")
+
+    def test_mirror_serves_repeat_downloads_offline(self):
+        data = b"%PDF-1.7\nmirrored manual"
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            root = Path(temporary_directory)
+            mirror = download_pdf.LocalMirror(root / "mirror")
+            first = download_pdf.download_pdf(
+                PUBLIC_PDF_URL,
+                root / "first.pdf",
+                max_bytes=1024,
+                timeout=1,
+                replace=False,
+                opener=FakeOpener(FakeResponse(data)),
+                mirror=mirror,
+            )
+            self.assertFalse(first.from_mirror)
+            self.assertTrue(mirror.document_path(first.sha256).is_file())
+
+            second = download_pdf.download_pdf(
+                PUBLIC_PDF_URL,
+                root / "second.pdf",
+                max_bytes=1024,
+                timeout=1,
+                replace=False,
+                mirror=mirror,
+                offline=True,
+            )
+            self.assertTrue(second.from_mirror)
+            self.assertEqual((root / "second.pdf").read_bytes(), data)
+            self.assertEqual(second.pdf, first.pdf)
+
+            with self.assertRaisesRegex(ValueError, "offline"):
+                download_pdf.download_pdf(
+                    "https://8.8.8.8/other.pdf",
+                    root / "third.pdf",
+                    max_bytes=1024,
+                    timeout=1,
+                    replace=False,
+                    mirror=mirror,
+                    offline=True,
+                )
+
+    def test_mirror_failure_keeps_the_download(self):
+        data = b"%PDF-1.7\nmirrored manual"
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            root = Path(temporary_directory)
+            with mock.patch.object(
+                download_pdf.LocalMirror, "store", side_effect=OSError("disk full")
+            ), contextlib.redirect_stderr(io.StringIO()) as stderr:
+                result = download_pdf.download_pdf(
+                    PUBLIC_PDF_URL,
+                    root / "manual.pdf",
+                    max_bytes=1024,
+                    timeout=1,
+                    replace=False,
+                    opener=FakeOpener(FakeResponse(data)),
+                    mirror=download_pdf.LocalMirror(root / "mirror"),
+                )
+            self.assertEqual(result.sha256, hashlib.sha256(data).hexdigest())
+            self.assertEqual((root / "manual.pdf").read_bytes(), data)
+            self.assertIn("could not store", stderr.getvalue())
+
+    def test_mirror_ignores_corrupted_copy(self):
+        data = b"%PDF-1.7\nmirrored manual"
+        digest = hashlib.sha256(data).hexdigest()
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            root = Path(temporary_directory)
+            mirror = download_pdf.LocalMirror(root / "mirror")
+            corrupted = mirror.document_path(digest)
+            corrupted.parent.mkdir(parents=True)
+            corrupted.write_bytes(b"%PDF-1.7\ntampered")
+            with self.assertRaisesRegex(ValueError, "offline"):
+                download_pdf.download_pdf(
+                    PUBLIC_PDF_URL,
+                    root / "manual.pdf",
+                    max_bytes=1024,
+                    timeout=1,
+                    replace=False,
+                    expected_sha256=digest,
+                    mirror=mirror,
+                    offline=True,
+                )
+            self.assertFalse((root / "manual.pdf").exists())
+
     def test_rejects_private_initial_and_redirect_urls(self):
         with self.assertRaisesRegex(ValueError, "non-public"):
             download_pdf.validate_public_url("http://127.0.0.1/manual.pdf")
@@ -201,6 +401,73 @@ class ValidateEntryTests(unittest.TestCase):
                 result.errors,
             )
 
+    def test_scanned_page_mismatch_is_only_a_warning_without_pdfinfo(self):
+        unavailable = (None, "pdfinfo is unavailable; page count was not verified")
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            entry = self.create_entry(Path(temporary_directory))
+            metadata_path = entry / "item.toml"
+            metadata_path.write_text(metadata_path.read_text() + "pages = 3\n")
+            pdf_path = entry / "documents" / "acme-123-user-manual-en.pdf"
+            scanned = validate_entry.scan_pdf(pdf_path)
+            with mock.patch.object(
+                validate_entry, "read_pdf_page_count", return_value=unavailable
+            ):
+                with mock.patch.object(
+                    validate_entry,
+                    "scan_pdf",
+                    return_value=pdf_metadata.PdfMetadata(
+                        scanned.sha256, scanned.byte_count, "1.7", 1, None, False
+                    ),
+                ):
+                    result = validate_entry.validate_entry(entry)
+                self.assertEqual(result.errors, [])
+                self.assertIn("scan counted 1 pages", result.warnings[0])
+
+                with mock.patch.object(
+                    validate_entry,
+                    "scan_pdf",
+                    return_value=pdf_metadata.PdfMetadata(
+                        scanned.sha256, scanned.byte_count, "1.7", 2, None, True, True
+                    ),
+                ):
+                    result = validate_entry.validate_entry(entry)
+                self.assertEqual(len(result.errors), 1)
+                self.assertIn("linearization dictionary declares 2", result.errors[0])
+
+
+class ItemSchemaTests(unittest.TestCase):
+    def test_compiles_each_version_once(self):
+        self.assertIs(item_schema.compile_schema(1), item_schema.compile_schema(1))
+
+    def test_reports_field_problems_with_labels(self):
+        schema = item_schema.compile_schema(1)
+        errors: list[str] = []
+        document = {
+            "type": "brochure",
+            "languages": ["en", "en"],
+            "source_url": "ftp://8.8.8.8/manual.pdf",
+            "source_type": "retailer",
+            "bytes": 0,
+        }
+        schema.document.check_values(document, "documents[0].", errors)
+        self.assertEqual(
+            errors,
+            [
+                "documents[0].type is unsupported: brochure",
+                "documents[0].languages contains duplicates",
+                "documents[0].source_url must be an HTTP or HTTPS URL",
+                "documents[0].bytes must be a positive integer",
+                "documents[0].source_page_url is required for retailer sources",
+            ],
+        )
+
+    def test_rejects_unknown_schema_version(self):
+        errors: list[str] = []
+        item_schema.compile_schema().product.check_values(
+            {"schema_version": 7}, "", errors
+        )
+        self.assertEqual(errors, ["schema_version must be 1"])
+
 
 if __name__ == "__main__":
     unittest.main()
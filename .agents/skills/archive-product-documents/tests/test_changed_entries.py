@@ -0,0 +1,101 @@
+import contextlib
+import io
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+SKILL_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SKILL_DIR / "scripts"))
+
+import changed_entries
+import complete_pending_entry
+
+
+def git(root: Path, *arguments: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *arguments],
+        cwd=root,
+        check=True,
+        capture_output=True,
+    )
+
+
+def write_entry(items_root: Path, slug: str, digest: str) -> Path:
+    entry = items_root / slug
+    entry.mkdir(parents=True)
+    (entry / "item.toml").write_text(
+        f'name = "{slug}"\n[[documents]]\nsha256 = "{digest}"\n', encoding="utf-8"
+    )
+    (entry / "README.md").write_text(f"# {slug}\n", encoding="utf-8")
+    return entry
+
+
+@unittest.skipUnless(shutil.which("git"), "git is unavailable")
+class ChangedEntriesTests(unittest.TestCase):
+    def test_selects_changed_new_and_digest_sharing_entries(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            root = Path(temporary_directory)
+            items_root = root / "docs" / "items"
+            washer = write_entry(items_root, "acme-washer", "a" * 64)
+            write_entry(items_root, "acme-dryer", "b" * 64)
+            twin = write_entry(items_root, "acme-washer-plus", "a" * 64)
+            git(root, "init", "-q")
+            git(root, "add", ".")
+            git(root, "commit", "-q", "-m", "baseline")
+
+            self.assertEqual(changed_entries.changed_entries("HEAD", items_root), [])
+
+            (washer / "README.md").write_text("# acme-washer\n\nEdited.\n")
+            added = write_entry(items_root, "acme-fan", "c" * 64)
+            (items_root / ".acme-staging.1234").mkdir()
+            (items_root / ".acme-staging.1234" / "item.toml").write_text("")
+
+            selected = changed_entries.changed_entries("HEAD", items_root)
+            resolved = [path.resolve() for path in (added, washer, twin)]
+            self.assertEqual(selected, sorted(resolved))
+
+    def test_pending_report_merges_named_and_changed_entries(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            root = Path(temporary_directory)
+            items_root = root / "docs" / "items"
+            named = items_root / "acme-heater"
+            named.mkdir(parents=True)
+            (named / "item.toml").write_text('name = "Heater"\n', encoding="utf-8")
+            git(root, "init", "-q")
+            git(root, "add", ".")
+            git(root, "commit", "-q", "-m", "baseline")
+            fan = items_root / "acme-fan"
+            fan.mkdir()
+            (fan / "item.toml").write_text('name = "Fan"\n', encoding="utf-8")
+
+            arguments = [
+                "complete_pending_entry.py",
+                str(named),
+                "--changed-since",
+                "HEAD",
+                "--items-root",
+                str(items_root),
+            ]
+            output = io.StringIO()
+            with mock.patch.object(sys, "argv", arguments):
+                with contextlib.redirect_stdout(output):
+                    self.assertEqual(complete_pending_entry.main(), 0)
+            report = output.getvalue()
+            self.assertIn(str(named.resolve()), report)
+            self.assertIn(str(fan.resolve()), report)
+
+    def test_unknown_revision_is_reported(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            root = Path(temporary_directory)
+            git(root, "init", "-q")
+            with self.assertRaises(ValueError):
+                changed_entries.changed_entries("no-such-revision", root)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import io
+import sys
+import tempfile
+import threading
+import unittest
+import urllib.error
+from pathlib import Path
+
+
+SKILL_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SKILL_DIR / "scripts"))
+
+import check_links
+
+
+class FakeResponse(io.BytesIO):
+    status = 200
+
+    def __init__(self, url: str):
+        super().__init__(b"")
+        self._url = url
+
+    def geturl(self) -> str:
+        return self._url
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        self.close()
+
+
+class FakeOpener:
+    """Refuses HEAD with 405 and answers GET with 200, or 404 for missing paths."""
+
+    def __init__(self):
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def open(self, request, timeout):
+        with self._lock:
+            self.requests.append((request.get_method(), request.full_url))
+        if request.full_url.endswith("/missing.pdf"):
+            raise urllib.error.HTTPError(request.full_url, 404, "Not Found", {}, None)
+        if request.get_method() == "HEAD":
+            raise urllib.error.HTTPError(request.full_url, 405, "Not Allowed", {}, None)
+        return FakeResponse(request.full_url)
+
+
+class CheckLinksTests(unittest.TestCase):
+    def test_collects_each_url_once_with_every_place(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            entry = Path(temporary_directory) / "example-washer"
+            entry.mkdir()
+            (entry / "item.toml").write_text(
+                'product_url = "https://8.8.8.8/washer"\n'
+                "[[documents]]\n"
+                'source_url = "https://8.8.8.8/manual.pdf"\n'
+                'source_page_url = "https://8.8.8.8/washer"\n',
+                encoding="utf-8",
+            )
+            places, errors = check_links.archive_urls([entry])
+        self.assertEqual(errors, [])
+        self.assertEqual(
+            places["https://8.8.8.8/washer"],
+            [
+                "example-washer: product_url",
+                "example-washer: documents[0].source_page_url",
+            ],
+        )
+        self.assertEqual(len(places), 2)
+
+    def test_falls_back_to_ranged_get_and_reuses_fresh_results(self):
+        urls = ["https://8.8.8.8/manual.pdf", "https://8.8.4.4/missing.pdf"]
+        opener = FakeOpener()
+        results, probed = check_links.check_links(urls, {}, 3600, opener=opener)
+        self.assertEqual(probed, 2)
+        self.assertEqual(results[urls[0]].status, "ok")
+        self.assertEqual(results[urls[0]].detail, "GET")
+        self.assertEqual((results[urls[1]].status, results[urls[1]].code), ("broken", 404))
+        self.assertIn(("GET", urls[0]), opener.requests)
+        self.assertNotIn(("GET", urls[1]), opener.requests)
+
+        opener.requests.clear()
+        again, probed = check_links.check_links(urls, results, 3600, opener=opener)
+        self.assertEqual(probed, 1)
+        self.assertEqual(again[urls[0]], results[urls[0]])
+        self.assertEqual(opener.requests, [("HEAD", urls[1])])
+
+    def test_rejects_private_urls_without_requests(self):
+        opener = FakeOpener()
+        results, _ = check_links.check_links(
+            ["http://127.0.0.1/manual.pdf"], {}, 3600, opener=opener
+        )
+        self.assertEqual(results["http://127.0.0.1/manual.pdf"].status, "rejected")
+        self.assertEqual(opener.requests, [])
+
+    def test_cache_round_trips(self):
+        url = "https://8.8.8.8/manual.pdf"
+        status = check_links.LinkStatus(url, "ok", 200, url, "HEAD", 1.0)
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            path = Path(temporary_directory) / "cache" / "link-health.json"
+            check_links.save_cache(path, {status.url: status})
+            self.assertEqual(check_links.load_cache(path), {status.url: status})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -66,6 +66,38 @@ class CreatePendingEntryTests(unittest.TestCase):
             with self.assertRaisesRegex(ValueError, "lowercase ASCII kebab-case"):
                 create_pending_entry.create_entry(args)
 
+    def test_failed_write_leaves_no_partial_entry(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            items_root = Path(temporary_directory) / "items"
+            args = self.make_args(items_root)
+            original = create_pending_entry.render_readme
+
+            def crash(**kwargs):
+                raise OSError("disk full")
+
+            create_pending_entry.render_readme = crash
+            try:
+                with self.assertRaisesRegex(OSError, "disk full"):
+                    create_pending_entry.create_entry(args)
+            finally:
+                create_pending_entry.render_readme = original
+
+            self.assertEqual(list(items_root.iterdir()), [])
+            entry = create_pending_entry.create_entry(args)
+            self.assertTrue((entry / "README.md").is_file())
+
+    def test_existing_entry_is_never_replaced(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            items_root = Path(temporary_directory) / "items"
+            entry = create_pending_entry.create_entry(self.make_args(items_root))
+            (entry / "item.toml").write_text("kept")
+
+            with self.assertRaises(FileExistsError):
+                create_pending_entry.create_entry(self.make_args(items_root))
+
+            self.assertEqual((entry / "item.toml").read_text(), "kept")
+            self.assertEqual([path.name for path in items_root.iterdir()], [entry.name])
+
     def test_toml_string_escapes_newlines_and_control_characters(self) -> None:
         rendered = create_pending_entry.render_item_toml(
             brand="Brand\nName",
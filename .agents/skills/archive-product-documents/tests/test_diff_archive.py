@@ -0,0 +1,140 @@
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+SKILL_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SKILL_DIR / "scripts"))
+
+import diff_archive
+
+
+def item_toml(name: str, documents: list[tuple[str, str, str]]) -> str:
+    lines = [f'name = "{name}"', 'product_url = "https://example.com/p"', ""]
+    for file, digest, title in documents:
+        lines += [
+            "[[documents]]",
+            f'file = "{file}"',
+            f'sha256 = "{digest}"',
+            f'title = "{title}"',
+            "",
+        ]
+    return "\n".join(lines)
+
+
+def write_archive(items_root: Path, entries: dict[str, str]) -> None:
+    for slug, text in entries.items():
+        (items_root / slug).mkdir(parents=True, exist_ok=True)
+        (items_root / slug / "item.toml").write_text(text, encoding="utf-8")
+
+
+MANUAL = "documents/acme-washer-user-manual-en.pdf"
+GUIDE = "documents/acme-washer-installation-instructions-en.pdf"
+SHEET = "documents/acme-washer-specification-sheet-en.pdf"
+OLD = {
+    "acme-washer": item_toml(
+        "Washer", [(MANUAL, "a" * 64, "Manual"), (GUIDE, "b" * 64, "Guide")]
+    ),
+    "acme-dryer": item_toml("Dryer", [("documents/d.pdf", "d" * 64, "Manual")]),
+    "acme-fan": item_toml("Fan", [("documents/f.pdf", "f" * 64, "Manual")]),
+}
+NEW = {
+    "acme-washer": item_toml(
+        "Washer 2",
+        [
+            (MANUAL, "c" * 64, "Manual"),
+            (GUIDE, "b" * 64, "Installation Guide"),
+            (SHEET, "e" * 64, "Sheet"),
+        ],
+    ),
+    # Only document order differs, which is not a change.
+    "acme-fan": item_toml("Fan", [("documents/f.pdf", "f" * 64, "Manual")]),
+    "acme-heater": item_toml("Heater", []),
+}
+
+
+class DiffArchiveTests(unittest.TestCase):
+    def check(self, diffs):
+        by_slug = {entry_diff.slug: entry_diff for entry_diff in diffs}
+        self.assertEqual(
+            {slug: entry_diff.status for slug, entry_diff in by_slug.items()},
+            {"acme-dryer": "removed", "acme-heater": "added", "acme-washer": "changed"},
+        )
+        washer = by_slug["acme-washer"]
+        self.assertEqual(washer.fields, [("name", "Washer", "Washer 2")])
+        self.assertEqual([document["file"] for document in washer.added], [SHEET])
+        self.assertEqual(washer.removed, [])
+        self.assertEqual(
+            [(old["sha256"][0], new["sha256"][0]) for old, new in washer.replaced],
+            [("a", "c")],
+        )
+        self.assertEqual(
+            [changes for _, changes in washer.edited],
+            [[("title", "Guide", "Installation Guide")]],
+        )
+
+    def test_compares_directories_by_slug_and_digest(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            root = Path(temporary_directory)
+            write_archive(root / "old", OLD)
+            write_archive(root / "new", NEW)
+            self.check(
+                diff_archive.diff_snapshots(
+                    diff_archive.load_snapshot(str(root / "old"), Path("docs/items")),
+                    diff_archive.load_snapshot(str(root / "new"), Path("docs/items")),
+                )
+            )
+
+    @unittest.skipUnless(shutil.which("git"), "git is unavailable")
+    def test_reads_git_revisions(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            root = Path(temporary_directory)
+            items = root / "docs" / "items"
+
+            def commit(entries: dict[str, str]) -> None:
+                if items.exists():
+                    shutil.rmtree(items)
+                write_archive(items, entries)
+                for arguments in (["add", "-A"], ["commit", "-q", "-m", "snapshot"]):
+                    subprocess.run(
+                        ["git", "-c", "user.name=t", "-c", "user.email=t@e", *arguments],
+                        cwd=root,
+                        check=True,
+                        capture_output=True,
+                    )
+
+            subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+            commit(OLD)
+            commit(NEW)
+            self.check(
+                diff_archive.diff_snapshots(
+                    diff_archive.git_snapshot("HEAD~1", Path("docs/items"), root),
+                    diff_archive.git_snapshot("HEAD", Path("docs/items"), root),
+                )
+            )
+
+    def test_documents_without_digests_are_matched_by_file(self):
+        def entry(*documents):
+            return {"documents": [{"file": f, "title": t} for f, t in documents]}
+
+        old = entry(("documents/a.pdf", "A"), ("documents/b.pdf", "B"))
+        new = entry(("documents/a.pdf", "A"))
+        [entry_diff] = diff_archive.diff_snapshots({"acme": old}, {"acme": new})
+        self.assertEqual([d["file"] for d in entry_diff.removed], ["documents/b.pdf"])
+        self.assertEqual((entry_diff.added, entry_diff.edited), ([], []))
+
+        new = entry(("documents/a.pdf", "A"), ("documents/b.pdf", "B 2"))
+        new["documents"][0]["sha256"] = "a" * 64
+        [entry_diff] = diff_archive.diff_snapshots({"acme": old}, {"acme": new})
+        self.assertEqual((entry_diff.removed, entry_diff.replaced), ([], []))
+        self.assertEqual(
+            [changes for _, changes in entry_diff.edited],
+            [[("sha256", None, "a" * 64)], [("title", "B", "B 2")]],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import hashlib
+import sys
+import tempfile
+import unittest
+import zlib
+from pathlib import Path
+from unittest import mock
+
+
+SKILL_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SKILL_DIR / "scripts"))
+
+import find_duplicates
+
+
+MANUAL_TEXT = (
+    "Before first use remove all packaging and place the dehumidifier on a level "
+    "floor at least twenty inches from walls. Empty the water bucket whenever the "
+    "full indicator lights and clean the air filter every two weeks with warm water. "
+    "Do not operate the unit with a damaged cord or plug and unplug it before service."
+)
+
+
+def synthetic_pdf(text: str, producer: str) -> bytes:
+    content = zlib.compress(f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode())
+    return (
+        f"%PDF-1.4\n% {producer}\n1 0 obj\n"
+        f"<< /Length {len(content)} /Filter /FlateDecode >>\nstream\n".encode()
+        + content
+        + b"\nendstream\nendobj\n%%EOF\n"
+    )
+
+
+class FindDuplicatesTests(unittest.TestCase):
+    def document(self, root: Path, entry: str, text: str, producer: str):
+        path = root / entry / "documents" / f"{entry}-user-manual-en.pdf"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = synthetic_pdf(text, producer)
+        path.write_bytes(data)
+        return find_duplicates.ArchivedPdf(
+            entry,
+            f"documents/{path.name}",
+            path,
+            hashlib.sha256(data).hexdigest(),
+            "User Manual",
+        )
+
+    def test_reports_reoptimized_and_identical_copies_only(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            root = Path(temporary_directory)
+            original = self.document(root, "acme-1", MANUAL_TEXT, "printer A")
+            # Same text, different bytes, one extra trailing sentence.
+            reoptimized = self.document(
+                root, "acme-2", MANUAL_TEXT + " Keep this manual.", "optimizer B"
+            )
+            copy = self.document(root, "acme-3", MANUAL_TEXT, "printer A")
+            unrelated = self.document(
+                root,
+                "acme-4",
+                " ".join(f"unrelated word{number} text" for number in range(40)),
+                "printer A",
+            )
+            scan = self.document(root, "acme-5", "", "scanner")
+
+            matches, without_text = find_duplicates.find_duplicates(
+                [original, reoptimized, copy, unrelated, scan],
+                cache_dir=root / "cache",
+                jobs=2,
+            )
+
+            found = {
+                (match.left.entry, match.right.entry, match.kind) for match in matches
+            }
+            self.assertEqual(
+                found,
+                {
+                    ("acme-1", "acme-3", "identical"),
+                    ("acme-1", "acme-2", "near-duplicate"),
+                    ("acme-3", "acme-2", "near-duplicate"),
+                },
+            )
+            self.assertTrue(all(match.similarity >= 0.8 for match in matches))
+            self.assertEqual(without_text, [scan])
+            # Signatures, and the lack of one, are cached by content digest.
+            cached = list((root / "cache" / "minhash").rglob("*.json"))
+            self.assertEqual(len(cached), 4)
+
+            # The next run reads no text except that of the candidate pairs.
+            shingled = []
+            document_shingles = find_duplicates.document_shingles
+
+            def counting_shingles(document, cache_dir):
+                shingled.append(document.entry)
+                return document_shingles(document, cache_dir)
+
+            with mock.patch.object(
+                find_duplicates, "document_shingles", counting_shingles
+            ):
+                again, again_without_text = find_duplicates.find_duplicates(
+                    [original, reoptimized, copy, unrelated, scan],
+                    cache_dir=root / "cache",
+                )
+            self.assertEqual(again, matches)
+            self.assertEqual(again_without_text, [scan])
+            self.assertEqual(sorted(shingled), ["acme-1", "acme-2"])
+
+    def test_minhash_estimate_tracks_jaccard(self):
+        left = find_duplicates.shingles(MANUAL_TEXT)
+        right = find_duplicates.shingles(MANUAL_TEXT + " Keep this manual safe.")
+        estimate = sum(
+            a == b
+            for a, b in zip(find_duplicates.minhash(left), find_duplicates.minhash(right))
+        ) / find_duplicates.PERMUTATIONS
+        self.assertAlmostEqual(estimate, find_duplicates.jaccard(left, right), delta=0.15)
+
+
+if __name__ == "__main__":
+    unittest.main()
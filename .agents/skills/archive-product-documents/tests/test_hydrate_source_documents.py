@@ -0,0 +1,243 @@
+import contextlib
+import hashlib
+import io
+import re
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+SKILL_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SKILL_DIR / "scripts"))
+
+import hydrate_source_documents
+import validate_entry
+
+
+MANUAL_URL = "https://8.8.8.8/manual.pdf"
+SHEET_URL = "https://8.8.8.8/sheet.pdf"
+
+
+class FakeResponse(io.BytesIO):
+    def __init__(self, data: bytes, url: str):
+        super().__init__(data)
+        self._url = url
+        self.headers = {}
+
+    def geturl(self) -> str:
+        return self._url
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        self.close()
+
+
+class FakeOpener:
+    def __init__(self, bodies: dict[str, bytes]):
+        self.bodies = bodies
+        self.requested: list[str] = []
+
+    def open(self, request, timeout):
+        url = request.full_url
+        self.requested.append(url)
+        return FakeResponse(self.bodies[url], url)
+
+
+def source_document(title: str, document_type: str, url: str, data: bytes) -> list[str]:
+    return [
+        "[[source_documents]]",
+        f'title = "{title}"',
+        f'type = "{document_type}"',
+        "languages = ['en']",
+        f'source_url = "{url}"',
+        'source_type = "manufacturer"',
+        "retrieved = 2026-07-25",
+        f'sha256 = "{hashlib.sha256(data).hexdigest()}"',
+        f"bytes = {len(data)}",
+        "",
+    ]
+
+
+class HydrateSourceDocumentsTests(unittest.TestCase):
+    manual = b"%PDF-1.7\npublic manual"
+    sheet = b"%PDF-1.7\nspecification sheet"
+
+    def create_entry(self, root: Path) -> Path:
+        entry = root / "acme-123"
+        entry.mkdir()
+        (entry / "item.toml").write_text(
+            "\n".join(
+                [
+                    "schema_version = 1",
+                    'name = "Product"',
+                    'brand = "ACME"',
+                    'model = "123"',
+                    "",
+                    "# Archive status: sources recorded on 2026-07-25.",
+                    "# PDF binaries still need to be downloaded.",
+                    "",
+                    *source_document("User Manual", "user-manual", MANUAL_URL, self.manual),
+                    *source_document(
+                        "Spec Sheet", "specification-sheet", SHEET_URL, self.sheet
+                    ),
+                ]
+            )
+        )
+        (entry / "README.md").write_text(
+            "# ACME 123\n\n## Archive status\n\nPDF binaries were not committed.\n"
+        )
+        return entry
+
+    def hydrate(self, entry: Path, opener: FakeOpener) -> bool:
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(
+            io.StringIO()
+        ):
+            return hydrate_source_documents.hydrate_entries(
+                [entry], jobs=2, max_bytes=1024, timeout=1, opener=opener
+            )
+
+    def test_hydrates_and_promotes_to_valid_entry(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            entry = self.create_entry(Path(temporary_directory))
+            opener = FakeOpener({MANUAL_URL: self.manual, SHEET_URL: self.sheet})
+
+            self.assertTrue(self.hydrate(entry, opener))
+
+            metadata = (entry / "item.toml").read_text()
+            self.assertNotIn("source_documents", metadata)
+            self.assertNotIn("Archive status", metadata)
+            self.assertIn('file = "documents/acme-123-user-manual-en.pdf"', metadata)
+            self.assertEqual(validate_entry.validate_entry(entry).errors, [])
+
+            # A second run finds nothing left to download.
+            self.assertTrue(self.hydrate(entry, opener))
+            self.assertEqual(len(opener.requested), 2)
+
+    def test_digest_mismatch_leaves_entry_unpromoted(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            entry = self.create_entry(Path(temporary_directory))
+            original = (entry / "item.toml").read_text()
+            tampered = self.sheet.replace(b"sheet", b"shoot")
+            opener = FakeOpener({MANUAL_URL: self.manual, SHEET_URL: tampered})
+
+            self.assertFalse(self.hydrate(entry, opener))
+
+            self.assertEqual((entry / "item.toml").read_text(), original)
+            self.assertFalse(
+                (entry / "documents/acme-123-specification-sheet-en.pdf").exists()
+            )
+
+    def test_reruns_after_partial_failure_without_recorded_digests(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            entry = self.create_entry(Path(temporary_directory))
+            metadata_path = entry / "item.toml"
+            metadata_path.write_text(
+                re.sub(r"(?m)^(sha256|bytes) = .*\n", "", metadata_path.read_text())
+            )
+            manual = entry / "documents/acme-123-user-manual-en.pdf"
+            blocked = FakeOpener({MANUAL_URL: self.manual, SHEET_URL: b"<html>"})
+
+            self.assertFalse(self.hydrate(entry, blocked))
+            self.assertFalse(manual.exists())
+            self.assertIn("source_documents", metadata_path.read_text())
+
+            opener = FakeOpener({MANUAL_URL: self.manual, SHEET_URL: self.sheet})
+            self.assertTrue(self.hydrate(entry, opener))
+            self.assertEqual(manual.read_bytes(), self.manual)
+            self.assertEqual(validate_entry.validate_entry(entry).errors, [])
+
+    def test_oversized_stream_aborts_before_end(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            entry = self.create_entry(Path(temporary_directory))
+            opener = FakeOpener(
+                {MANUAL_URL: self.manual + b"\n" * 512, SHEET_URL: self.sheet}
+            )
+            self.assertFalse(self.hydrate(entry, opener))
+            self.assertFalse((entry / "documents/acme-123-user-manual-en.pdf").exists())
+
+    def test_replaces_source_only_readme_sections(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            entry = self.create_entry(Path(temporary_directory))
+            # Shaped like the source-only READMEs in docs/items.
+            (entry / "README.md").write_text(
+                "# ACME 123\n\n"
+                "Public-document source record for the **123**.\n\n"
+                "- **Brand:** ACME\n\n"
+                "## Verified public document sources\n\n"
+                "- **User Manual** (user-manual, en)\n"
+                f"  - Source: {MANUAL_URL}\n"
+                "- **Spec Sheet** (specification-sheet, en)\n"
+                f"  - Source: {SHEET_URL}\n\n"
+                "## Archive status\n\n"
+                "This entry records verified public sources only.\n"
+            )
+            opener = FakeOpener({MANUAL_URL: self.manual, SHEET_URL: self.sheet})
+
+            self.assertTrue(self.hydrate(entry, opener))
+
+            readme = (entry / "README.md").read_text()
+            self.assertNotIn("Verified public document sources", readme)
+            self.assertNotIn("Archive status", readme)
+            self.assertEqual(readme.count("## Documents"), 1)
+            self.assertEqual(readme.count(MANUAL_URL), 1)
+            self.assertIn("- **Brand:** ACME\n\n## Documents\n", readme)
+            self.assertTrue(readme.endswith("-->\n"))
+            self.assertEqual(validate_entry.validate_entry(entry).errors, [])
+
+    def test_keeps_hand_written_readme_it_cannot_adopt(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            entry = self.create_entry(Path(temporary_directory))
+            readme = "# ACME 123\n\n## Documents\n\nAsk the dealer for the manual.\n"
+            (entry / "README.md").write_text(readme)
+            opener = FakeOpener({MANUAL_URL: self.manual, SHEET_URL: self.sheet})
+
+            self.assertTrue(self.hydrate(entry, opener))
+            self.assertEqual((entry / "README.md").read_text(), readme)
+            self.assertNotIn("source_documents", (entry / "item.toml").read_text())
+
+    def test_failed_metadata_write_restores_readme(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            entry = self.create_entry(Path(temporary_directory))
+            readme = (entry / "README.md").read_text()
+            metadata = (entry / "item.toml").read_text()
+            write = hydrate_source_documents.write_if_changed
+
+            def failing_write(path: Path, text: str) -> bool:
+                if path.name == "item.toml":
+                    raise OSError("disk full")
+                return write(path, text)
+
+            opener = FakeOpener({MANUAL_URL: self.manual, SHEET_URL: self.sheet})
+            with mock.patch.object(
+                hydrate_source_documents, "write_if_changed", failing_write
+            ):
+                self.assertFalse(self.hydrate(entry, opener))
+            self.assertEqual((entry / "README.md").read_text(), readme)
+            self.assertEqual((entry / "item.toml").read_text(), metadata)
+
+    def test_rejects_ill_typed_expected_values(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            entry = self.create_entry(Path(temporary_directory))
+            metadata_path = entry / "item.toml"
+            metadata_path.write_text(
+                metadata_path.read_text().replace(
+                    f"bytes = {len(self.manual)}", f'bytes = "{len(self.manual)}"'
+                )
+            )
+            with self.assertRaisesRegex(
+                ValueError, r"source_documents\[0\]\.bytes must be a positive integer"
+            ):
+                hydrate_source_documents.pending_documents(
+                    entry, hydrate_source_documents.load_metadata(entry)
+                )
+            opener = FakeOpener({MANUAL_URL: self.manual, SHEET_URL: self.sheet})
+            self.assertFalse(self.hydrate(entry, opener))
+            self.assertEqual(opener.requested, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import contextlib
+import hashlib
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+SKILL_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SKILL_DIR / "scripts"))
+
+import download_pdf
+import import_pdf
+
+
+PDF_BYTES = b"%PDF-1.7\n" + b"manual page\n" * 1000 + b"%%EOF\n"
+URL = "https://example.com/manual.pdf"
+
+
+class ImportPdfTests(unittest.TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.temporary_directory.name)
+        self.source = self.root / "Downloads" / "Manual (1).pdf"
+        self.source.parent.mkdir()
+        self.source.write_bytes(PDF_BYTES)
+        self.output = (
+            self.root / "items" / "acme-1" / "documents" / "acme-1-user-manual-en.pdf"
+        )
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def test_every_placement_method_reports_the_same_metadata(self):
+        expected = hashlib.sha256(PDF_BYTES).hexdigest()
+        cases = {
+            "copy_file_range": {"_reflink": False},
+            "copy": {"_reflink": False, "_copy_file_range": False},
+        }
+        for method, disabled in cases.items():
+            with self.subTest(method=method):
+                patches = [
+                    mock.patch.object(import_pdf, name, return_value=value)
+                    for name, value in disabled.items()
+                ]
+                for patch in patches:
+                    patch.start()
+                self.output.unlink(missing_ok=True)
+                try:
+                    result, used = import_pdf.import_pdf(self.source, URL, self.output)
+                finally:
+                    for patch in patches:
+                        patch.stop()
+                self.assertEqual(used, method)
+                self.assertEqual(result.sha256, expected)
+                self.assertEqual(result.byte_count, len(PDF_BYTES))
+                self.assertEqual(result.resolved_url, URL)
+                self.assertEqual(result.pdf.sha256, expected)
+                self.assertEqual(result.pdf.version, "1.7")
+                self.assertEqual(self.output.read_bytes(), PDF_BYTES)
+                self.assertEqual(self.output.stat().st_mode & 0o777, 0o644)
+                self.assertEqual(list(self.output.parent.glob(".*")), [])
+
+    def test_hardlink_shares_the_original_inode(self):
+        with mock.patch.object(import_pdf, "_reflink", return_value=False):
+            _, used = import_pdf.import_pdf(self.source, URL, self.output, hardlink=True)
+        self.assertEqual(used, "hardlink")
+        self.assertTrue(self.output.samefile(self.source))
+
+    def test_rejects_non_pdf_and_mismatches_without_leaving_files(self):
+        self.source.write_bytes(b"<html>blocked</html>")
+        with self.assertRaisesRegex(ValueError, "PDF signature"):
+            import_pdf.import_pdf(self.source, URL, self.output)
+        self.source.write_bytes(PDF_BYTES)
+        with self.assertRaisesRegex(ValueError, "expected SHA-256"):
+            import_pdf.import_pdf(
+                self.source, URL, self.output, expected_sha256="0" * 64
+            )
+        with self.assertRaisesRegex(ValueError, "expected 1"):
+            import_pdf.import_pdf(self.source, URL, self.output, expected_bytes=1)
+        self.assertEqual(list(self.output.parent.iterdir()), [])
+
+    def test_reuses_identical_output_and_refuses_other_overwrites(self):
+        import_pdf.import_pdf(self.source, URL, self.output)
+        result, used = import_pdf.import_pdf(self.source, URL, self.output)
+        self.assertTrue(result.reused)
+        self.assertEqual(used, "existing")
+        self.assertEqual(result.pdf.byte_count, len(PDF_BYTES))
+
+        self.source.write_bytes(PDF_BYTES + b"% revised\n")
+        with self.assertRaises(FileExistsError):
+            import_pdf.import_pdf(self.source, URL, self.output)
+
+    def test_stores_imported_document_in_mirror(self):
+        mirror = download_pdf.LocalMirror(self.root / "mirror")
+        result, _ = import_pdf.import_pdf(self.source, URL, self.output, mirror=mirror)
+        found = mirror.lookup(URL)
+        self.assertIsNotNone(found)
+        self.assertEqual(found[1], result.sha256)
+
+    def test_mirror_failure_keeps_the_placed_file(self):
+        mirror = download_pdf.LocalMirror(self.root / "mirror")
+        with mock.patch.object(
+            download_pdf.LocalMirror, "store", side_effect=OSError("read-only")
+        ), contextlib.redirect_stderr(io.StringIO()) as stderr:
+            result, _ = import_pdf.import_pdf(self.source, URL, self.output, mirror=mirror)
+        self.assertFalse(result.reused)
+        self.assertEqual(self.output.read_bytes(), PDF_BYTES)
+        self.assertIn("could not store", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+SKILL_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SKILL_DIR / "scripts"))
+
+import pack_archive
+
+
+PDF_DATA = b"%PDF-1.7\n" + bytes(range(256)) * 64
+
+
+class PackArchiveTests(unittest.TestCase):
+    def make_archive(self, root: Path) -> Path:
+        items_root = root / "items"
+        entry = items_root / "acme-washer"
+        (entry / "documents").mkdir(parents=True)
+        (entry / "item.toml").write_text('name = "Washer"\n' * 50, encoding="utf-8")
+        (entry / "README.md").write_text("# Washer\n", encoding="utf-8")
+        (entry / "documents" / "acme-washer-user-manual-en.pdf").write_bytes(PDF_DATA)
+        (items_root / ".acme-dryer.1234").mkdir()
+        (items_root / ".acme-dryer.1234" / "item.toml").write_text("")
+        return items_root
+
+    def test_round_trips_single_members(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            root = Path(temporary_directory)
+            pack_path = root / "archive.pack"
+            members = pack_archive.create_pack(self.make_archive(root), pack_path)
+            self.assertEqual(
+                [member.path for member in members],
+                [
+                    "acme-washer/README.md",
+                    "acme-washer/documents/acme-washer-user-manual-en.pdf",
+                    "acme-washer/item.toml",
+                ],
+            )
+            with pack_archive.Pack(pack_path) as pack:
+                name = "acme-washer/documents/acme-washer-user-manual-en.pdf"
+                self.assertEqual(pack.member(name).method, "stored")
+                self.assertEqual(pack.member("acme-washer/item.toml").method, "deflate")
+                metadata = pack.read("acme-washer/item.toml")
+                self.assertEqual(metadata, b'name = "Washer"\n' * 50)
+                self.assertTrue(all(pack.verify(member) for member in pack.members))
+                target = pack.extract(name, root / "out")
+                self.assertEqual(target.read_bytes(), PDF_DATA)
+                with self.assertRaises(FileExistsError):
+                    pack.extract(name, root / "out")
+
+    def test_detects_damaged_member_and_trailer(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            root = Path(temporary_directory)
+            pack_path = root / "archive.pack"
+            pack_archive.create_pack(self.make_archive(root), pack_path)
+            name = "acme-washer/documents/acme-washer-user-manual-en.pdf"
+            with pack_archive.Pack(pack_path) as pack:
+                offset = pack.member(name).offset
+            data = bytearray(pack_path.read_bytes())
+            data[offset + 100] ^= 0xFF
+            pack_path.write_bytes(data)
+            with pack_archive.Pack(pack_path) as pack:
+                self.assertFalse(pack.verify(name))
+                self.assertTrue(pack.verify("acme-washer/README.md"))
+                with self.assertRaisesRegex(ValueError, "sha256"):
+                    pack.extract(name, root / "out")
+            self.assertFalse((root / "out" / name).exists())
+
+            pack_path.write_bytes(bytes(data[:-1]))
+            with self.assertRaisesRegex(ValueError, "damaged trailer"):
+                pack_archive.Pack(pack_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
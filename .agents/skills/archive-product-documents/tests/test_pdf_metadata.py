@@ -0,0 +1,105 @@
+import hashlib
+import sys
+import unittest
+from pathlib import Path
+
+
+SKILL_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SKILL_DIR / "scripts"))
+
+import pdf_metadata
+
+
+def synthetic_pdf(pages: int, title: bytes, padding: int = 0) -> bytes:
+    objects = [
+        b"1 0 obj\n<< /Type /Catalog /Pages 2 0 R >>\nendobj\n",
+        b"2 0 obj\n<< /Type /Pages /Count %d >>\nendobj\n" % pages,
+        b"3 0 obj\n<< /Title (Outline entry) /Parent 9 0 R >>\nendobj\n",
+        b"4 0 obj\n<< /Title " + title + b" /Producer (test) >>\nendobj\n",
+    ]
+    for number in range(pages):
+        objects.append(
+            b"%d 0 obj\n<< /Type /Page /Parent 2 0 R >>\nendobj\n" % (10 + number)
+            + b"% " + b"x" * padding + b"\n"
+        )
+    return (
+        b"%PDF-1.7\n"
+        + b"".join(objects)
+        + b"trailer\n<< /Root 1 0 R /Info 4 0 R >>\n%%EOF\n"
+    )
+
+
+def scan_in_chunks(data: bytes, size: int) -> pdf_metadata.PdfMetadata:
+    scanner = pdf_metadata.PdfScanner()
+    for start in range(0, len(data), size):
+        scanner.update(data[start : start + size])
+    return scanner.finish()
+
+
+class PdfMetadataTests(unittest.TestCase):
+    def test_reports_facts_independent_of_chunking(self):
+        data = synthetic_pdf(5, b"(Use \\(and\\) Care Guide)", padding=9000)
+        whole = scan_in_chunks(data, len(data))
+        self.assertEqual(whole.sha256, hashlib.sha256(data).hexdigest())
+        self.assertEqual(whole.byte_count, len(data))
+        self.assertEqual(whole.version, "1.7")
+        self.assertEqual(whole.pages, 5)
+        self.assertEqual(whole.title, "Use (and) Care Guide")
+        self.assertFalse(whole.linearized)
+        for size in (97, 4096, 20000):
+            with self.subTest(size=size):
+                self.assertEqual(scan_in_chunks(data, size), whole)
+
+    def test_decodes_utf16_hex_titles(self):
+        title = "Guía".encode("utf-16-be")
+        data = synthetic_pdf(1, b"<FEFF" + title.hex().upper().encode() + b">")
+        self.assertEqual(scan_in_chunks(data, 64).title, "Guía")
+
+    def test_linearization_counts_only_when_file_length_matches(self):
+        body = synthetic_pdf(2, b"(Manual)")
+
+        def linearized(declared_pages: int) -> bytes:
+            # /L holds the file length, which includes its own digits.
+            length = 0
+            while True:
+                header = b"%%PDF-1.7\n5 0 obj\n<< /Linearized 1 /L %d /N %d >>\n" % (
+                    length,
+                    declared_pages,
+                )
+                header += b"endobj\n"
+                data = header + body[len(b"%PDF-1.7\n") :]
+                if len(data) == length:
+                    return data
+                length = len(data)
+
+        data = linearized(7)
+        self.assertEqual(len(data), int(data.split(b"/L ")[1].split()[0]))
+        result = scan_in_chunks(data, 100)
+        self.assertTrue(result.linearized)
+        self.assertEqual(result.pages, 7)
+
+        updated = scan_in_chunks(data + b"% incremental update\n", 100)
+        self.assertFalse(updated.linearized)
+        self.assertEqual(updated.pages, 2)
+
+    def test_no_page_count_when_pages_may_be_compressed(self):
+        # Three pages, two of them inside an object stream the scanner cannot read.
+        data = synthetic_pdf(1, b"(Manual)").replace(b"/Count 1", b"/Count 3")
+        data = data.replace(
+            b"trailer",
+            b"20 0 obj\n<< /Type /ObjStm /N 2 /First 10 /Length 4 >>\nstream\n"
+            b"xxxx\nendstream\nendobj\ntrailer",
+        )
+        for size in (50, len(data)):
+            with self.subTest(size=size):
+                result = scan_in_chunks(data, size)
+                self.assertIsNone(result.pages)
+                self.assertFalse(result.pages_declared)
+                self.assertEqual(result.title, "Manual")
+
+    def test_missing_signature(self):
+        self.assertFalse(scan_in_chunks(b"<html>blocked</html>", 8).has_signature)
+
+
+if __name__ == "__main__":
+    unittest.main()
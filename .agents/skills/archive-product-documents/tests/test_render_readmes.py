@@ -0,0 +1,143 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+SKILL_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SKILL_DIR / "scripts"))
+
+import create_pending_entry
+import render_readmes
+import validate_entry
+
+
+DOCUMENT = "\n".join(
+    [
+        "[[documents]]",
+        'title = "User Manual"',
+        'type = "user-manual"',
+        'file = "documents/acme-123-user-manual-en.pdf"',
+        'languages = ["en"]',
+        'source_url = "https://8.8.8.8/manual.pdf"',
+        "",
+    ]
+)
+
+
+class RenderReadmesTests(unittest.TestCase):
+    def create_entry(self, root: Path, readme: str) -> Path:
+        entry = root / "acme-123"
+        entry.mkdir()
+        (entry / "item.toml").write_text(
+            'schema_version = 1\nname = "Product"\nbrand = "ACME"\nmodel = "123"\n\n'
+            + DOCUMENT
+        )
+        (entry / "README.md").write_text(readme)
+        return entry
+
+    def test_regenerates_marked_block_once(self):
+        skeleton = create_pending_entry.render_readme(
+            brand="ACME",
+            model="123",
+            name="Product",
+            manufacturer="ACME",
+            product_page="https://8.8.8.8/product",
+        )
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            entry = self.create_entry(
+                Path(temporary_directory), skeleton + "\n## Notes\n\nKept.\n"
+            )
+
+            [outcome] = render_readmes.render_entries([entry])
+            self.assertEqual(outcome.status, "updated")
+            readme = (entry / "README.md").read_text()
+            self.assertIn(
+                "documents/acme-123-user-manual-en.pdf",
+                validate_entry.readme_link_targets(readme),
+            )
+            self.assertNotIn("No documents have been archived yet", readme)
+            self.assertTrue(readme.endswith("## Notes\n\nKept.\n"))
+
+            modified = (entry / "README.md").stat().st_mtime_ns
+            [outcome] = render_readmes.render_entries([entry])
+            self.assertEqual(outcome.status, "unchanged")
+            self.assertEqual((entry / "README.md").stat().st_mtime_ns, modified)
+
+    def test_leaves_unmarked_readme_unless_adopted(self):
+        readme = (
+            "# Product\n\n## Archived documents\n\n"
+            "- [Manual](documents/acme-123-user-manual-en.pdf)  \n"
+            "  Source: https://8.8.8.8/manual.pdf\n"
+            "  SHA-256: `0123`\n\n"
+            "## Provenance\n\nKept.\n"
+        )
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            entry = self.create_entry(Path(temporary_directory), readme)
+
+            [outcome] = render_readmes.render_entries([entry])
+            self.assertEqual(outcome.status, "unmanaged")
+            self.assertEqual((entry / "README.md").read_text(), readme)
+
+            [outcome] = render_readmes.render_entries([entry], adopt=True, check=True)
+            self.assertEqual(outcome.status, "updated")
+            self.assertEqual((entry / "README.md").read_text(), readme)
+
+            render_readmes.render_entries([entry], adopt=True)
+            adopted = (entry / "README.md").read_text()
+            self.assertNotIn("Archived documents", adopted)
+            self.assertEqual(adopted.count("documents/acme-123-user-manual-en.pdf"), 1)
+            self.assertIn(
+                "## Documents\n\n" + create_pending_entry.DOCUMENTS_START, adopted
+            )
+            self.assertTrue(adopted.endswith("## Provenance\n\nKept.\n"))
+
+    def test_refuses_to_adopt_lists_with_unmapped_text(self):
+        cases = {
+            "notes": "- [Manual](documents/acme-123-user-manual-en.pdf)\n\nHand notes.\n",
+            "item": "- [Warranty card](documents/acme-123-warranty-en.pdf)\n",
+            "detail": (
+                "- [Manual](documents/acme-123-user-manual-en.pdf)\n"
+                "  — includes the limited warranty.\n"
+            ),
+            "heading": "### Manual\n\n- [PDF](documents/acme-123-user-manual-en.pdf)\n",
+        }
+        for name, section in cases.items():
+            with self.subTest(name), tempfile.TemporaryDirectory() as directory:
+                readme = f"# Product\n\n## Documents\n\n{section}"
+                entry = self.create_entry(Path(directory), readme)
+                [outcome] = render_readmes.render_entries([entry], adopt=True)
+                self.assertEqual(outcome.status, "refused")
+                self.assertEqual((entry / "README.md").read_text(), readme)
+
+    def test_lists_source_documents_not_yet_archived(self):
+        readme = (
+            "# Product\n\n## Verified public document sources\n\n"
+            "- **Spec Sheet** (specification-sheet, en)\n"
+            "  - Source: https://8.8.8.8/sheet.pdf\n"
+            "  - Bytes: 1024\n\n"
+            "## Archive status\n\nSources only.\n"
+        )
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            entry = self.create_entry(Path(temporary_directory), readme)
+            metadata_path = entry / "item.toml"
+            metadata_path.write_text(
+                metadata_path.read_text()
+                + "pages = 1\n\n[[source_documents]]\n"
+                + 'title = "Spec Sheet"\ntype = "specification-sheet"\n'
+                + 'source_url = "https://8.8.8.8/sheet.pdf"\npages = 2\n'
+            )
+            [outcome] = render_readmes.render_entries([entry], adopt=True)
+            self.assertEqual(outcome.status, "updated")
+            adopted = (entry / "README.md").read_text()
+            self.assertIn("— user-manual, en, 1 page  \n", adopted)
+            self.assertIn(
+                "- **Spec Sheet** — specification-sheet, 2 pages, not yet archived  \n"
+                "  Source: https://8.8.8.8/sheet.pdf\n",
+                adopted,
+            )
+            self.assertNotIn("Verified public document sources", adopted)
+            self.assertTrue(adopted.endswith("## Archive status\n\nSources only.\n"))
+
+if __name__ == "__main__":
+    unittest.main()
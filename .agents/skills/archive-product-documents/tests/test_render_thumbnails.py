@@ -0,0 +1,91 @@
+import hashlib
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+
+SKILL_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SKILL_DIR / "scripts"))
+
+import render_thumbnails
+from find_duplicates import ArchivedPdf
+
+
+class FakeRenderer:
+    def __init__(self):
+        self.rendered = []
+        self._lock = threading.Lock()
+
+    def __call__(self, pdf: Path, png: Path, width: int) -> None:
+        with self._lock:
+            self.rendered.append(pdf)
+        png.write_bytes(b"\x89PNG fake %d " % width + pdf.read_bytes()[-8:])
+
+
+class RenderThumbnailsTests(unittest.TestCase):
+    def document(self, items_root: Path, entry: str, data: bytes) -> ArchivedPdf:
+        relative_file = f"documents/{entry}-user-manual-en.pdf"
+        path = items_root / entry / relative_file
+        path.parent.mkdir(parents=True)
+        path.write_bytes(data)
+        (items_root / entry / "README.md").write_text(
+            f"# {entry}\n\n## Documents\n\n- [Manual]({relative_file})\n", encoding="utf-8"
+        )
+        return ArchivedPdf(
+            entry, relative_file, path, hashlib.sha256(data).hexdigest(), "User Manual"
+        )
+
+    def test_renders_each_digest_once_and_reuses_the_cache(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            root = Path(temporary_directory)
+            items_root = root / "items"
+            documents = [
+                self.document(items_root, "acme-washer", b"%PDF-1.7\nwasher"),
+                self.document(items_root, "acme-washer-plus", b"%PDF-1.7\nwasher"),
+                self.document(items_root, "acme-dryer", b"%PDF-1.7\ndryer"),
+            ]
+            renderer = FakeRenderer()
+            outcomes = render_thumbnails.render_thumbnails(
+                documents, root / "cache", 120, jobs=2, renderer=renderer
+            )
+            self.assertEqual(len(renderer.rendered), 2)
+            self.assertEqual({outcome.status for outcome in outcomes}, {"rendered"})
+            for document in documents:
+                thumbnail = (
+                    items_root / document.entry / "thumbnails"
+                    / f"{document.entry}-user-manual-en.png"
+                )
+                self.assertTrue(thumbnail.is_file())
+
+            outcomes = render_thumbnails.render_thumbnails(
+                documents, root / "cache", 120, jobs=2, renderer=renderer
+            )
+            self.assertEqual(len(renderer.rendered), 2)
+            self.assertEqual({outcome.status for outcome in outcomes}, {"cached"})
+
+    def test_links_thumbnails_from_readme_idempotently(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            items_root = Path(temporary_directory)
+            document = self.document(items_root, "acme-washer", b"%PDF-1.7\nwasher")
+            entry = items_root / "acme-washer"
+            stale = entry / "thumbnails" / "old-manual.png"
+            stale.parent.mkdir()
+            stale.write_bytes(b"stale")
+
+            self.assertTrue(render_thumbnails.link_entry(entry, [document]))
+            readme = (entry / "README.md").read_text(encoding="utf-8")
+            self.assertIn("## Previews", readme)
+            self.assertIn(
+                "[![User Manual (first page)](thumbnails/acme-washer-user-manual-en.png)]"
+                "(documents/acme-washer-user-manual-en.pdf)",
+                readme,
+            )
+            self.assertFalse(stale.exists())
+            self.assertFalse(render_thumbnails.link_entry(entry, [document]))
+            self.assertEqual(readme.count("## Previews"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
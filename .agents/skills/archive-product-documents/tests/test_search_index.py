@@ -0,0 +1,110 @@
+import hashlib
+import sys
+import tempfile
+import unittest
+import zlib
+from pathlib import Path
+
+
+SKILL_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SKILL_DIR / "scripts"))
+
+import pdf_text
+import search_index
+
+
+def synthetic_pdf(text: str) -> bytes:
+    content = zlib.compress(f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode())
+    header = f"%PDF-1.4\n1 0 obj\n<< /Length {len(content)} /Filter /FlateDecode >>\n"
+    return (
+        header.encode()
+        + b"stream\n"
+        + content
+        + b"\nendstream\nendobj\n%%EOF\n"
+    )
+
+
+class SearchIndexTests(unittest.TestCase):
+    def create_entry(
+        self, root: Path, text: str, name: str = "ACME 123 dehumidifier"
+    ) -> Path:
+        entry = root / "items" / "acme-123"
+        (entry / "documents").mkdir(parents=True, exist_ok=True)
+        relative_file = "documents/acme-123-user-manual-en.pdf"
+        data = synthetic_pdf(text)
+        (entry / relative_file).write_bytes(data)
+        (entry / "README.md").write_text("# ACME 123 dehumidifier\n")
+        (entry / "item.toml").write_text(
+            "\n".join(
+                [
+                    "schema_version = 1",
+                    f'name = "{name}"',
+                    'brand = "ACME"',
+                    'model = "AC-123"',
+                    "",
+                    "[[documents]]",
+                    'title = "User Manual"',
+                    'type = "user-manual"',
+                    f'file = "{relative_file}"',
+                    f'sha256 = "{hashlib.sha256(data).hexdigest()}"',
+                    "",
+                ]
+            )
+        )
+        return entry
+
+    def test_extracts_literal_text_from_flate_streams(self):
+        data = synthetic_pdf("Clean the filter \\(monthly\\)")
+        self.assertIn("Clean the filter (monthly)", pdf_text.extract_text_builtin(data))
+
+    def test_indexes_incrementally_and_finds_pdf_text(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            root = Path(temporary_directory)
+            self.create_entry(root, "Rinse the filter to keep cleaning effective")
+            connection = search_index.connect(root / "search.sqlite3")
+
+            def build():
+                return search_index.build_index(
+                    connection, root / "items", cache_dir=root / "cache", jobs=2
+                )
+
+            self.assertEqual(build()["indexed"], 3)
+            self.assertEqual(
+                build(), {"indexed": 0, "unchanged": 3, "removed": 0, "failed": 0}
+            )
+
+            rows = search_index.search(
+                connection, search_index.fts_query(["filter", "cleaning"])
+            )
+            self.assertEqual(
+                [row[1] for row in rows], ["documents/acme-123-user-manual-en.pdf"]
+            )
+            rows = search_index.search(connection, search_index.fts_query(["AC-123"]))
+            self.assertEqual(rows[0][1], "item.toml")
+
+            self.create_entry(root, "Empty the water tank daily")
+            self.assertEqual(build()["indexed"], 2)
+            self.assertEqual(
+                search_index.search(connection, search_index.fts_query(["filter"])), []
+            )
+
+            # Renaming changes no README bytes, but the README row shows the name;
+            # retitling changes no PDF bytes, but the PDF row shows the title.
+            self.create_entry(root, "Empty the water tank daily", name="ACME 123 Pro")
+            self.assertEqual(build()["indexed"], 2)
+            rows = search_index.search(connection, search_index.fts_query(["dehumidifier"]))
+            self.assertEqual(
+                [(row[1], row[2]) for row in rows], [("README.md", "ACME 123 Pro")]
+            )
+            entry = root / "items" / "acme-123"
+            metadata = (entry / "item.toml").read_text()
+            (entry / "item.toml").write_text(
+                metadata.replace('title = "User Manual"', 'title = "Use and Care Guide"')
+            )
+            self.assertEqual(build()["indexed"], 2)
+            rows = search_index.search(connection, search_index.fts_query(["tank"]))
+            self.assertEqual([row[2] for row in rows], ["Use and Care Guide"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+"""
+Axis-aligned box collision checks for garage-office layouts.
+
+Each layout element is a 3-D box ``(x0, y0, z0, x1, y1, z1)`` in inches whose
+coordinates may be scalars or NumPy arrays with one value per layout variant.
+A batch is checked in two phases:
+
+* broad phase: an AABB tree over each element's envelope (its extent across the
+  whole batch) finds the element pairs that could touch in *any* variant;
+* narrow phase: only those pairs are compared, vectorized over all variants.
+
+So a sweep of thousands of variants costs one tree query plus a few array
+operations per plausible pair, rather than a tree per variant.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+Box = Tuple[float, float, float, float, float, float]
+
+
+@dataclass(frozen=True)
+class Violation:
+    variant: int
+    rule: str
+    elements: Tuple[str, ...]
+    amount: float  # inches of overlap or shortfall
+
+    def as_dict(self) -> Dict:
+        return {
+            "variant": self.variant,
+            "rule": self.rule,
+            "elements": list(self.elements),
+            "amount": round(self.amount, 3),
+        }
+
+
+class _Node:
+    __slots__ = ("box", "key", "left", "right")
+
+    def __init__(self, box: Box, key: Optional[str] = None, left=None, right=None):
+        self.box = box
+        self.key = key
+        self.left = left
+        self.right = right
+
+
+def _union(a: Box, b: Box) -> Box:
+    return (
+        min(a[0], b[0]), min(a[1], b[1]), min(a[2], b[2]),
+        max(a[3], b[3]), max(a[4], b[4]), max(a[5], b[5]),
+    )
+
+
+def _intersects(a: Box, b: Box) -> bool:
+    return (
+        a[0] < b[3] and b[0] < a[3]
+        and a[1] < b[4] and b[1] < a[4]
+        and a[2] < b[5] and b[2] < a[5]
+    )
+
+
+class AABBTree:
+    """Static bounding-volume hierarchy built by median splits on the longest axis."""
+
+    def __init__(self, items: Iterable[Tuple[str, Box]]) -> None:
+        leaves = [_Node(box, key) for key, box in items]
+        self.root = self._build(leaves) if leaves else None
+
+    def _build(self, nodes: List[_Node]) -> _Node:
+        if len(nodes) == 1:
+            return nodes[0]
+        bounds = nodes[0].box
+        for node in nodes[1:]:
+            bounds = _union(bounds, node.box)
+        axis = max(range(3), key=lambda i: bounds[i + 3] - bounds[i])
+        nodes.sort(key=lambda node: node.box[axis] + node.box[axis + 3])
+        middle = len(nodes) // 2
+        left = self._build(nodes[:middle])
+        right = self._build(nodes[middle:])
+        return _Node(_union(left.box, right.box), left=left, right=right)
+
+    def query(self, box: Box) -> List[str]:
+        """Keys of every stored box that intersects ``box``."""
+        found: List[str] = []
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            if not _intersects(node.box, box):
+                continue
+            if node.key is not None:
+                found.append(node.key)
+            else:
+                stack.extend((node.left, node.right))
+        return found
+
+    def pairs(self) -> Set[Tuple[str, str]]:
+        """Every unordered pair of stored boxes that intersect."""
+        result: Set[Tuple[str, str]] = set()
+        stack = [self.root] if self.root else []
+        leaves: List[_Node] = []
+        while stack:
+            node = stack.pop()
+            if node.key is not None:
+                leaves.append(node)
+            else:
+                stack.extend((node.left, node.right))
+        for leaf in leaves:
+            for other in self.query(leaf.box):
+                if other != leaf.key:
+                    result.add(tuple(sorted((leaf.key, other))))
+        return result
+
+
+def _as_arrays(box: Sequence, count: int) -> List[np.ndarray]:
+    return [np.broadcast_to(np.asarray(value, dtype=float), (count,)) for value in box]
+
+
+def _envelope(box: List[np.ndarray]) -> Box:
+    return tuple(float(v.min()) for v in box[:3]) + tuple(float(v.max()) for v in box[3:])
+
+
+def penetration(a: List[np.ndarray], b: List[np.ndarray]) -> np.ndarray:
+    """Smallest per-axis overlap of two boxes per variant; > 0 means they intersect."""
+    return np.minimum.reduce(
+        [np.minimum(a[i + 3], b[i + 3]) - np.maximum(a[i], b[i]) for i in range(3)]
+    )
+
+
+def containment_shortfall(box: List[np.ndarray], container: List[np.ndarray]) -> np.ndarray:
+    """How far a box pokes out of its container per variant; > 0 means outside."""
+    return np.maximum.reduce(
+        [container[i] - box[i] for i in range(3)]
+        + [box[i + 3] - container[i + 3] for i in range(3)]
+    )
+
+
+def check_boxes(
+    boxes: Dict[str, Sequence],
+    container: Sequence,
+    count: int = 1,
+    allowed: Iterable[Tuple[str, str]] = (),
+    uncontained: Iterable[str] = (),
+    tolerance: float = 1e-9,
+) -> List[Violation]:
+    """Check ``count`` layout variants for overlaps and elements outside the room.
+
+    ``allowed`` lists element pairs that may intersect by design and
+    ``uncontained`` names elements that legitimately sit outside ``container``.
+    """
+    arrays = {name: _as_arrays(box, count) for name, box in boxes.items()}
+    room = _as_arrays(container, count)
+    violations: List[Violation] = []
+
+    skip_containment = set(uncontained)
+    for name, box in arrays.items():
+        if name in skip_containment:
+            continue
+        shortfall = containment_shortfall(box, room)
+        for variant in np.flatnonzero(shortfall > tolerance):
+            violations.append(
+                Violation(int(variant), "outside-room", (name,), float(shortfall[variant]))
+            )
+
+    tree = AABBTree((name, _envelope(box)) for name, box in arrays.items())
+    allowed_pairs = {tuple(sorted(pair)) for pair in allowed}
+    for first, second in sorted(tree.pairs() - allowed_pairs):
+        depth = penetration(arrays[first], arrays[second])
+        for variant in np.flatnonzero(depth > tolerance):
+            violations.append(
+                Violation(int(variant), "overlap", (first, second), float(depth[variant]))
+            )
+
+    violations.sort(key=lambda violation: (violation.variant, violation.rule, violation.elements))
+    return violations
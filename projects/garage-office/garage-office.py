@@ -4,23 +4,57 @@ Generate plan and elevation drawings for the garage office using layout metadata
 Examples:
     python3 projects/garage-office/garage-office.py
     python3 projects/garage-office/garage-office.py --config projects/garage-office/layout.yaml --no-show --output-dir projects/garage-office/renders
+
+With --no-show (and no explicit --backend) the drawings are built on bare
+matplotlib Figures with an Agg canvas instead of pyplot; pass --timings to see
+how long startup and rendering took.
+
+Batch exports (--no-show) render each view in its own worker process, write every
+format requested with --formats in the same pass, and skip views whose layout,
+formats and drawing code are unchanged since the last run (see --force).
+
+Sweep mode evaluates many layout variants in-process without touching the
+module globals, e.g.:
+    python3 projects/garage-office/garage-office.py --sweep desk.width=60:84:6 \
+        --sweep pocket_door.offset_from_right=1.5,3,6 --select 3 --output-dir /tmp/sweep
+writes a CSV of derived coordinates and clearance metrics and renders only the
+best --select candidates.
+
+Every run checks the layout boxes for overlaps and elements outside the room
+(see clearance.py); --check prints the violations as JSON instead of rendering.
 """
 
 from __future__ import annotations
 
 import argparse
+import copy
+import csv
+import hashlib
 import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Sequence, TextIO, Tuple
+
+_STARTED = time.perf_counter()  # before numpy and matplotlib, so --timings covers them
 
 import matplotlib
+import numpy as np
 
 try:
     import yaml  # type: ignore
 except ImportError:  # pragma: no cover
     yaml = None
 
-plt = None  # populated in configure_matplotlib
+from clearance import Violation, check_boxes
+
+plt = None  # populated in configure_matplotlib unless rendering headless
+Figure = None
+FigureCanvasAgg = None
+Rectangle = None
 
 STUD_D = 0.0
 STUD_W = 0.0
@@ -33,6 +67,23 @@ DESK_W = DESK_D = DESK_H = 0.0
 HVAC_W = HVAC_H = HVAC_PROJ_OFFICE = HVAC_PROJ_GARAGE = 0.0
 BOOKSHELF_W = BOOKSHELF_D = BOOKSHELF_H = 0.0
 PLATFORM_W = PLATFORM_D = PLATFORM_H = 0.0
+CIRCULATION_MIN = DOOR_APPROACH = HEADROOM = 0.0
+PARAM_NAMES = (
+    "STUD_D", "STUD_W", "EYE_H", "ROOM_W", "ROOM_D", "ROOM_H", "WALL_THK",
+    "POCKET_DOOR_CLEAR_W", "POCKET_DOOR_CLEAR_H", "POCKET_DOOR_OFFSET_FROM_RIGHT",
+    "WINDOW_W", "WINDOW_H", "WINDOW_AFF", "DESK_W", "DESK_D", "DESK_H",
+    "HVAC_W", "HVAC_H", "HVAC_PROJ_OFFICE", "HVAC_PROJ_GARAGE",
+    "BOOKSHELF_W", "BOOKSHELF_D", "BOOKSHELF_H", "PLATFORM_W", "PLATFORM_D", "PLATFORM_H",
+    "CIRCULATION_MIN", "DOOR_APPROACH", "HEADROOM",
+)
+DESK_TOP_THK = 1.2
+
+# Clearance defaults used when layout.yaml has no "clearances" section.
+DEFAULT_CLEARANCES = {"circulation": 30, "door_approach": 18, "headroom": 78}
+
+DPI = 300
+SUPPORTED_FORMATS = ("png", "svg", "pdf")
+MANIFEST_NAME = ".render-manifest.json"
 
 
 def load_config(path: Path) -> Dict:
@@ -46,82 +97,289 @@ def load_config(path: Path) -> Dict:
     return data
 
 
-def apply_config(cfg: Dict) -> None:
-    global STUD_D, STUD_W, EYE_H, ROOM_W, ROOM_D, ROOM_H, WALL_THK
-    global POCKET_DOOR_CLEAR_W, POCKET_DOOR_CLEAR_H, POCKET_DOOR_OFFSET_FROM_RIGHT
-    global WINDOW_W, WINDOW_H, WINDOW_AFF
-    global DESK_W, DESK_D, DESK_H
-    global HVAC_W, HVAC_H, HVAC_PROJ_OFFICE, HVAC_PROJ_GARAGE
-    global BOOKSHELF_W, BOOKSHELF_D, BOOKSHELF_H
-    global PLATFORM_W, PLATFORM_D, PLATFORM_H
-
-    STUD_D = cfg["stud"]["depth"]
-    STUD_W = cfg["stud"]["width"]
-    EYE_H = cfg["eye_height"]
-
-    ROOM_W = cfg["room"]["width"]
-    ROOM_D = cfg["room"]["depth"]
-    ROOM_H = cfg["room"]["height"]
-
-    WALL_THK = cfg["wall"]["thickness"]
-
-    POCKET_DOOR_CLEAR_W = cfg["pocket_door"]["clear_width"]
-    POCKET_DOOR_CLEAR_H = cfg["pocket_door"]["clear_height"]
-    POCKET_DOOR_OFFSET_FROM_RIGHT = cfg["pocket_door"]["offset_from_right"]
-
-    WINDOW_W = cfg["window"]["width"]
-    WINDOW_H = cfg["window"]["height"]
-    WINDOW_AFF = cfg["window"].get("sill_aff", ROOM_H - WINDOW_H - 24)
+def config_params(cfg: Dict) -> Dict:
+    """Map a layout config onto the dimension names used by the drawings.
+
+    Pure function: values may be scalars or NumPy arrays (one element per
+    variant), which is how sweeps evaluate many layouts at once.
+    """
+    room_h = cfg["room"]["height"]
+    window_h = cfg["window"]["height"]
+    clearances = {**DEFAULT_CLEARANCES, **cfg.get("clearances", {})}
+    return {
+        "STUD_D": cfg["stud"]["depth"],
+        "STUD_W": cfg["stud"]["width"],
+        "EYE_H": cfg["eye_height"],
+        "ROOM_W": cfg["room"]["width"],
+        "ROOM_D": cfg["room"]["depth"],
+        "ROOM_H": room_h,
+        "WALL_THK": cfg["wall"]["thickness"],
+        "POCKET_DOOR_CLEAR_W": cfg["pocket_door"]["clear_width"],
+        "POCKET_DOOR_CLEAR_H": cfg["pocket_door"]["clear_height"],
+        "POCKET_DOOR_OFFSET_FROM_RIGHT": cfg["pocket_door"]["offset_from_right"],
+        "WINDOW_W": cfg["window"]["width"],
+        "WINDOW_H": window_h,
+        "WINDOW_AFF": cfg["window"].get("sill_aff", room_h - window_h - 24),
+        "DESK_W": cfg["desk"]["width"],
+        "DESK_D": cfg["desk"]["depth"],
+        "DESK_H": cfg["desk"]["height"],
+        "HVAC_W": cfg["hvac"]["width"],
+        "HVAC_H": cfg["hvac"]["height"],
+        "HVAC_PROJ_OFFICE": cfg["hvac"]["proj_office"],
+        "HVAC_PROJ_GARAGE": cfg["hvac"]["proj_garage"],
+        "BOOKSHELF_W": cfg["bookshelf"]["width"],
+        "BOOKSHELF_D": cfg["bookshelf"]["depth"],
+        "BOOKSHELF_H": cfg["bookshelf"]["height"],
+        "PLATFORM_W": cfg["platform"]["width"],
+        "PLATFORM_D": cfg["platform"]["depth"],
+        "PLATFORM_H": cfg["platform"]["height_aff"],
+        "CIRCULATION_MIN": clearances["circulation"],
+        "DOOR_APPROACH": clearances["door_approach"],
+        "HEADROOM": clearances["headroom"],
+    }
 
-    DESK_W = cfg["desk"]["width"]
-    DESK_D = cfg["desk"]["depth"]
-    DESK_H = cfg["desk"]["height"]
 
-    HVAC_W = cfg["hvac"]["width"]
-    HVAC_H = cfg["hvac"]["height"]
-    HVAC_PROJ_OFFICE = cfg["hvac"]["proj_office"]
-    HVAC_PROJ_GARAGE = cfg["hvac"]["proj_garage"]
+def apply_config(cfg: Dict) -> None:
+    globals().update(config_params(cfg))
 
-    BOOKSHELF_W = cfg["bookshelf"]["width"]
-    BOOKSHELF_D = cfg["bookshelf"]["depth"]
-    BOOKSHELF_H = cfg["bookshelf"]["height"]
 
-    PLATFORM_W = cfg["platform"]["width"]
-    PLATFORM_D = cfg["platform"]["depth"]
-    PLATFORM_H = cfg["platform"]["height_aff"]
+def current_params() -> Dict:
+    return {name: globals()[name] for name in PARAM_NAMES}
 
 
-def layout_context() -> Dict:
-    """Derived coordinates shared by both drawings."""
-    pd_x0 = ROOM_W - POCKET_DOOR_CLEAR_W - POCKET_DOOR_OFFSET_FROM_RIGHT
-    pd_x1 = ROOM_W - POCKET_DOOR_OFFSET_FROM_RIGHT
-    pd_x2 = pd_x0 - POCKET_DOOR_CLEAR_W - POCKET_DOOR_OFFSET_FROM_RIGHT
-    win_x = (ROOM_W - WINDOW_W) / 2
+def derive_layout(p: Dict) -> Dict:
+    """Derived coordinates for the dimensions in ``p`` (scalars or arrays)."""
+    pd_x0 = p["ROOM_W"] - p["POCKET_DOOR_CLEAR_W"] - p["POCKET_DOOR_OFFSET_FROM_RIGHT"]
+    pd_x1 = p["ROOM_W"] - p["POCKET_DOOR_OFFSET_FROM_RIGHT"]
+    pd_x2 = pd_x0 - p["POCKET_DOOR_CLEAR_W"] - p["POCKET_DOOR_OFFSET_FROM_RIGHT"]
+    win_x = (p["ROOM_W"] - p["WINDOW_W"]) / 2
     plat_x = 0
     ctx = {
         "pd_x0": pd_x0,
         "pd_x1": pd_x1,
         "pd_x2": pd_x2,
-        "pd_y": WALL_THK / 2,
+        "pd_y": p["WALL_THK"] / 2,
         "win_x": win_x,
         "desk_x": 0,
-        "desk_y": WALL_THK,
-        "bs_x": ROOM_W - BOOKSHELF_W,
-        "bs_y": ROOM_D - BOOKSHELF_D,
+        "desk_y": p["WALL_THK"],
+        "bs_x": p["ROOM_W"] - p["BOOKSHELF_W"],
+        "bs_y": p["ROOM_D"] - p["BOOKSHELF_D"],
         "plat_x": plat_x,
-        "plat_stud_x": plat_x + (PLATFORM_W - STUD_D * 2),
-        "hvac_x": pd_x2 - HVAC_W - STUD_D,
+        "plat_stud_x": plat_x + (p["PLATFORM_W"] - p["STUD_D"] * 2),
+        "hvac_x": pd_x2 - p["HVAC_W"] - p["STUD_D"],
         "hvac_y": 0,
-        "plat_z": PLATFORM_H + STUD_W,
+        "plat_z": p["PLATFORM_H"] + p["STUD_W"],
     }
-    ctx["hvac_face_z"] = DESK_H - HVAC_H - HVAC_H / 2
+    ctx["hvac_face_z"] = p["DESK_H"] - p["HVAC_H"] - p["HVAC_H"] / 2
     return ctx
 
 
+def layout_context() -> Dict:
+    """Derived coordinates shared by both drawings."""
+    return derive_layout(current_params())
+
+
+def clearance_metrics(p: Dict, ctx: Dict) -> Dict:
+    """Clear distances in inches between layout elements; negative means a clash."""
+    metrics = {
+        # Walkway between the desk front and the bookshelf wall.
+        "circulation": p["ROOM_D"] - (ctx["desk_y"] + p["DESK_D"]),
+        # Desk end to the pocket door opening; negative blocks the doorway.
+        "desk_to_door": ctx["pd_x0"] - (ctx["desk_x"] + p["DESK_W"]),
+        # The door pocket has to fit inside the new wall.
+        "pocket_to_wall_end": ctx["pd_x2"],
+        "hvac_to_pocket": ctx["pd_x2"] - (ctx["hvac_x"] + p["HVAC_W"]),
+        "hvac_to_floor": ctx["hvac_face_z"],
+        "hvac_to_desktop": p["DESK_H"] - (ctx["hvac_face_z"] + p["HVAC_H"]),
+        "platform_over_eye_line": ctx["plat_z"] - p["EYE_H"],
+        "platform_to_ceiling": p["ROOM_H"] - (ctx["plat_z"] + p["STUD_W"]),
+    }
+    metrics["min_clearance"] = np.minimum.reduce(np.broadcast_arrays(*metrics.values()))
+    return metrics
+
+
+def layout_boxes(p: Dict, ctx: Dict) -> Dict[str, Tuple]:
+    """3-D boxes (x0, y0, z0, x1, y1, z1) for solid elements and keep-clear zones.
+
+    x runs along the new wall, y into the room from it, z up from the floor.
+    """
+    desk_front = ctx["desk_y"] + p["DESK_D"]
+    return {
+        "desk_top": (
+            ctx["desk_x"], ctx["desk_y"], p["DESK_H"],
+            ctx["desk_x"] + p["DESK_W"], desk_front, p["DESK_H"] + DESK_TOP_THK,
+        ),
+        "bookshelf": (
+            ctx["bs_x"], ctx["bs_y"], 0,
+            ctx["bs_x"] + p["BOOKSHELF_W"], ctx["bs_y"] + p["BOOKSHELF_D"], p["BOOKSHELF_H"],
+        ),
+        "hvac_outlet": (
+            ctx["hvac_x"], ctx["hvac_y"], ctx["hvac_face_z"],
+            ctx["hvac_x"] + p["HVAC_W"], ctx["hvac_y"] + p["HVAC_PROJ_OFFICE"],
+            ctx["hvac_face_z"] + p["HVAC_H"],
+        ),
+        # The slab the door slides into inside the new wall.
+        "door_pocket": (
+            ctx["pd_x2"], 0, 0, ctx["pd_x0"], p["WALL_THK"], p["POCKET_DOOR_CLEAR_H"],
+        ),
+        # Door opening plus the floor space needed to walk through it.
+        "doorway": (
+            ctx["pd_x0"], 0, 0,
+            ctx["pd_x1"], p["WALL_THK"] + p["DOOR_APPROACH"], p["POCKET_DOOR_CLEAR_H"],
+        ),
+        # Walkway in front of the desk, with standing headroom.
+        "walkway": (
+            ctx["desk_x"], desk_front, 0,
+            ctx["desk_x"] + p["DESK_W"], desk_front + p["CIRCULATION_MIN"], p["HEADROOM"],
+        ),
+        "platform": (
+            ctx["plat_x"], 0, ctx["plat_z"],
+            ctx["plat_x"] + p["PLATFORM_W"], p["PLATFORM_D"], ctx["plat_z"] + p["STUD_W"],
+        ),
+        # Window opening on the far wall, one inch deep into the room.
+        "window": (
+            ctx["win_x"], p["ROOM_D"] - 1, p["WINDOW_AFF"],
+            ctx["win_x"] + p["WINDOW_W"], p["ROOM_D"], p["WINDOW_AFF"] + p["WINDOW_H"],
+        ),
+    }
+
+
+# Keep-clear zones may share space with each other, just not with solids.
+ALLOWED_OVERLAPS = (("doorway", "walkway"),)
+
+
+def check_layout(p: Dict, ctx: Dict, count: int = 1) -> List[Violation]:
+    """Check one layout, or ``count`` sweep variants held as arrays."""
+    room = (0, 0, 0, p["ROOM_W"], p["ROOM_D"], p["ROOM_H"])
+    return check_boxes(layout_boxes(p, ctx), room, count, allowed=ALLOWED_OVERLAPS)
+
+
+def _describe(violation: Violation) -> str:
+    if violation.rule == "outside-room":
+        return f"{violation.elements[0]} extends {violation.amount:g}\" outside the room"
+    first, second = violation.elements
+    return f"{first} overlaps {second} by {violation.amount:g}\""
+
+
+def print_violations(violations: Sequence[Violation], as_json: bool) -> None:
+    if as_json:
+        json.dump([violation.as_dict() for violation in violations], sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return
+    for violation in violations:
+        print(f"warning: {_describe(violation)}", file=sys.stderr)
+
+
+def _parse_sweep(value: str) -> Tuple[Tuple[str, ...], np.ndarray]:
+    """Parse ``section.key=start:stop:step`` (inclusive) or ``section.key=a,b,c``."""
+    path, sep, spec = value.partition("=")
+    if not sep or not path or not spec:
+        raise argparse.ArgumentTypeError("sweep must look like desk.width=60:84:6")
+    try:
+        if ":" in spec:
+            start, stop, step = (float(part) for part in spec.split(":"))
+            if step <= 0:
+                raise ValueError
+            values = np.arange(start, stop + step / 2, step)
+        else:
+            values = np.array([float(part) for part in spec.split(",")])
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(f"invalid sweep range: {spec}") from error
+    return tuple(path.split(".")), values
+
+
+def _set_path(cfg: Dict, keys: Sequence[str], value) -> None:
+    node = cfg
+    for key in keys[:-1]:
+        node = node[key]
+    if keys[-1] not in node:
+        raise SystemExit(f"Unknown layout parameter: {'.'.join(keys)}")
+    node[keys[-1]] = value
+
+
+def sweep_layouts(
+    cfg: Dict, sweeps: Sequence[Tuple[Tuple[str, ...], np.ndarray]]
+) -> Tuple[Dict[str, np.ndarray], List[Violation]]:
+    """Evaluate every combination of the swept values in one vectorized pass.
+
+    Returns a column table (name -> 1-D array) of swept inputs, derived layout
+    coordinates and clearance metrics, one row per variant, and the clearance
+    violations of every variant.
+    """
+    grids = np.meshgrid(*(values for _, values in sweeps), indexing="ij")
+    variants = copy.deepcopy(cfg)
+    table: Dict[str, np.ndarray] = {}
+    for (keys, _), grid in zip(sweeps, grids):
+        column = grid.ravel()
+        _set_path(variants, keys, column)
+        table[".".join(keys)] = column
+    count = grids[0].size if grids else 1
+
+    params = config_params(variants)
+    ctx = derive_layout(params)
+    for name, value in {**ctx, **clearance_metrics(params, ctx)}.items():
+        table[name] = np.broadcast_to(np.asarray(value, dtype=float), (count,))
+    violations = check_layout(params, ctx, count)
+    table["violations"] = np.bincount(
+        [violation.variant for violation in violations], minlength=count
+    )
+    return table, violations
+
+
+def write_sweep_table(table: Dict[str, np.ndarray], handle: TextIO) -> None:
+    writer = csv.writer(handle)
+    writer.writerow(["variant", *table])
+    columns = list(table.values())
+    for index in range(len(columns[0])):
+        writer.writerow([index, *(f"{column[index]:g}" for column in columns)])
+
+
+def variant_config(
+    cfg: Dict, sweeps: Sequence[Tuple[Tuple[str, ...], np.ndarray]], table: Dict, index: int
+) -> Dict:
+    variant = copy.deepcopy(cfg)
+    for keys, _ in sweeps:
+        _set_path(variant, keys, float(table[".".join(keys)][index]))
+    return variant
+
+
+def run_sweep(cfg: Dict, args: argparse.Namespace) -> int:
+    """Write the sweep table and render the best variants; return the exit status."""
+    table, violations = sweep_layouts(cfg, args.sweep)
+    if args.rank_by not in table:
+        raise SystemExit(f"Unknown --rank-by column: {args.rank_by}")
+    if args.sweep_output:
+        with args.sweep_output.open("w", newline="", encoding="utf-8") as handle:
+            write_sweep_table(table, handle)
+        print(f"Saved {len(table[args.rank_by])} variants to {args.sweep_output}")
+    elif not args.check:
+        write_sweep_table(table, sys.stdout)
+    if args.check:
+        print_violations(violations, as_json=True)
+        return 1 if violations else 0
+
+    # Violation-free variants first, then the highest value: a larger
+    # clearance is the better layout.
+    ranked = np.lexsort((-table[args.rank_by], table["violations"]))[: args.select]
+    for index in ranked:
+        variant_dir = args.output_dir / "sweep" / f"variant-{index:05d}"
+        print(
+            f"Rendering variant {index} ({args.rank_by}={table[args.rank_by][index]:g}, "
+            f"violations={table['violations'][index]})"
+        )
+        render_views(
+            variant_config(cfg, args.sweep, table, index),
+            variant_dir,
+            args.formats,
+            backend=args.backend,
+            jobs=args.jobs,
+            force=args.force,
+        )
+    return 0
+
+
 def build_top_down(ctx: Dict):
-    global plt
-    assert plt is not None
-    fig, ax = plt.subplots(figsize=(ROOM_W / 12, ROOM_D / 12))
+    fig, ax = _new_figure(figsize=(ROOM_W / 12, ROOM_D / 12))
 
     ax.plot([0, ROOM_W, ROOM_W, 0, 0], [0, 0, ROOM_D, ROOM_D, 0], 'k-', lw=2)
 
@@ -135,28 +393,28 @@ def build_top_down(ctx: Dict):
     ax.text(ctx["win_x"] + WINDOW_W / 2, ROOM_D - 3,
             f"Window {WINDOW_W}\"", ha='center', va='top', fontsize=8)
 
-    ax.add_patch(plt.Rectangle((ctx["desk_x"], ctx["desk_y"]), DESK_W, DESK_D, fill=False, ec='y'))
+    ax.add_patch(Rectangle((ctx["desk_x"], ctx["desk_y"]), DESK_W, DESK_D, fill=False, ec='y'))
     ax.text(ctx["desk_x"] + DESK_W / 2, ctx["desk_y"] + DESK_D / 2,
             f"Desk {DESK_W}\"×{DESK_D}\"", ha='center', va='center', fontsize=8)
 
-    ax.add_patch(plt.Rectangle((ctx["bs_x"], ctx["bs_y"]), BOOKSHELF_W, BOOKSHELF_D, fill=False, ec='y'))
+    ax.add_patch(Rectangle((ctx["bs_x"], ctx["bs_y"]), BOOKSHELF_W, BOOKSHELF_D, fill=False, ec='y'))
     ax.text(ctx["bs_x"] + BOOKSHELF_W / 2, ctx["bs_y"] + BOOKSHELF_D / 2,
             f"Bookshelf {BOOKSHELF_W}\"×{BOOKSHELF_D}\"", ha='center', va='center', fontsize=7)
 
-    ax.add_patch(plt.Rectangle((ctx["plat_stud_x"], 0), STUD_D, PLATFORM_D, fill=False, ec='k'))
+    ax.add_patch(Rectangle((ctx["plat_stud_x"], 0), STUD_D, PLATFORM_D, fill=False, ec='k'))
     ax.text(ctx["plat_stud_x"] / 2, ROOM_D * 2 / 3,
             f"Overhead Platform \n {PLATFORM_W}\"×{PLATFORM_D}\"",
             ha='center', va='center', fontsize=8)
 
-    ax.add_patch(plt.Rectangle((ctx["hvac_x"], ctx["hvac_y"]), HVAC_W, HVAC_PROJ_OFFICE, fill=False, ec='m', ls=':'))
+    ax.add_patch(Rectangle((ctx["hvac_x"], ctx["hvac_y"]), HVAC_W, HVAC_PROJ_OFFICE, fill=False, ec='m', ls=':'))
     ax.text(ctx["hvac_x"] + HVAC_W / 2, ctx["hvac_y"] + HVAC_PROJ_OFFICE / 2,
             "HVAC (outlet)", ha='center', va='center', fontsize=7)
 
-    ax.add_patch(plt.Rectangle((ctx["hvac_x"], -HVAC_PROJ_GARAGE), HVAC_W, HVAC_PROJ_GARAGE, fill=False, ec='m', ls='-'))
+    ax.add_patch(Rectangle((ctx["hvac_x"], -HVAC_PROJ_GARAGE), HVAC_W, HVAC_PROJ_GARAGE, fill=False, ec='m', ls='-'))
     ax.text(ctx["hvac_x"] + HVAC_W / 2, -HVAC_PROJ_GARAGE / 2,
             "HVAC (condenser)", ha='center', va='center', fontsize=7)
 
-    ax.add_patch(plt.Rectangle((0, 0), ROOM_W, WALL_THK, fill=False, ec='k'))
+    ax.add_patch(Rectangle((0, 0), ROOM_W, WALL_THK, fill=False, ec='k'))
     ax.text(PLATFORM_W / 2, WALL_THK / 2, f"New Wall {WALL_THK}\"", ha='center', va='center', fontsize=7)
 
     ax.annotate('', xy=(0, -8), xytext=(ROOM_W, -8), arrowprops=dict(arrowstyle='<->'))
@@ -173,18 +431,16 @@ def build_top_down(ctx: Dict):
 
 
 def build_front_elevation(ctx: Dict):
-    global plt
-    assert plt is not None
-    fig, ax2 = plt.subplots(figsize=(ROOM_W / 12, ROOM_H / 12))
+    fig, ax2 = _new_figure(figsize=(ROOM_W / 12, ROOM_H / 12))
     ax2.plot([0, ROOM_W, ROOM_W, 0, 0], [0, 0, ROOM_H, ROOM_H, 0], 'k-', lw=2)
 
-    ax2.add_patch(plt.Rectangle((ctx["pd_x0"], 0), POCKET_DOOR_CLEAR_W, POCKET_DOOR_CLEAR_H, fill=False, ec='c'))
-    ax2.add_patch(plt.Rectangle((ctx["pd_x2"], 0), POCKET_DOOR_CLEAR_W, POCKET_DOOR_CLEAR_H, fill=False, ec='c', ls=':'))
+    ax2.add_patch(Rectangle((ctx["pd_x0"], 0), POCKET_DOOR_CLEAR_W, POCKET_DOOR_CLEAR_H, fill=False, ec='c'))
+    ax2.add_patch(Rectangle((ctx["pd_x2"], 0), POCKET_DOOR_CLEAR_W, POCKET_DOOR_CLEAR_H, fill=False, ec='c', ls=':'))
     ax2.text(ctx["pd_x0"] + POCKET_DOOR_CLEAR_W / 2, POCKET_DOOR_CLEAR_H + 2,
              f"Pocket Door {POCKET_DOOR_CLEAR_W}\"×{POCKET_DOOR_CLEAR_H}\"",
              ha='center', va='bottom', fontsize=8)
 
-    ax2.add_patch(plt.Rectangle((ctx["desk_x"], DESK_H), DESK_W, 1.2, fill=True, ec='y'))
+    ax2.add_patch(Rectangle((ctx["desk_x"], DESK_H), DESK_W, DESK_TOP_THK, fill=True, ec='y'))
     ax2.text(ctx["desk_x"] + DESK_W / 2, DESK_H + 3,
              f"Desk height {DESK_H}\"", ha='center', va='bottom', fontsize=8)
 
@@ -192,11 +448,11 @@ def build_front_elevation(ctx: Dict):
     hvac_face_w = HVAC_W
     hvac_face_x = ctx["hvac_x"]
     hvac_face_z = ctx["hvac_face_z"]
-    ax2.add_patch(plt.Rectangle((hvac_face_x, hvac_face_z), hvac_face_w, hvac_face_h, fill=False, ec='m'))
+    ax2.add_patch(Rectangle((hvac_face_x, hvac_face_z), hvac_face_w, hvac_face_h, fill=False, ec='m'))
     ax2.text(hvac_face_x + hvac_face_w / 2, hvac_face_z + hvac_face_h / 2,
              'HVAC grille', ha='center', va='center', fontsize=8)
 
-    ax2.add_patch(plt.Rectangle((ctx["plat_x"], ctx["plat_z"]), PLATFORM_W, STUD_W, fill=True, ec='k'))
+    ax2.add_patch(Rectangle((ctx["plat_x"], ctx["plat_z"]), PLATFORM_W, STUD_W, fill=True, ec='k'))
     ax2.text(ctx["plat_x"] + PLATFORM_W / 2, ctx["plat_z"] + STUD_W * 1.5,
              f"Overhead platform \n {PLATFORM_W}\"×{PLATFORM_D}\" @ >{PLATFORM_H}\" AFF",
              ha='center', va='bottom', fontsize=8)
@@ -204,11 +460,11 @@ def build_front_elevation(ctx: Dict):
     ax2.hlines(EYE_H, 0, ROOM_W, colors='k', linestyles='dashed')
     ax2.text(ROOM_W - 5, EYE_H, f"{EYE_H}\" eye line", ha='right', va='bottom', fontsize=8)
 
-    ax2.add_patch(plt.Rectangle((ctx["win_x"], WINDOW_AFF), WINDOW_W, WINDOW_H, fill=False, ec='c'))
+    ax2.add_patch(Rectangle((ctx["win_x"], WINDOW_AFF), WINDOW_W, WINDOW_H, fill=False, ec='c'))
     ax2.text(ctx["win_x"] + WINDOW_W / 2, WINDOW_AFF + WINDOW_H + 2,
              f"Faux Window {WINDOW_W}\"×{WINDOW_H}\"", ha='center', va='bottom', fontsize=8)
 
-    ax2.add_patch(plt.Rectangle((ctx["bs_x"], 0), BOOKSHELF_W, BOOKSHELF_H, fill=False, ec='y'))
+    ax2.add_patch(Rectangle((ctx["bs_x"], 0), BOOKSHELF_W, BOOKSHELF_H, fill=False, ec='y'))
     ax2.text(ctx["bs_x"] + BOOKSHELF_W / 2, ctx["bs_y"] + BOOKSHELF_H / 2,
              f"Bookshelf {BOOKSHELF_W}\"×{BOOKSHELF_H}\"", ha='center', va='center', fontsize=7)
 
@@ -220,15 +476,41 @@ def build_front_elevation(ctx: Dict):
 
 
 def configure_matplotlib(backend: str | None, headless: bool) -> None:
+    """Prepare matplotlib, importing pyplot only when a GUI or custom backend is needed.
+
+    Headless runs without an explicit backend draw on bare Figures with an Agg
+    canvas, which skips pyplot's backend setup and keeps no global figure state.
+    """
+    global plt, Figure, FigureCanvasAgg, Rectangle
+    from matplotlib.patches import Rectangle as _Rectangle
+
+    Rectangle = _Rectangle
+    if headless and not backend:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg as _FigureCanvasAgg
+        from matplotlib.figure import Figure as _Figure
+
+        plt = None
+        Figure = _Figure
+        FigureCanvasAgg = _FigureCanvasAgg
+        return
+
     desired = backend or ("Agg" if headless else None)
     if desired:
         matplotlib.use(desired, force=True)
-    global plt
     import matplotlib.pyplot as _plt
 
     plt = _plt
 
 
+def _new_figure(figsize: Tuple[float, float]):
+    if plt is not None:
+        return plt.subplots(figsize=figsize)
+    assert Figure is not None and FigureCanvasAgg is not None
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig, fig.subplots()
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument(
@@ -252,37 +534,215 @@ def parse_args() -> argparse.Namespace:
         "--backend",
         help="Matplotlib backend to force (defaults to Agg when --no-show).",
     )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Report startup and render time on stderr.",
+    )
+    parser.add_argument(
+        "--formats",
+        type=_parse_formats,
+        default=("png",),
+        help="Comma-separated output formats from png, svg, pdf (default: png).",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Worker processes for --no-show exports (default: one per view).",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-render every view even when its inputs are unchanged.",
+    )
+    parser.add_argument(
+        "--sweep",
+        action="append",
+        type=_parse_sweep,
+        metavar="PARAM=RANGE",
+        help=(
+            "Sweep a layout value, e.g. desk.width=60:84:6 (inclusive) or "
+            "platform.height_aff=72,76,80. Repeat to sweep several values."
+        ),
+    )
+    parser.add_argument(
+        "--sweep-output",
+        type=Path,
+        help="Write the sweep table to this CSV file (default: stdout).",
+    )
+    parser.add_argument(
+        "--select",
+        type=int,
+        default=0,
+        help="Render the N best sweep variants into OUTPUT_DIR/sweep/ (default: 0).",
+    )
+    parser.add_argument(
+        "--rank-by",
+        default="min_clearance",
+        help="Sweep column used to pick --select candidates (default: min_clearance).",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Print clearance violations as JSON and exit 1 if any, without rendering.",
+    )
     return parser.parse_args()
 
 
-def save_figures(figs: Dict[str, 'plt.Figure'], output_dir: Path, show: bool) -> None:
+def _parse_formats(value: str) -> Tuple[str, ...]:
+    parts = (part.strip().lower() for part in value.split(","))
+    formats = tuple(dict.fromkeys(part for part in parts if part))
+    unknown = [fmt for fmt in formats if fmt not in SUPPORTED_FORMATS]
+    if not formats or unknown:
+        raise argparse.ArgumentTypeError(
+            f"formats must be chosen from {', '.join(SUPPORTED_FORMATS)}"
+        )
+    return formats
+
+
+VIEWS = {
+    "garage_office_top_down": build_top_down,
+    "garage_office_front_elevation": build_front_elevation,
+}
+
+
+def save_figures(
+    figs: Dict[str, 'Figure'],
+    output_dir: Path,
+    show: bool,
+    formats: Sequence[str] = ("png",),
+) -> None:
     output_dir.mkdir(parents=True, exist_ok=True)
     for name, fig in figs.items():
-        output_path = output_dir / f"{name}.png"
-        fig.savefig(output_path, dpi=300, bbox_inches='tight')
-        if not show:
+        for fmt in formats:
+            output_path = output_dir / f"{name}.{fmt}"
+            fig.savefig(output_path, dpi=DPI, bbox_inches='tight')
+            print(f"Saved {output_path}")
+        if plt is not None and not show:
             plt.close(fig)
-        print(f"Saved {output_path}")
-    if show:
+    if plt is not None and show:
         plt.show()
 
 
+def view_fingerprint(cfg: Dict, name: str, formats: Sequence[str]) -> str:
+    """Hash everything a rendered view depends on: layout, view, formats and code."""
+    digest = hashlib.sha256()
+    digest.update(Path(__file__).read_bytes())
+    digest.update(json.dumps(cfg, sort_keys=True).encode("utf-8"))
+    digest.update(
+        json.dumps([name, sorted(formats), DPI, matplotlib.__version__]).encode("utf-8")
+    )
+    return digest.hexdigest()
+
+
+def _load_manifest(output_dir: Path) -> Dict[str, str]:
+    try:
+        data = json.loads((output_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_manifest(output_dir: Path, manifest: Dict[str, str]) -> None:
+    with tempfile.NamedTemporaryFile(
+        "w", dir=output_dir, prefix=f"{MANIFEST_NAME}.", delete=False, encoding="utf-8"
+    ) as handle:
+        json.dump(manifest, handle, indent=2, sort_keys=True)
+        handle.write("\n")
+    os.replace(handle.name, output_dir / MANIFEST_NAME)
+
+
+def _render_view(
+    cfg: Dict, name: str, output_dir: Path, formats: Sequence[str], backend: str | None
+) -> List[Path]:
+    """Build and save one view. Runs in a worker process with its own globals."""
+    apply_config(cfg)
+    configure_matplotlib(backend, headless=True)
+    fig = VIEWS[name](layout_context())
+    paths = []
+    for fmt in formats:
+        path = output_dir / f"{name}.{fmt}"
+        fig.savefig(path, dpi=DPI, bbox_inches='tight')
+        paths.append(path)
+    if plt is not None:
+        plt.close(fig)
+    return paths
+
+
+def render_views(
+    cfg: Dict,
+    output_dir: Path,
+    formats: Sequence[str],
+    backend: str | None = None,
+    jobs: int | None = None,
+    force: bool = False,
+) -> None:
+    """Render stale views in parallel worker processes, one view per process."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = _load_manifest(output_dir)
+    pending = {}
+    for name in VIEWS:
+        fingerprint = view_fingerprint(cfg, name, formats)
+        outputs_exist = all((output_dir / f"{name}.{fmt}").is_file() for fmt in formats)
+        if not force and outputs_exist and manifest.get(name) == fingerprint:
+            print(f"Unchanged {name}; skipped")
+            continue
+        pending[name] = fingerprint
+
+    if not pending:
+        return
+    workers = max(1, min(jobs or len(pending), len(pending)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            name: pool.submit(_render_view, cfg, name, output_dir, formats, backend)
+            for name in pending
+        }
+        for name, future in futures.items():
+            for path in future.result():
+                print(f"Saved {path}")
+            manifest[name] = pending[name]
+    _write_manifest(output_dir, manifest)
+
+
 def main() -> None:
     args = parse_args()
     cfg = load_config(args.config)
+    if args.sweep:
+        raise SystemExit(run_sweep(cfg, args))
     apply_config(cfg)
-    configure_matplotlib(args.backend, args.no_show)
-    ctx = layout_context()
-    top_fig = build_top_down(ctx)
-    elevation_fig = build_front_elevation(ctx)
-    save_figures(
-        {
-            "garage_office_top_down": top_fig,
-            "garage_office_front_elevation": elevation_fig,
-        },
-        args.output_dir,
-        show=not args.no_show,
-    )
+    violations = check_layout(current_params(), layout_context())
+    if args.check:
+        print_violations(violations, as_json=True)
+        raise SystemExit(1 if violations else 0)
+    print_violations(violations, as_json=False)
+    if args.no_show:
+        ready = time.perf_counter()
+        render_views(
+            cfg,
+            args.output_dir,
+            args.formats,
+            backend=args.backend,
+            jobs=args.jobs,
+            force=args.force,
+        )
+    else:
+        configure_matplotlib(args.backend, args.no_show)
+        ready = time.perf_counter()
+        ctx = layout_context()
+        save_figures(
+            {name: build(ctx) for name, build in VIEWS.items()},
+            args.output_dir,
+            show=True,
+            formats=args.formats,
+        )
+    if args.timings:
+        finished = time.perf_counter()
+        print(
+            f"startup {ready - _STARTED:.3f}s, render {finished - ready:.3f}s, "
+            f"total {finished - _STARTED:.3f}s",
+            file=sys.stderr,
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,65 @@
+import random
+import sys
+import unittest
+from itertools import combinations
+from pathlib import Path
+
+import numpy as np
+
+
+GARAGE_OFFICE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(GARAGE_OFFICE_DIR))
+
+from clearance import AABBTree, check_boxes
+
+
+def random_box(rng: random.Random):
+    origin = [rng.uniform(0, 100) for _ in range(3)]
+    size = [rng.uniform(1, 15) for _ in range(3)]
+    return tuple(origin) + tuple(o + s for o, s in zip(origin, size))
+
+
+def touches(a, b) -> bool:
+    return all(a[i] < b[i + 3] and b[i] < a[i + 3] for i in range(3))
+
+
+class ClearanceTests(unittest.TestCase):
+    def test_tree_pairs_match_brute_force(self):
+        for seed in range(5):
+            with self.subTest(seed=seed):
+                rng = random.Random(seed)
+                boxes = {f"box{index}": random_box(rng) for index in range(60)}
+                expected = {
+                    tuple(sorted((first, second)))
+                    for first, second in combinations(boxes, 2)
+                    if touches(boxes[first], boxes[second])
+                }
+                self.assertTrue(expected)
+                self.assertEqual(AABBTree(boxes.items()).pairs(), expected)
+
+    def test_checks_every_variant(self):
+        room = (0, 0, 0, 100, 100, 100)
+        # Variant 0: clear. Variant 1: the desk reaches the shelf. Variant 2: the
+        # desk also leaves the room.
+        desk_x1 = np.array([40.0, 55.0, 105.0])
+        boxes = {
+            "desk": (10, 10, 0, desk_x1, 40, 30),
+            "shelf": (50, 10, 0, 60, 40, 80),
+            "door": (0, 50, 0, 5, 80, 80),
+            "walkway": (0, 50, 0, 30, 80, 1),
+        }
+        violations = check_boxes(boxes, room, count=3, allowed=[("walkway", "door")])
+        found = [(v.variant, v.rule, v.elements) for v in violations]
+        self.assertEqual(
+            found,
+            [
+                (1, "overlap", ("desk", "shelf")),
+                (2, "outside-room", ("desk",)),
+                (2, "overlap", ("desk", "shelf")),
+            ],
+        )
+        self.assertAlmostEqual(violations[0].amount, 5.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,351 @@
+"""
+Query the garden inventory in garden/plants.toml and garden/soil-amendment.toml.
+
+Run:
+    python3 projects/gardens/inventory.py plants --status active --kind edible-perennial
+    python3 projects/gardens/inventory.py plants --location north-side --kind 'edible-*'
+    python3 projects/gardens/inventory.py amendments --status in-stock
+    python3 projects/gardens/inventory.py summary
+
+Both files are parsed once into slotted records with per-field indexes (id,
+kind, status, location for plants; id, status, form, unit for amendments).
+Filters are answered by intersecting index postings, so a query touches only
+the matching records. Values may be shell-style patterns (``edible-*``), which
+are expanded against the distinct index keys rather than every record.
+
+The parsed inventory is pickled under .cache/gardens/, keyed by a hash of both
+TOML files and this script, so repeat queries skip TOML parsing entirely.
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import pickle
+import sys
+import tempfile
+import time
+import tomllib
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+GARDEN_DIR = REPO_ROOT / "garden"
+DEFAULT_PLANTS = GARDEN_DIR / "plants.toml"
+DEFAULT_AMENDMENTS = GARDEN_DIR / "soil-amendment.toml"
+DEFAULT_CACHE_DIR = REPO_ROOT / ".cache" / "gardens"
+
+PLANT_INDEXES = ("kind", "status", "location")
+AMENDMENT_INDEXES = ("status", "form", "unit")
+
+
+@dataclass(frozen=True, slots=True)
+class Plant:
+    id: str
+    name: str
+    kind: str
+    status: str
+    location: str
+    aliases: Tuple[str, ...] = ()
+    container: Optional[str] = None
+    notes: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class Amendment:
+    id: str
+    name: str
+    quantity: float
+    unit: str
+    form: str
+    status: str
+    label_alias: Optional[str] = None
+    npk_label: Optional[str] = None
+    product_url: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class Table:
+    """Records of one kind plus ``{field: {value: (row, ...)}}`` postings."""
+
+    records: Tuple
+    by_id: Dict[str, int]
+    indexes: Dict[str, Dict[str, Tuple[int, ...]]]
+
+    def get(self, record_id: str):
+        row = self.by_id.get(record_id)
+        return None if row is None else self.records[row]
+
+    def select(
+        self, filters: Mapping[str, Sequence[str]], ids: Sequence[str] = ()
+    ) -> List:
+        """Records matching every field filter; values within one field are ORed.
+
+        ``ids`` further limits the result to those exact ids, looked up in ``by_id``.
+        """
+        rows: Optional[set] = None
+        if ids:
+            rows = {self.by_id[record_id] for record_id in ids if record_id in self.by_id}
+            if not rows:
+                return []
+        for field_name, patterns in filters.items():
+            if not patterns:
+                continue
+            postings = self.indexes[field_name]
+            matched: set = set()
+            for pattern in patterns:
+                for key in _expand(pattern, postings):
+                    matched.update(postings[key])
+            rows = matched if rows is None else rows & matched
+            if not rows:
+                return []
+        if rows is None:
+            return list(self.records)
+        return [self.records[row] for row in sorted(rows)]
+
+    def counts(self, field_name: str) -> List[Tuple[str, int]]:
+        return sorted(
+            ((key, len(rows)) for key, rows in self.indexes[field_name].items()),
+            key=lambda item: (-item[1], item[0]),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Inventory:
+    plants: Table
+    amendments: Table
+    updated: Dict[str, str] = field(default_factory=dict)
+
+
+def _expand(pattern: str, postings: Mapping[str, Tuple[int, ...]]) -> Iterable[str]:
+    if not any(character in pattern for character in "*?["):
+        return (pattern,) if pattern in postings else ()
+    return fnmatch.filter(postings, pattern)
+
+
+def _build_table(records: Sequence, index_fields: Sequence[str]) -> Table:
+    by_id: Dict[str, int] = {}
+    postings: Dict[str, Dict[str, List[int]]] = {name: {} for name in index_fields}
+    for row, record in enumerate(records):
+        if record.id in by_id:
+            raise ValueError(f"duplicate id: {record.id}")
+        by_id[record.id] = row
+        for name in index_fields:
+            postings[name].setdefault(getattr(record, name), []).append(row)
+    indexes = {
+        name: {key: tuple(rows) for key, rows in values.items()}
+        for name, values in postings.items()
+    }
+    return Table(tuple(records), by_id, indexes)
+
+
+def _record(cls, table: str, position: int, data: dict):
+    label = f"{table}[{position}]"
+    if not isinstance(data, dict):
+        raise ValueError(f"{label} must be a table")
+    known = {name for name in cls.__dataclass_fields__}
+    unknown = sorted(set(data) - known)
+    if unknown:
+        raise ValueError(f"{label} has unknown fields: {', '.join(unknown)}")
+    values = dict(data)
+    if "aliases" in values:
+        values["aliases"] = tuple(values["aliases"])
+    if "quantity" in values:
+        values["quantity"] = float(values["quantity"])
+    try:
+        return cls(**values)
+    except TypeError as error:
+        raise ValueError(f"{label} ({data.get('id', '?')}): {error}") from None
+
+
+def parse_inventory(plants_text: str, amendments_text: str) -> Inventory:
+    plants_data = tomllib.loads(plants_text)
+    amendments_data = tomllib.loads(amendments_text)
+    plants = [
+        _record(Plant, "plants", position, data)
+        for position, data in enumerate(plants_data.get("plants", []))
+    ]
+    amendments = [
+        _record(Amendment, "amendments", position, data)
+        for position, data in enumerate(amendments_data.get("amendments", []))
+    ]
+    updated = {
+        name: str(data["updated"])
+        for name, data in (("plants", plants_data), ("amendments", amendments_data))
+        if "updated" in data
+    }
+    return Inventory(
+        _build_table(plants, PLANT_INDEXES),
+        _build_table(amendments, AMENDMENT_INDEXES),
+        updated,
+    )
+
+
+def inventory_fingerprint(plants_bytes: bytes, amendments_bytes: bytes) -> str:
+    """Hash the inventory sources and this script, which defines the pickled types."""
+    digest = hashlib.sha256()
+    for chunk in (Path(__file__).read_bytes(), plants_bytes, amendments_bytes):
+        digest.update(len(chunk).to_bytes(8, "little"))
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_inventory(
+    plants_path: Path = DEFAULT_PLANTS,
+    amendments_path: Path = DEFAULT_AMENDMENTS,
+    cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+) -> Inventory:
+    """Parse both files, reusing the pickled inventory when neither has changed."""
+    plants_bytes = plants_path.read_bytes()
+    amendments_bytes = amendments_path.read_bytes()
+    if cache_dir is None:
+        return parse_inventory(
+            plants_bytes.decode("utf-8"), amendments_bytes.decode("utf-8")
+        )
+
+    fingerprint = inventory_fingerprint(plants_bytes, amendments_bytes)
+    cache_path = cache_dir / "inventory.pickle"
+    try:
+        with cache_path.open("rb") as handle:
+            cached_fingerprint, inventory = pickle.load(handle)
+        if cached_fingerprint == fingerprint:
+            return inventory
+    except (
+        OSError, EOFError, pickle.UnpicklingError, AttributeError, TypeError, ValueError
+    ):
+        pass  # missing or unreadable cache
+
+    inventory = parse_inventory(
+        plants_bytes.decode("utf-8"), amendments_bytes.decode("utf-8")
+    )
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "wb", dir=cache_dir, prefix="inventory.pickle.", delete=False
+        ) as handle:
+            pickle.dump((fingerprint, inventory), handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(handle.name, cache_path)
+    except OSError as error:
+        print(f"warning: could not cache inventory: {error}", file=sys.stderr)
+    return inventory
+
+
+def _print_records(records: Sequence, columns: Sequence[str], as_json: bool) -> None:
+    if as_json:
+        json.dump([asdict(record) for record in records], sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return
+    rows = [
+        [str(getattr(record, column) or "") for column in columns] for record in records
+    ]
+    widths = [
+        max([len(column)] + [len(row[index]) for row in rows])
+        for index, column in enumerate(columns)
+    ]
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)).rstrip())
+    for row in rows:
+        print("  ".join(value.ljust(width) for value, width in zip(row, widths)).rstrip())
+
+
+def _print_summary(inventory: Inventory) -> None:
+    for title, table, fields in (
+        ("plants", inventory.plants, PLANT_INDEXES),
+        ("amendments", inventory.amendments, AMENDMENT_INDEXES),
+    ):
+        updated = inventory.updated.get(title)
+        suffix = f" (updated {updated})" if updated else ""
+        print(f"{title}: {len(table.records)}{suffix}")
+        for field_name in fields:
+            counts = ", ".join(f"{key}={count}" for key, count in table.counts(field_name))
+            print(f"  {field_name}: {counts}")
+
+
+def parse_args() -> argparse.Namespace:
+    timings_help = "Report load and query time on stderr."
+    parser = argparse.ArgumentParser(
+        description="Query the garden plant and amendment inventory."
+    )
+    parser.add_argument("--timings", action="store_true", help=timings_help)
+    # Every subcommand also accepts --timings. SUPPRESS keeps a subcommand from
+    # resetting the flag when it was given before the subcommand name.
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "--timings", action="store_true", default=argparse.SUPPRESS, help=timings_help
+    )
+    parser.add_argument("--plants-file", type=Path, default=DEFAULT_PLANTS)
+    parser.add_argument("--amendments-file", type=Path, default=DEFAULT_AMENDMENTS)
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help="Where the parsed inventory is cached (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Always re-parse the TOML files."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    plants = commands.add_parser(
+        "plants", parents=[common], help="List plants matching every filter."
+    )
+    for name in PLANT_INDEXES:
+        plants.add_argument(f"--{name}", action="append", default=[], metavar="VALUE")
+    amendments = commands.add_parser(
+        "amendments", parents=[common], help="List amendments matching every filter."
+    )
+    for name in AMENDMENT_INDEXES:
+        amendments.add_argument(f"--{name}", action="append", default=[], metavar="VALUE")
+    for subparser in (plants, amendments):
+        subparser.add_argument("--id", action="append", default=[], help="Exact record id.")
+        subparser.add_argument("--json", action="store_true", help="Print records as JSON.")
+    commands.add_parser(
+        "summary", parents=[common], help="Count records per indexed value."
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    started = time.perf_counter()
+    try:
+        inventory = load_inventory(
+            args.plants_file,
+            args.amendments_file,
+            None if args.no_cache else args.cache_dir,
+        )
+    except (OSError, ValueError, tomllib.TOMLDecodeError) as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+    loaded = time.perf_counter()
+
+    if args.command == "summary":
+        _print_summary(inventory)
+        matched = None
+    else:
+        if args.command == "plants":
+            table, fields = inventory.plants, PLANT_INDEXES
+            columns = ("id", "name", "kind", "status", "location")
+        else:
+            table, fields = inventory.amendments, AMENDMENT_INDEXES
+            columns = ("id", "name", "quantity", "unit", "form", "status")
+        records = table.select({name: getattr(args, name) for name in fields}, args.id)
+        matched = len(records)
+        _print_records(records, columns, args.json)
+
+    if args.timings:
+        finished = time.perf_counter()
+        counted = "" if matched is None else f", {matched} matched"
+        print(
+            f"load {(loaded - started) * 1000:.2f}ms, "
+            f"query {(finished - loaded) * 1000:.2f}ms{counted}",
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
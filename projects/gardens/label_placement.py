@@ -0,0 +1,189 @@
+"""
+Greedy collision-avoiding placement for map labels.
+
+Labels are axis-aligned boxes in data coordinates. Each label starts at its hint
+box (the position implied by its manual ``label_offset``) and is only moved when
+that box overlaps a label placed earlier or an obstacle such as a plant marker,
+or crosses the optional map bounds. Candidate shifts are tried nearest-first, so
+a hint that is clear and inside the bounds is always kept.
+
+A uniform grid hashes every placed box into the cells it covers, so each
+candidate is only compared with its neighbours instead of every label on the map.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+Box = Tuple[float, float, float, float]  # x0, y0, x1, y1
+
+
+class SpatialGrid:
+    """Uniform-grid spatial hash over axis-aligned boxes."""
+
+    def __init__(self, cell_size: float) -> None:
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = cell_size
+        self.boxes: List[Box] = []
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+
+    def _cell_range(self, box: Box) -> Iterable[Tuple[int, int]]:
+        x0, y0, x1, y1 = box
+        size = self.cell_size
+        for i in range(math.floor(x0 / size), math.floor(x1 / size) + 1):
+            for j in range(math.floor(y0 / size), math.floor(y1 / size) + 1):
+                yield i, j
+
+    def insert(self, box: Box) -> int:
+        index = len(self.boxes)
+        self.boxes.append(box)
+        for cell in self._cell_range(box):
+            self._cells.setdefault(cell, []).append(index)
+        return index
+
+    def move(self, index: int, box: Box) -> None:
+        for cell in self._cell_range(self.boxes[index]):
+            self._cells[cell].remove(index)
+        self.boxes[index] = box
+        for cell in self._cell_range(box):
+            self._cells.setdefault(cell, []).append(index)
+
+    def query(self, box: Box) -> Set[int]:
+        found: Set[int] = set()
+        for cell in self._cell_range(box):
+            found.update(self._cells.get(cell, ()))
+        return found
+
+    def overlap_area(self, box: Box, skip: int = -1, limit: float = math.inf) -> float:
+        """Total overlap with stored boxes, stopping early once ``limit`` is reached."""
+        total = 0.0
+        for index in self.query(box):
+            if index != skip:
+                total += _overlap(box, self.boxes[index])
+                if total >= limit:
+                    break
+        return total
+
+
+def _overlap(a: Box, b: Box) -> float:
+    width = min(a[2], b[2]) - max(a[0], b[0])
+    height = min(a[3], b[3]) - max(a[1], b[1])
+    if width <= 0 or height <= 0:
+        return 0.0
+    return width * height
+
+
+def _shift(box: Box, dx: float, dy: float) -> Box:
+    return box[0] + dx, box[1] + dy, box[2] + dx, box[3] + dy
+
+
+def _candidate_boxes(
+    hint: Box, anchor: Tuple[float, float], max_rings: int
+) -> Iterable[Box]:
+    """Yield the hint box, then the eight compass positions around the anchor.
+
+    Every ring nudges the same nine candidates a further half label height
+    away in each of eight directions, so small moves are always tried first.
+    """
+    width = hint[2] - hint[0]
+    height = hint[3] - hint[1]
+    ax, ay = anchor
+    # Keep the same gap between anchor and label that the hint uses.
+    gap = max(hint[0] - ax, ax - hint[2], hint[1] - ay, ay - hint[3], height / 4)
+    xs = {"w": ax - gap - width, "c": ax - width / 2, "e": ax + gap}
+    ys = {"s": ay - gap - height, "c": ay - height / 2, "n": ay + gap}
+    bases = [hint] + [
+        (xs[h], ys[v], xs[h] + width, ys[v] + height)
+        for h, v in (
+            ("e", "n"), ("w", "n"), ("e", "s"), ("w", "s"),
+            ("c", "n"), ("c", "s"), ("e", "c"), ("w", "c"),
+        )
+    ]
+    for ring in range(max_rings + 1):
+        step = ring * height / 2
+        nudges = [(0.0, 0.0)] if ring == 0 else [
+            (0.0, step), (0.0, -step), (step, 0.0), (-step, 0.0),
+            (step, step), (-step, step), (step, -step), (-step, -step),
+        ]
+        for dx, dy in nudges:
+            for base in bases:
+                yield _shift(base, dx, dy)
+
+
+def _outside(box: Box, bounds: Optional[Box]) -> bool:
+    if bounds is None:
+        return False
+    return (
+        box[0] < bounds[0] or box[1] < bounds[1] or box[2] > bounds[2] or box[3] > bounds[3]
+    )
+
+
+def place_labels(
+    labels: Sequence[Box],
+    anchors: Sequence[Tuple[float, float]],
+    obstacles: Sequence[Box] = (),
+    bounds: Optional[Box] = None,
+    max_rings: int = 8,
+    repair_passes: int = 2,
+) -> List[Tuple[float, float]]:
+    """Return a ``(dx, dy)`` shift per label hint box, in the order given.
+
+    ``anchors`` holds the point each label describes (a plant pin or a section
+    centre). Labels earlier in ``labels`` win conflicts in the first greedy
+    pass, so callers should list the most important labels first. Each repair
+    pass then re-places every label that still collides, this time against all
+    other labels. When no candidate is collision-free the candidate with the
+    least overlap is used, preferring the earliest tried.
+    """
+    if not labels:
+        return []
+
+    sizes = sorted(max(box[2] - box[0], box[3] - box[1]) for box in labels)
+    cell_size = max(sizes[len(sizes) // 2], 1e-6)
+    placed = SpatialGrid(cell_size)
+    blocked = SpatialGrid(cell_size)
+    for obstacle in obstacles:
+        blocked.insert(obstacle)
+
+    def best_candidate(index: int) -> Tuple[Box, float]:
+        best = placed.boxes[index] if index < len(placed.boxes) else labels[index]
+        best_cost = math.inf
+        for candidate in _candidate_boxes(labels[index], anchors[index], max_rings):
+            if _outside(candidate, bounds):
+                continue
+            cost = blocked.overlap_area(candidate, limit=best_cost)
+            if cost < best_cost:
+                cost += placed.overlap_area(candidate, skip=index, limit=best_cost - cost)
+            if cost < best_cost:
+                best, best_cost = candidate, cost
+                if cost == 0:
+                    break
+        return best, best_cost
+
+    costs: List[float] = []
+    for index in range(len(labels)):
+        box, cost = best_candidate(index)
+        placed.insert(box)
+        costs.append(cost)
+
+    for _ in range(repair_passes):
+        improved = False
+        for index, cost in enumerate(costs):
+            if cost == 0:
+                continue
+            current = placed.overlap_area(placed.boxes[index], skip=index)
+            current += blocked.overlap_area(placed.boxes[index])
+            box, cost = best_candidate(index)
+            if cost < current:
+                placed.move(index, box)
+                improved = True
+            costs[index] = min(cost, current)
+        if not improved:
+            break
+
+    return [
+        (box[0] - label[0], box[1] - label[1])
+        for box, label in zip(placed.boxes, labels)
+    ]
@@ -5,16 +5,22 @@ Run:
     python3 projects/gardens/map_sections.py
 
 The script saves garden_map.png next to itself and displays the plot unless
---no-show is passed.
+--no-show is passed. With --no-show (and no explicit --backend) the map is drawn
+on a bare matplotlib Figure with an Agg canvas, skipping pyplot entirely; pass
+--timings to see how long startup and rendering took.
 """
 
 from __future__ import annotations
 
 import argparse
+import json
+import sys
+import time
 from pathlib import Path
 from typing import Iterable, List, Sequence, Tuple
 
-import json
+_STARTED = time.perf_counter()  # before matplotlib, so --timings covers its import
+
 import matplotlib
 
 try:
@@ -22,8 +28,12 @@ try:
 except ImportError:  # pragma: no cover
     yaml = None
 
+from label_placement import Box, place_labels
 
-plt = None  # populated in configure_matplotlib
+
+plt = None  # populated in configure_matplotlib unless rendering headless
+Figure = None
+FigureCanvasAgg = None
 Polygon = None
 Rectangle = None
 
@@ -53,7 +63,7 @@ def _section_center(points: Iterable[Tuple[float, float]]) -> Tuple[float, float
     return sum(xs) / len(xs), sum(ys) / len(ys)
 
 
-def _draw_section(ax, section: dict) -> None:
+def _draw_section(ax, section: dict):
     global Polygon, Rectangle
     assert Rectangle is not None and Polygon is not None
     if section["kind"] == "rect":
@@ -86,7 +96,7 @@ def _draw_section(ax, section: dict) -> None:
     label = section["name"]
     if section.get("note"):
         label += f"\n{section['note']}"
-    ax.text(
+    return ax.text(
         cx + dx,
         cy + dy,
         label,
@@ -97,35 +107,74 @@ def _draw_section(ax, section: dict) -> None:
     )
 
 
-def _draw_plants(ax, plants: Sequence[dict]) -> None:
+def _draw_plants(ax, plants: Sequence[dict]) -> list:
     if not plants:
-        return
+        return []
+    positions = [plant["position"] for plant in plants]
+    ax.scatter(
+        [x for x, _ in positions],
+        [y for _, y in positions],
+        s=25,
+        c="#2d3142",
+        marker="o",
+        edgecolors="white",
+        linewidths=0.5,
+        zorder=5,
+    )
+    texts = []
     for plant in plants:
         x, y = plant["position"]
-        ax.scatter(
-            x,
-            y,
-            s=25,
-            c="#2d3142",
-            marker="o",
-            edgecolors="white",
-            linewidths=0.5,
-            zorder=5,
-        )
         dx, dy = plant.get("label_offset", (0.4, 0.4))
         label = plant["name"]
         if plant.get("note"):
             label += f"\n{plant['note']}"
-        ax.text(
-            x + dx,
-            y + dy,
-            label,
-            fontsize=7,
-            ha="left",
-            va="bottom",
-            color="#1b1b1b",
-            zorder=6,
+        texts.append(
+            ax.text(
+                x + dx,
+                y + dy,
+                label,
+                fontsize=7,
+                ha="left",
+                va="bottom",
+                color="#1b1b1b",
+                zorder=6,
+            )
         )
+    return texts
+
+
+def _data_box(ax, renderer, text) -> Box:
+    extent = text.get_window_extent(renderer).transformed(ax.transData.inverted())
+    return extent.x0, extent.y0, extent.x1, extent.y1
+
+
+def _auto_place_labels(
+    fig,
+    ax,
+    texts: Sequence,
+    anchors: Sequence[Sequence[float]],
+    markers: Sequence[Sequence[float]],
+) -> None:
+    """Move overlapping labels, keeping each manual offset when it is clear."""
+    ax.apply_aspect()
+    renderer = fig.canvas.get_renderer()
+    boxes = [_data_box(ax, renderer, text) for text in texts]
+    # Keep labels off every plant pin; one pin is roughly a third of a foot.
+    radius = 0.15
+    obstacles = [(x - radius, y - radius, x + radius, y + radius) for x, y in markers]
+    xmin, xmax = ax.get_xlim()
+    ymin, ymax = ax.get_ylim()
+    shifts = place_labels(boxes, anchors, obstacles, bounds=(xmin, ymin, xmax, ymax))
+    for text, box, anchor, (dx, dy) in zip(texts, boxes, anchors, shifts):
+        if not (dx or dy):
+            continue
+        x, y = text.get_position()
+        text.set_position((x + dx, y + dy))
+        # Leader line from the pin to the nearest point of the moved label.
+        px, py = anchor
+        lx = min(max(px, box[0] + dx), box[2] + dx)
+        ly = min(max(py, box[1] + dy), box[3] + dy)
+        ax.plot([px, lx], [py, ly], color="#888888", linewidth=0.4, zorder=4)
 
 
 def _compute_bounds(sections: Sequence[dict]) -> Tuple[float, float, float, float]:
@@ -144,13 +193,20 @@ def _compute_bounds(sections: Sequence[dict]) -> Tuple[float, float, float, floa
     )
 
 
-def build_map(sections: Sequence[dict], output: Path, show_plot: bool) -> None:
-    global plt
-    assert plt is not None
-    fig, ax = plt.subplots(figsize=(9, 10))
+def build_map(
+    sections: Sequence[dict], output: Path, show_plot: bool, auto_labels: bool = False
+) -> None:
+    fig, ax = _new_figure(figsize=(9, 10))
+    section_texts = []
+    section_centers = []
+    plant_texts = []
+    markers = []
     for section in sections:
-        _draw_section(ax, section)
-        _draw_plants(ax, section.get("plants", []))
+        section_texts.append(_draw_section(ax, section))
+        section_centers.append(_section_center(_section_points(section)))
+        plants = section.get("plants", [])
+        plant_texts.extend(_draw_plants(ax, plants))
+        markers.extend(plant["position"] for plant in plants)
 
     xmin, xmax, ymin, ymax = _compute_bounds(sections)
     ax.set_xlim(xmin, xmax)
@@ -160,13 +216,20 @@ def build_map(sections: Sequence[dict], output: Path, show_plot: bool) -> None:
     ax.set_title("Blueprint Garden — Section Map")
     ax.set_aspect("equal", adjustable="box")
     ax.grid(True, which="both", linewidth=0.3, color="#cccccc")
+    if auto_labels:
+        # Section names are placed first so plant labels yield to them.
+        _auto_place_labels(
+            fig, ax, section_texts + plant_texts, section_centers + markers, markers
+        )
 
     output.parent.mkdir(parents=True, exist_ok=True)
     fig.savefig(output, dpi=300, bbox_inches="tight")
-    if show_plot:
-        plt.show()
-    else:
-        plt.close(fig)
+    # Headless figures are not tracked by pyplot, so there is nothing to close.
+    if plt is not None:
+        if show_plot:
+            plt.show()
+        else:
+            plt.close(fig)
     print(f"Saved map to {output}")
 
 
@@ -187,6 +250,24 @@ def parse_args() -> argparse.Namespace:
         "--backend",
         help="Matplotlib backend to use (defaults to Agg when --no-show is supplied).",
     )
+    parser.add_argument(
+        "--auto-labels",
+        action="store_true",
+        help="Nudge overlapping labels apart, treating label_offset values as hints.",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Report startup and render time on stderr.",
+    )
+    parser.add_argument(
+        "--from-inventory",
+        action="store_true",
+        help=(
+            "Label pins from garden/plants.toml via section_index.py and report "
+            "inventory records that could not be placed."
+        ),
+    )
     parser.add_argument(
         "--data-file",
         type=Path,
@@ -197,16 +278,41 @@ def parse_args() -> argparse.Namespace:
 
 
 def configure_matplotlib(backend: str | None, headless: bool) -> None:
+    """Prepare matplotlib, importing pyplot only when a GUI or custom backend is needed.
+
+    Headless runs without an explicit backend draw on a bare Figure with an Agg
+    canvas. That skips pyplot's import and backend setup and keeps no global
+    figure state, so several maps can be rendered from separate threads.
+    """
+    global plt, Figure, FigureCanvasAgg, Polygon, Rectangle
+    from matplotlib.patches import Polygon as _Polygon, Rectangle as _Rectangle
+
+    Polygon = _Polygon
+    Rectangle = _Rectangle
+    if headless and not backend:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg as _FigureCanvasAgg
+        from matplotlib.figure import Figure as _Figure
+
+        plt = None
+        Figure = _Figure
+        FigureCanvasAgg = _FigureCanvasAgg
+        return
+
     desired = backend or ("Agg" if headless else None)
     if desired:
         matplotlib.use(desired, force=True)
-    global plt, Polygon, Rectangle
     import matplotlib.pyplot as _plt
-    from matplotlib.patches import Polygon as _Polygon, Rectangle as _Rectangle
 
     plt = _plt
-    Polygon = _Polygon
-    Rectangle = _Rectangle
+
+
+def _new_figure(figsize: Tuple[float, float]):
+    if plt is not None:
+        return plt.subplots(figsize=figsize)
+    assert Figure is not None and FigureCanvasAgg is not None
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig, fig.subplots()
 
 
 def load_sections(path: Path) -> List[dict]:
@@ -222,11 +328,42 @@ def load_sections(path: Path) -> List[dict]:
     return sections
 
 
+def _inventory_sections(data_file: Path, sections: List[dict]) -> List[dict]:
+    from section_index import inventory_sections, load_section_index
+
+    try:
+        inventory, index = load_section_index(data_file, sections=sections)
+    except (OSError, ValueError) as error:
+        raise SystemExit(f"Cannot load garden inventory: {error}")
+    for problem in index.problems:
+        print(f"warning: {problem}", file=sys.stderr)
+    flagged = len(index.unmatched) + len(index.ambiguous)
+    if flagged:
+        print(
+            f"{flagged} inventory records are not on the map "
+            "(run section_index.py for details)",
+            file=sys.stderr,
+        )
+    return inventory_sections(sections, inventory, index)
+
+
 def main() -> None:
     args = parse_args()
     sections = load_sections(args.data_file)
+    if args.from_inventory:
+        sections = _inventory_sections(args.data_file, sections)
     configure_matplotlib(args.backend, args.no_show)
-    build_map(sections, args.output, show_plot=not args.no_show)
+    ready = time.perf_counter()
+    build_map(
+        sections, args.output, show_plot=not args.no_show, auto_labels=args.auto_labels
+    )
+    if args.timings:
+        finished = time.perf_counter()
+        print(
+            f"startup {ready - _STARTED:.3f}s, render {finished - ready:.3f}s, "
+            f"total {finished - _STARTED:.3f}s",
+            file=sys.stderr,
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,398 @@
+"""
+Join the garden inventory (garden/plants.toml) to the map in sections.yaml.
+
+Run:
+    python3 projects/gardens/section_index.py            # report matched/flagged records
+    python3 projects/gardens/section_index.py --json
+
+Map pins are named for display ("Fish Mint (lower)", "Star Jasmine #3") while
+inventory records carry ids, names, aliases and free-text locations. The
+resolver links them in three passes:
+
+1. a pin with ``inventory_id: <id>`` in sections.yaml is linked explicitly;
+2. remaining pins are matched by name tokens through an inverted index, so each
+   inventory record only meets the pins that share a word with it;
+3. an inventory ``location`` equal to a section's slug ("north8") links the
+   record to that section even without a pin.
+
+A token match needs every word of an inventory name or alias to appear in the
+pin name, so a generic pin ("Onion cluster") never claims a specific record
+("Purple onion"). When several records fit one pin, the record sharing the
+most words wins ("fish-mint" beats "mint" for "Fish Mint (lower)");
+a tie leaves the pin unlinked and flags every tied record as ambiguous.
+
+The joined index is pickled next to the inventory cache, keyed by the inventory
+fingerprint, sections.yaml and this script.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import re
+import sys
+import tempfile
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+try:
+    import yaml  # type: ignore
+except ImportError:  # pragma: no cover
+    yaml = None
+
+from inventory import (
+    DEFAULT_AMENDMENTS,
+    DEFAULT_CACHE_DIR,
+    DEFAULT_PLANTS,
+    Inventory,
+    inventory_fingerprint,
+    load_inventory,
+)
+
+DEFAULT_SECTIONS = Path(__file__).with_name("sections.yaml")
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+# Words that describe a pin's placement or shape rather than the plant in it.
+STOPWORDS = frozenset(
+    {
+        "a", "and", "arch", "band", "bin", "block", "cloves", "cluster", "in",
+        "lower", "of", "pocket", "pot", "potted", "root", "row", "run", "solo",
+        "the", "trellis", "upper",
+    }
+)
+
+
+@dataclass(frozen=True, slots=True)
+class PinRef:
+    section: int
+    pin: int
+    section_name: str
+    pin_name: str
+    position: Tuple[float, float]
+
+
+@dataclass(frozen=True, slots=True)
+class SectionIndex:
+    """Inventory id <-> map links plus everything the resolver could not place."""
+
+    pins_by_plant: Dict[str, Tuple[PinRef, ...]]
+    plant_by_pin: Dict[Tuple[int, int], str]
+    sections_by_plant: Dict[str, Tuple[str, ...]]
+    unmatched: Tuple[str, ...]
+    ambiguous: Dict[str, Tuple[PinRef, ...]]
+    unlinked_pins: Tuple[PinRef, ...]
+    problems: Tuple[str, ...]
+
+    def plant_for_pin(self, section: int, pin: int) -> Optional[str]:
+        return self.plant_by_pin.get((section, pin))
+
+
+def slugify(value: str) -> str:
+    return "-".join(TOKEN_PATTERN.findall(value.lower()))
+
+
+def _singular(token: str) -> str:
+    if len(token) > 3 and token.endswith("es") and token[-3] in "osx":
+        return token[:-2]
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def name_tokens(value: str) -> FrozenSet[str]:
+    # Digits are pin numbering ("#3", "(11)"), never part of a plant's name.
+    return frozenset(
+        _singular(token)
+        for token in TOKEN_PATTERN.findall(value.lower())
+        if token not in STOPWORDS and not token.isdigit()
+    )
+
+
+def resolve(inventory: Inventory, sections: Sequence[dict]) -> SectionIndex:
+    plants = inventory.plants
+    problems: List[str] = []
+    pins: List[PinRef] = []
+    explicit: Dict[int, str] = {}
+    for section_number, section in enumerate(sections):
+        for pin_number, pin in enumerate(section.get("plants", [])):
+            ref = PinRef(
+                section_number,
+                pin_number,
+                section["name"],
+                pin["name"],
+                tuple(pin["position"]),
+            )
+            inventory_id = pin.get("inventory_id")
+            if inventory_id is not None:
+                if plants.get(inventory_id) is None:
+                    problems.append(
+                        f"{section['name']} / {pin['name']}: "
+                        f"unknown inventory_id {inventory_id!r}"
+                    )
+                else:
+                    explicit[len(pins)] = inventory_id
+            pins.append(ref)
+
+    # Inverted index: token -> pins whose name contains it.
+    postings: Dict[str, List[int]] = {}
+    pin_tokens: List[FrozenSet[str]] = []
+    for number, ref in enumerate(pins):
+        tokens = name_tokens(ref.pin_name)
+        pin_tokens.append(tokens)
+        if number in explicit:
+            continue
+        for token in tokens:
+            postings.setdefault(token, []).append(number)
+
+    # pin -> {plant id: shared words}
+    candidates: Dict[int, Dict[str, int]] = {}
+    for plant in plants.records:
+        for label in (plant.name, *plant.aliases):
+            tokens = name_tokens(label)
+            nearby = {number for token in tokens for number in postings.get(token, ())}
+            for number in nearby:
+                if tokens <= pin_tokens[number]:
+                    scores = candidates.setdefault(number, {})
+                    scores[plant.id] = max(scores.get(plant.id, 0), len(tokens))
+
+    linked: Dict[int, str] = dict(explicit)
+    contested: Dict[str, List[PinRef]] = {}
+    for number, scores in candidates.items():
+        best = max(scores.values())
+        winners = sorted(plant_id for plant_id, score in scores.items() if score == best)
+        if len(winners) == 1:
+            linked[number] = winners[0]
+        else:
+            for plant_id in winners:
+                contested.setdefault(plant_id, []).append(pins[number])
+
+    pins_by_plant: Dict[str, List[PinRef]] = {}
+    plant_by_pin: Dict[Tuple[int, int], str] = {}
+    for number in sorted(linked):
+        ref = pins[number]
+        pins_by_plant.setdefault(linked[number], []).append(ref)
+        plant_by_pin[(ref.section, ref.pin)] = linked[number]
+
+    section_slugs = {slugify(section["name"]): section["name"] for section in sections}
+    sections_by_plant: Dict[str, Tuple[str, ...]] = {}
+    for plant in plants.records:
+        names = {ref.section_name for ref in pins_by_plant.get(plant.id, ())}
+        if plant.location in section_slugs:
+            names.add(section_slugs[plant.location])
+        if names:
+            sections_by_plant[plant.id] = tuple(sorted(names))
+
+    ambiguous = {
+        plant_id: tuple(refs)
+        for plant_id, refs in sorted(contested.items())
+        if plant_id not in pins_by_plant
+    }
+    unmatched = tuple(
+        plant.id
+        for plant in plants.records
+        if plant.id not in sections_by_plant and plant.id not in ambiguous
+    )
+    unlinked_pins = tuple(ref for number, ref in enumerate(pins) if number not in linked)
+    return SectionIndex(
+        {plant_id: tuple(refs) for plant_id, refs in pins_by_plant.items()},
+        plant_by_pin,
+        sections_by_plant,
+        unmatched,
+        ambiguous,
+        unlinked_pins,
+        tuple(problems),
+    )
+
+
+def load_sections_data(path: Path) -> List[dict]:
+    """Sections from ``path``; same format as map_sections.py, without matplotlib."""
+    text = path.read_text(encoding="utf-8")
+    data = yaml.safe_load(text) if yaml is not None else json.loads(text)
+    return list((data or {}).get("sections") or ())
+
+
+def load_section_index(
+    sections_path: Path = DEFAULT_SECTIONS,
+    plants_path: Path = DEFAULT_PLANTS,
+    amendments_path: Path = DEFAULT_AMENDMENTS,
+    cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+    sections: Optional[Sequence[dict]] = None,
+) -> Tuple[Inventory, SectionIndex]:
+    """Inventory plus its joined section index, reusing the cached join when fresh.
+
+    ``sections``, when given, replaces the contents of ``sections_path`` and is
+    what the cache is keyed on, so callers holding edited sections never get an
+    index joined against the file.
+    """
+    inventory = load_inventory(plants_path, amendments_path, cache_dir)
+    if cache_dir is None:
+        if sections is None:
+            sections = load_sections_data(sections_path)
+        return inventory, resolve(inventory, sections)
+
+    digest = hashlib.sha256()
+    inventory_key = inventory_fingerprint(
+        plants_path.read_bytes(), amendments_path.read_bytes()
+    )
+    digest.update(inventory_key.encode("ascii"))
+    digest.update(Path(__file__).read_bytes())
+    if sections is None:
+        digest.update(sections_path.read_bytes())
+    else:
+        digest.update(json.dumps(sections, sort_keys=True, default=str).encode("utf-8"))
+    fingerprint = digest.hexdigest()
+    cache_path = cache_dir / "section-index.pickle"
+    try:
+        with cache_path.open("rb") as handle:
+            cached_fingerprint, index = pickle.load(handle)
+        if cached_fingerprint == fingerprint:
+            return inventory, index
+    except (
+        OSError, EOFError, pickle.UnpicklingError, AttributeError, TypeError, ValueError
+    ):
+        pass  # missing or unreadable cache
+
+    if sections is None:
+        sections = load_sections_data(sections_path)
+    index = resolve(inventory, sections)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "wb", dir=cache_dir, prefix="section-index.pickle.", delete=False
+        ) as handle:
+            pickle.dump((fingerprint, index), handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(handle.name, cache_path)
+    except OSError as error:
+        print(f"warning: could not cache section index: {error}", file=sys.stderr)
+    return inventory, index
+
+
+def inventory_sections(
+    sections: Sequence[dict], inventory: Inventory, index: SectionIndex
+) -> List[dict]:
+    """Copy of ``sections`` whose pins are labelled from the inventory.
+
+    Linked pins take the inventory name with the record's status and id as the
+    note. Records placed in a section only by ``location`` get a pin stacked
+    below the section centre. Pins without a record are left as drawn.
+    """
+    located: Dict[str, List[str]] = {}
+    for plant_id, names in index.sections_by_plant.items():
+        if plant_id not in index.pins_by_plant:
+            for name in names:
+                located.setdefault(name, []).append(plant_id)
+
+    rendered = []
+    for section_number, section in enumerate(sections):
+        pins = []
+        for pin_number, pin in enumerate(section.get("plants", [])):
+            plant_id = index.plant_for_pin(section_number, pin_number)
+            if plant_id is not None:
+                plant = inventory.plants.get(plant_id)
+                pin = {**pin, "name": plant.name, "note": f"{plant.status} · {plant.id}"}
+            pins.append(pin)
+        unpinned = located.get(section["name"], ())
+        if unpinned:
+            points = section.get("points") or [section["coords"][:2], section["coords"][2:]]
+            cx = sum(point[0] for point in points) / len(points)
+            cy = sum(point[1] for point in points) / len(points)
+            for offset, plant_id in enumerate(unpinned):
+                plant = inventory.plants.get(plant_id)
+                pins.append(
+                    {
+                        "name": plant.name,
+                        "position": [cx, cy - 1.5 * (offset + 1)],
+                        "note": f"{plant.status} · {plant.id} (no pin)",
+                    }
+                )
+        rendered.append({**section, "plants": pins})
+    return rendered
+
+
+def print_report(
+    inventory: Inventory, index: SectionIndex, verbose: bool = False
+) -> None:
+    for plant in inventory.plants.records:
+        pins = index.pins_by_plant.get(plant.id, ())
+        sections = index.sections_by_plant.get(plant.id, ())
+        if not sections:
+            continue
+        placed = ", ".join(f"{ref.section_name} / {ref.pin_name}" for ref in pins)
+        print(f"{plant.id}: {placed or ', '.join(sections) + ' (no pin)'}")
+    for plant_id, refs in index.ambiguous.items():
+        names = "; ".join(f"{ref.section_name} / {ref.pin_name}" for ref in refs)
+        print(f"ambiguous: {plant_id} -> {names}", file=sys.stderr)
+    for plant_id in index.unmatched:
+        location = inventory.plants.get(plant_id).location
+        print(f"unmatched: {plant_id} (location {location})", file=sys.stderr)
+    if verbose:
+        for ref in index.unlinked_pins:
+            print(f"unlinked pin: {ref.section_name} / {ref.pin_name}", file=sys.stderr)
+    elif index.unlinked_pins:
+        print(
+            f"{len(index.unlinked_pins)} map pins have no inventory record "
+            "(--verbose lists them)",
+            file=sys.stderr,
+        )
+    for problem in index.problems:
+        print(f"error: {problem}", file=sys.stderr)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Link garden inventory records to map sections and pins."
+    )
+    parser.add_argument("--sections-file", type=Path, default=DEFAULT_SECTIONS)
+    parser.add_argument("--plants-file", type=Path, default=DEFAULT_PLANTS)
+    parser.add_argument("--amendments-file", type=Path, default=DEFAULT_AMENDMENTS)
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument(
+        "--json", action="store_true", help="Print the joined index as JSON."
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="List map pins with no inventory record."
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    try:
+        inventory, index = load_section_index(
+            args.sections_file,
+            args.plants_file,
+            args.amendments_file,
+            None if args.no_cache else args.cache_dir,
+        )
+    except (OSError, ValueError) as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+    if args.json:
+        payload = {
+            "pins": {
+                plant_id: [asdict(ref) for ref in refs]
+                for plant_id, refs in index.pins_by_plant.items()
+            },
+            "sections": index.sections_by_plant,
+            "ambiguous": {
+                plant_id: [asdict(ref) for ref in refs]
+                for plant_id, refs in index.ambiguous.items()
+            },
+            "unmatched": list(index.unmatched),
+            "unlinked_pins": [asdict(ref) for ref in index.unlinked_pins],
+            "problems": list(index.problems),
+        }
+        json.dump(payload, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        print_report(inventory, index, args.verbose)
+    return 1 if index.problems else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,408 @@
+"""
+Simulate direct sun hours across the garden sections from wall shading.
+
+Run:
+    python3 projects/gardens/sun_exposure.py                     # per-section table
+    python3 projects/gardens/sun_exposure.py --plot sun_map.png  # annual heat map
+    python3 projects/gardens/sun_exposure.py --month 12 --plot december.png
+
+Every section in sections.yaml is rasterized onto a square grid (default 0.5 ft
+cells). The sun's altitude and azimuth are computed for every daylight hour of
+a year at ``--latitude`` (solar time, no daylight saving). A cell is in shade
+for an hour when the ray from it toward the sun crosses a wall segment below
+the wall's height; walls are the ``walls`` polylines listed under each section.
+Each wall is tested against a batch of hours and every cell at once with NumPy
+broadcasting, and the lit hours are folded into mean daily sun hours per cell
+and month.
+
+Results are cached in .cache/gardens/ as an .npz keyed by a hash of the
+section geometry, walls, latitude, resolution and this script, so re-running
+with unchanged inputs only reloads the grid.
+"""
+
+from __future__ import annotations
+
+import argparse
+import calendar
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from inventory import DEFAULT_CACHE_DIR
+from section_index import DEFAULT_SECTIONS, load_sections_data
+
+DEFAULT_LATITUDE = 34.0
+DEFAULT_RESOLUTION = 0.5
+# Hours per batch; bounds the (hours, cells) working arrays.
+BATCH_HOURS = 256
+DAYS_PER_MONTH = np.array([calendar.monthrange(2025, month)[1] for month in range(1, 13)])
+
+
+@dataclass(frozen=True)
+class SunGrid:
+    """Mean daily direct-sun hours per month on a grid over the sections."""
+
+    origin: Tuple[float, float]
+    resolution: float
+    section_names: Tuple[str, ...]
+    section_of: np.ndarray  # (ny, nx) int16, -1 outside every section
+    sun_hours: np.ndarray  # (12, ny, nx) float32, NaN outside every section
+
+    def annual(self) -> np.ndarray:
+        weights = DAYS_PER_MONTH / DAYS_PER_MONTH.sum()
+        return np.tensordot(weights, self.sun_hours, axes=1)
+
+    def section_means(self) -> np.ndarray:
+        """(sections, 12) mean daily sun hours of each section per month."""
+        means = np.full((len(self.section_names), 12), np.nan)
+        flat = self.sun_hours.reshape(12, -1)
+        owners = self.section_of.ravel()
+        for number in range(len(self.section_names)):
+            cells = owners == number
+            if cells.any():
+                means[number] = flat[:, cells].mean(axis=1)
+        return means
+
+
+def section_polygon(section: dict) -> np.ndarray:
+    if section["kind"] == "rect":
+        x1, y1, x2, y2 = section["coords"]
+        x_low, x_high = sorted((x1, x2))
+        y_low, y_high = sorted((y1, y2))
+        return np.array(
+            [(x_low, y_low), (x_high, y_low), (x_high, y_high), (x_low, y_high)], float
+        )
+    return np.asarray(section["points"], float)
+
+
+def wall_segments(sections: Sequence[dict]) -> np.ndarray:
+    """(walls, 5) array of ``ax, ay, bx, by, height`` for every wall polyline edge."""
+    rows = []
+    for section in sections:
+        for wall in section.get("walls", ()):
+            points = wall["points"]
+            for (ax, ay), (bx, by) in zip(points, points[1:]):
+                rows.append((ax, ay, bx, by, float(wall["height"])))
+    return np.array(rows, float).reshape(-1, 5)
+
+
+def points_in_polygon(
+    xs: np.ndarray, ys: np.ndarray, polygon: np.ndarray
+) -> np.ndarray:
+    """Even-odd rule test of every (xs, ys) point against one polygon."""
+    inside = np.zeros(xs.shape, bool)
+    x1, y1 = polygon[:, 0], polygon[:, 1]
+    x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+    for ax, ay, bx, by in zip(x1, y1, x2, y2):
+        if ay == by:
+            continue
+        crosses = (ay > ys) != (by > ys)
+        x_cross = ax + (ys - ay) * (bx - ax) / (by - ay)
+        inside ^= crosses & (xs < x_cross)
+    return inside
+
+
+def rasterize(
+    sections: Sequence[dict], resolution: float
+) -> Tuple[Tuple[float, float], np.ndarray]:
+    """Grid origin and (ny, nx) section ownership; later sections win overlaps."""
+    polygons = [section_polygon(section) for section in sections]
+    corners = np.vstack(polygons)
+    x0, y0 = np.floor(corners.min(axis=0))
+    x1, y1 = np.ceil(corners.max(axis=0))
+    nx = int(round((x1 - x0) / resolution))
+    ny = int(round((y1 - y0) / resolution))
+    xs, ys = np.meshgrid(
+        x0 + (np.arange(nx) + 0.5) * resolution, y0 + (np.arange(ny) + 0.5) * resolution
+    )
+    section_of = np.full((ny, nx), -1, np.int16)
+    for number, polygon in enumerate(polygons):
+        section_of[points_in_polygon(xs, ys, polygon)] = number
+    return (float(x0), float(y0)), section_of
+
+
+def solar_positions(latitude: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Altitude, azimuth (radians clockwise from north) and month of daylight hours.
+
+    Hours are sampled at the middle of each solar hour of a 365-day year, so
+    every sample stands for one hour of sun.
+    """
+    day = np.repeat(np.arange(365), 24)
+    hour = np.tile(np.arange(24) + 0.5, 365)
+    gamma = 2 * np.pi * day / 365
+    # Spencer's series for the solar declination.
+    declination = (
+        0.006918
+        - 0.399912 * np.cos(gamma)
+        + 0.070257 * np.sin(gamma)
+        - 0.006758 * np.cos(2 * gamma)
+        + 0.000907 * np.sin(2 * gamma)
+        - 0.002697 * np.cos(3 * gamma)
+        + 0.00148 * np.sin(3 * gamma)
+    )
+    phi = np.radians(latitude)
+    hour_angle = np.radians(15.0 * (hour - 12.0))
+    sin_altitude = np.sin(phi) * np.sin(declination) + np.cos(phi) * np.cos(
+        declination
+    ) * np.cos(hour_angle)
+    altitude = np.arcsin(np.clip(sin_altitude, -1.0, 1.0))
+    azimuth = np.arctan2(
+        np.sin(hour_angle),
+        np.cos(hour_angle) * np.sin(phi) - np.tan(declination) * np.cos(phi),
+    ) + np.pi
+    month_starts = np.concatenate(([0], np.cumsum(DAYS_PER_MONTH)[:-1]))
+    month = np.searchsorted(month_starts, day, side="right") - 1
+    daylight = altitude > 0
+    return altitude[daylight], azimuth[daylight], month[daylight]
+
+
+def sunlit(
+    px: np.ndarray,
+    py: np.ndarray,
+    walls: np.ndarray,
+    altitude: np.ndarray,
+    azimuth: np.ndarray,
+) -> np.ndarray:
+    """(hours, cells) True where no wall blocks the sun from the cell.
+
+    With d the horizontal unit vector toward the sun and e = B - A a wall
+    edge, the ray P + t*d meets the edge at A + u*e where
+    ``t = ((A - P) x e) / (d x e)`` and ``u = ((A - P) x d) / (d x e)``. The
+    wall blocks the sun when t > 0, 0 <= u <= 1 and t * tan(altitude) < height.
+    Both sides of each test are multiplied by |d x e|, so there is no division,
+    and the ``(A - P) x e`` term is hoisted out of the hour loop.
+    """
+    if not len(walls):
+        return np.ones((len(altitude), len(px)), bool)
+    dtype = np.float32
+    px, py = px.astype(dtype), py.astype(dtype)
+    ax, ay, bx, by, height = walls.astype(dtype).T
+    ex, ey = bx - ax, by - ay
+    dx = np.sin(azimuth).astype(dtype)[:, None]  # toward the sun, x east / y north
+    dy = np.cos(azimuth).astype(dtype)[:, None]
+    cross = dx * ey - dy * ex  # (hours, walls)
+    sign = np.sign(cross)
+    reach = np.abs(cross) * height / np.tan(altitude).astype(dtype)[:, None]
+    # (A - P) x e per cell and wall, independent of the hour.
+    offset = (ax * ey - ay * ex)[None, :] - (px[:, None] * ey - py[:, None] * ex)
+    # (A - P) x d = A x d - P x d
+    wall_term = ax * dy - ay * dx  # (hours, walls)
+    cell_term = px[None, :] * dy - py[None, :] * dx  # (hours, cells)
+
+    lit = np.ones((len(altitude), len(px)), bool)
+    for wall in range(len(walls)):
+        s = sign[:, wall : wall + 1]
+        distance = offset[None, :, wall] * s  # t * |d x e|
+        along = (wall_term[:, wall : wall + 1] - cell_term) * s  # u * |d x e|
+        limit = np.abs(cross[:, wall : wall + 1])
+        lit &= ~(
+            (distance > 0)
+            & (along >= 0)
+            & (along <= limit)
+            & (distance < reach[:, wall : wall + 1])
+        )
+    return lit
+
+
+def simulate(
+    sections: Sequence[dict],
+    latitude: float = DEFAULT_LATITUDE,
+    resolution: float = DEFAULT_RESOLUTION,
+) -> SunGrid:
+    origin, section_of = rasterize(sections, resolution)
+    ny, nx = section_of.shape
+    rows, columns = np.nonzero(section_of >= 0)
+    px = origin[0] + (columns + 0.5) * resolution
+    py = origin[1] + (rows + 0.5) * resolution
+    walls = wall_segments(sections)
+    altitude, azimuth, month = solar_positions(latitude)
+
+    totals = np.zeros((12, len(px)))
+    for start in range(0, len(altitude), BATCH_HOURS):
+        stop = start + BATCH_HOURS
+        lit = sunlit(px, py, walls, altitude[start:stop], azimuth[start:stop])
+        np.add.at(totals, month[start:stop], lit)
+
+    sun_hours = np.full((12, ny, nx), np.nan, np.float32)
+    sun_hours[:, rows, columns] = totals / DAYS_PER_MONTH[:, None]
+    return SunGrid(
+        origin,
+        resolution,
+        tuple(section["name"] for section in sections),
+        section_of,
+        sun_hours,
+    )
+
+
+def geometry_fingerprint(
+    sections: Sequence[dict], latitude: float, resolution: float
+) -> str:
+    geometry = [
+        {
+            "name": section["name"],
+            "outline": section_polygon(section).tolist(),
+            "walls": section.get("walls", []),
+        }
+        for section in sections
+    ]
+    digest = hashlib.sha256()
+    digest.update(Path(__file__).read_bytes())
+    digest.update(json.dumps([geometry, latitude, resolution], sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def load_or_simulate(
+    sections: Sequence[dict],
+    latitude: float = DEFAULT_LATITUDE,
+    resolution: float = DEFAULT_RESOLUTION,
+    cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+) -> Tuple[SunGrid, bool]:
+    """The simulated grid and whether it came from the cache."""
+    if cache_dir is None:
+        return simulate(sections, latitude, resolution), False
+    fingerprint = geometry_fingerprint(sections, latitude, resolution)
+    cache_path = cache_dir / f"sun-{fingerprint[:32]}.npz"
+    try:
+        with np.load(cache_path) as data:
+            return (
+                SunGrid(
+                    tuple(data["origin"].tolist()),
+                    float(data["resolution"]),
+                    tuple(data["section_names"].tolist()),
+                    data["section_of"],
+                    data["sun_hours"],
+                ),
+                True,
+            )
+    except (OSError, KeyError, ValueError):
+        pass  # missing or unreadable cache
+
+    grid = simulate(sections, latitude, resolution)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "wb", dir=cache_dir, prefix=f"{cache_path.name}.", delete=False
+        ) as handle:
+            np.savez_compressed(
+                handle,
+                origin=np.array(grid.origin),
+                resolution=np.array(grid.resolution),
+                section_names=np.array(grid.section_names),
+                section_of=grid.section_of,
+                sun_hours=grid.sun_hours,
+            )
+        os.replace(handle.name, cache_path)
+    except OSError as error:
+        print(f"warning: could not cache sun grid: {error}", file=sys.stderr)
+    return grid, False
+
+
+def print_table(grid: SunGrid) -> None:
+    means = grid.section_means()
+    weights = DAYS_PER_MONTH / DAYS_PER_MONTH.sum()
+    width = max(len(name) for name in grid.section_names)
+    print(f"{'section':<{width}}  annual  Mar  Jun  Sep  Dec")
+    for name, row in zip(grid.section_names, means):
+        annual = float(np.dot(weights, row))
+        months = "  ".join(f"{row[month]:4.1f}" for month in (2, 5, 8, 11))
+        print(f"{name:<{width}}  {annual:6.1f}  {months}")
+
+
+def plot_grid(
+    grid: SunGrid, sections: Sequence[dict], output: Path, month: Optional[int]
+) -> None:
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from matplotlib.patches import Polygon
+
+    values = grid.annual() if month is None else grid.sun_hours[month - 1]
+    ny, nx = grid.section_of.shape
+    x0, y0 = grid.origin
+    extent = (x0, x0 + nx * grid.resolution, y0, y0 + ny * grid.resolution)
+    fig = Figure(figsize=(9, 10))
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+    image = ax.imshow(
+        np.ma.masked_invalid(values), origin="lower", extent=extent, cmap="inferno"
+    )
+    for section in sections:
+        ax.add_patch(
+            Polygon(section_polygon(section), closed=True, fill=False, linewidth=0.8)
+        )
+    for ax_, ay_, bx_, by_, _ in wall_segments(sections):
+        ax.plot([ax_, bx_], [ay_, by_], color="#1f77b4", linewidth=2.0)
+    period = "annual mean" if month is None else calendar.month_name[month]
+    ax.set_title(f"Direct sun hours per day — {period}")
+    ax.set_xlabel("x (ft east)")
+    ax.set_ylabel("y (ft north)")
+    ax.set_aspect("equal")
+    fig.colorbar(image, ax=ax, label="hours/day")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(output, dpi=200, bbox_inches="tight")
+    print(f"Saved sun map to {output}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Simulate wall shading and per-section direct sun hours."
+    )
+    parser.add_argument("--data-file", type=Path, default=DEFAULT_SECTIONS)
+    parser.add_argument(
+        "--latitude",
+        type=float,
+        default=DEFAULT_LATITUDE,
+        help="Site latitude in degrees north (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--resolution",
+        type=float,
+        default=DEFAULT_RESOLUTION,
+        help="Grid cell size in feet (default: %(default)s)",
+    )
+    parser.add_argument("--plot", type=Path, help="Save a heat map PNG to this path.")
+    parser.add_argument(
+        "--month",
+        type=int,
+        choices=range(1, 13),
+        help="Plot one month instead of the annual mean.",
+    )
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--timings", action="store_true", help="Report run time on stderr.")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if args.resolution <= 0:
+        print("error: --resolution must be positive", file=sys.stderr)
+        return 1
+    started = time.perf_counter()
+    try:
+        sections: List[dict] = load_sections_data(args.data_file)
+    except (OSError, ValueError) as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+    grid, cached = load_or_simulate(
+        sections, args.latitude, args.resolution, None if args.no_cache else args.cache_dir
+    )
+    simulated = time.perf_counter()
+    print_table(grid)
+    if args.plot:
+        plot_grid(grid, sections, args.plot, args.month)
+    if args.timings:
+        source = "cache" if cached else "simulation"
+        print(f"{source} {simulated - started:.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
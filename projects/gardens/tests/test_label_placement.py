@@ -0,0 +1,56 @@
+import sys
+import unittest
+from itertools import combinations
+from pathlib import Path
+
+
+GARDENS_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(GARDENS_DIR))
+
+from label_placement import place_labels
+
+
+def overlaps(a, b) -> bool:
+    return min(a[2], b[2]) > max(a[0], b[0]) and min(a[3], b[3]) > max(a[1], b[1])
+
+
+def shifted(labels, shifts):
+    return [
+        (x0 + dx, y0 + dy, x1 + dx, y1 + dy)
+        for (x0, y0, x1, y1), (dx, dy) in zip(labels, shifts)
+    ]
+
+
+class PlaceLabelsTests(unittest.TestCase):
+    def test_dense_cluster_ends_without_overlaps(self):
+        # 25 pins 0.3 apart, each with a 2.0 x 0.5 label up and to the right.
+        anchors = [(i * 0.3, j * 0.3) for i in range(5) for j in range(5)]
+        labels = [(x + 0.2, y + 0.2, x + 2.2, y + 0.7) for x, y in anchors]
+        self.assertTrue(any(overlaps(a, b) for a, b in combinations(labels, 2)))
+
+        boxes = shifted(labels, place_labels(labels, anchors))
+        for (first, a), (second, b) in combinations(enumerate(boxes), 2):
+            self.assertFalse(overlaps(a, b), f"labels {first} and {second} overlap")
+
+    def test_clear_hints_stay_and_obstacles_are_avoided(self):
+        labels = [(0.0, 0.0, 2.0, 0.5), (10.0, 0.0, 12.0, 0.5)]
+        anchors = [(-0.2, -0.2), (9.8, -0.2)]
+        marker = (10.5, 0.0, 11.0, 0.5)
+        shifts = place_labels(labels, anchors, obstacles=[marker])
+        self.assertEqual(shifts[0], (0.0, 0.0))
+        self.assertNotEqual(shifts[1], (0.0, 0.0))
+        self.assertFalse(overlaps(shifted(labels, shifts)[1], marker))
+
+    def test_bounds_are_respected(self):
+        labels = [(0.0, 0.0, 2.0, 0.5), (0.0, 0.0, 2.0, 0.5)]
+        anchors = [(0.0, 0.0), (0.0, 0.0)]
+        bounds = (-3.0, -3.0, 3.0, 3.0)
+        for box in shifted(labels, place_labels(labels, anchors, bounds=bounds)):
+            self.assertTrue(
+                bounds[0] <= box[0] and bounds[1] <= box[1]
+                and box[2] <= bounds[2] and box[3] <= bounds[3]
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
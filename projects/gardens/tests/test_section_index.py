@@ -0,0 +1,106 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+GARDENS_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(GARDENS_DIR))
+
+import inventory
+import section_index
+
+
+PLANTS = """
+[[plants]]
+id = "fish-mint"
+name = "Fish mint"
+kind = "edible-herb"
+status = "active"
+location = "north8"
+
+[[plants]]
+id = "mint"
+name = "Mint"
+kind = "edible-herb"
+status = "active"
+location = "to-verify"
+
+[[plants]]
+id = "star-jasmine"
+name = "Star jasmine"
+kind = "vine"
+status = "active"
+location = "to-verify"
+"""
+
+SECTIONS = [
+    {
+        "name": "North 8",
+        "coords": [0, 0, 8, 4],
+        "plants": [
+            # The token pass would give this pin to fish-mint (two shared words).
+            {"name": "Fish Mint (lower)", "position": [1, 1], "inventory_id": "mint"},
+            {"name": "Fish Mint (upper)", "position": [2, 2]},
+            {"name": "Star Jasmine #3", "position": [3, 3]},
+            {"name": "Unknown shrub", "position": [4, 3], "inventory_id": "nope"},
+        ],
+    }
+]
+
+
+class ResolveTests(unittest.TestCase):
+    def setUp(self):
+        self.inventory = inventory.parse_inventory(PLANTS, "")
+
+    def test_explicit_ids_win_over_token_matches(self):
+        index = section_index.resolve(self.inventory, SECTIONS)
+        self.assertEqual(index.plant_for_pin(0, 0), "mint")
+        self.assertEqual(index.plant_for_pin(0, 1), "fish-mint")
+        self.assertEqual(index.plant_for_pin(0, 2), "star-jasmine")
+        self.assertIsNone(index.plant_for_pin(0, 3))
+        self.assertEqual(len(index.problems), 1)
+        self.assertIn("unknown inventory_id 'nope'", index.problems[0])
+        self.assertEqual(index.sections_by_plant["fish-mint"], ("North 8",))
+        self.assertEqual(index.unmatched, ())
+
+    def test_tied_records_are_ambiguous(self):
+        tied = inventory.parse_inventory(
+            PLANTS.replace('name = "Mint"', 'name = "Lower"'), ""
+        )
+        sections = [
+            {
+                "name": "Bed",
+                "coords": [0, 0, 1, 1],
+                "plants": [{"name": "Star Jasmine Fish Mint", "position": [0, 0]}],
+            }
+        ]
+        index = section_index.resolve(tied, sections)
+        self.assertIsNone(index.plant_for_pin(0, 0))
+        self.assertEqual(set(index.ambiguous), {"fish-mint", "star-jasmine"})
+
+    def test_cache_is_keyed_on_the_sections_passed_in(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            root = Path(temporary_directory)
+            plants_path = root / "plants.toml"
+            amendments_path = root / "amendments.toml"
+            sections_path = root / "sections.json"
+            plants_path.write_text(PLANTS, encoding="utf-8")
+            amendments_path.write_text("", encoding="utf-8")
+            sections_path.write_text(json.dumps({"sections": SECTIONS}), encoding="utf-8")
+
+            def load(sections=None):
+                return section_index.load_section_index(
+                    sections_path, plants_path, amendments_path, root / "cache", sections
+                )[1]
+
+            self.assertEqual(load().plant_for_pin(0, 0), "mint")
+            edited = json.loads(json.dumps(SECTIONS))
+            del edited[0]["plants"][0]["inventory_id"]
+            self.assertEqual(load(edited).plant_for_pin(0, 0), "fish-mint")
+            self.assertEqual(load().plant_for_pin(0, 0), "mint")
+
+
+if __name__ == "__main__":
+    unittest.main()
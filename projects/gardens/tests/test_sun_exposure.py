@@ -0,0 +1,59 @@
+import math
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+
+GARDENS_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(GARDENS_DIR))
+
+from sun_exposure import solar_positions, sunlit
+
+
+class SunlitTests(unittest.TestCase):
+    def test_noon_shadow_of_a_south_facing_wall(self):
+        # A 6 ft east-west wall along y = 0 faces south; x is east, y is north.
+        walls = np.array([[-10.0, 0.0, 10.0, 0.0, 6.0]])
+        # Noon: the sun due south (azimuth 180 degrees) at 45 degrees, so the
+        # shadow reaches 6 ft north of the wall.
+        altitude = np.array([math.radians(45.0)])
+        azimuth = np.array([math.pi])
+        cells = {
+            "in front of the wall": (0.0, -3.0, True),
+            "just behind the wall": (0.0, 3.0, False),
+            "inside the shadow": (5.0, 5.5, False),
+            "past the shadow": (0.0, 6.5, True),
+            "beside the wall's end": (12.0, 3.0, True),
+        }
+        px = np.array([x for x, _, _ in cells.values()])
+        py = np.array([y for _, y, _ in cells.values()])
+        lit = sunlit(px, py, walls, altitude, azimuth)
+        self.assertEqual(lit.shape, (1, len(cells)))
+        for column, (name, (_, _, expected)) in enumerate(cells.items()):
+            self.assertEqual(bool(lit[0, column]), expected, name)
+
+    def test_lower_sun_casts_a_longer_shadow(self):
+        walls = np.array([[-10.0, 0.0, 10.0, 0.0, 6.0]])
+        altitude = np.radians([60.0, 20.0])
+        azimuth = np.array([math.pi, math.pi])
+        lit = sunlit(np.array([0.0]), np.array([8.0]), walls, altitude, azimuth)
+        self.assertEqual(lit[:, 0].tolist(), [True, False])
+
+    def test_solstice_noon_altitude(self):
+        # Hours are sampled mid-hour, so the highest sample is 7.5 degrees of
+        # hour angle from solar noon on the June solstice (declination 23.44).
+        latitude, declination = math.radians(34.0), math.radians(23.44)
+        expected = math.asin(
+            math.sin(latitude) * math.sin(declination)
+            + math.cos(latitude) * math.cos(declination) * math.cos(math.radians(7.5))
+        )
+        altitude, azimuth, month = solar_positions(34.0)
+        highest = int(np.argmax(altitude))
+        self.assertAlmostEqual(altitude[highest], expected, delta=math.radians(0.1))
+        self.assertEqual(int(month[highest]), 5)  # June, zero-based
+        self.assertTrue(math.pi / 2 < azimuth[highest] < 3 * math.pi / 2)  # southern sky
+
+if __name__ == "__main__":
+    unittest.main()